@@ -24,14 +24,17 @@
 
 import os
 import logging
+import shlex
+import time
 from collections import defaultdict
 
-from PyQt4.QtCore import QObject, pyqtSignal, Qt, QFileSystemWatcher, pyqtSlot
+from PyQt4.QtCore import QObject, pyqtSignal, Qt, QFileSystemWatcher, pyqtSlot, QDir
 from PyQt4.QtGui import QAction
 
 from helpers.ptyhandler import PtyHandler
+from helpers.gdbindexcache import GdbIndexCache, readBuildId
 from helpers.gdboutput import GdbOutput
-from helpers.configstore import ConfigSet, ConfigItem
+from helpers.configstore import ConfigSet, ConfigItem, SelectionConfigItem
 from helpers.excep import GdbError
 from helpers.icons import Icons
 from helpers.tracer import trace
@@ -42,10 +45,29 @@ class DebugConfig(ConfigSet):
     def __init__(self):
         ConfigSet.__init__(self, "Debugging", "Debugging Options", Icons.namespace)
         self.breakAtMain = ConfigItem(self, "Break at main function", True)
+        self.gdbCommand = ConfigItem(self, "GDB command (used after a restart)", "gdb -i mi -q -nx")
+        self.miParser = SelectionConfigItem(self, "Parser for GDB's output", "lazy", ["lazy", "fast", "ply"])
+        self.recordMiSession = ConfigItem(self, "Record the session with GDB to ~/.ricodebug", False)
+        self.indexCache = ConfigItem(self, "Cache symbol indices in ~/.ricodebug/index-cache", True)
+        self.warmReload = ConfigItem(self, "Keep GDB running when reloading the executable", True)
+        self.standbyGdb = ConfigItem(self, "Keep a second GDB ready for restarts", False)
+        self.remoteTarget = ConfigItem(self, "Remote target (host:port of a gdbserver, empty to debug locally)", "")
+        self.nonStop = ConfigItem(self, "Non-stop mode (only the thread that stops is halted)", False)
+        self.remoteLatency = ConfigItem(self, "Artificial latency per round trip to GDB (ms)", 0)
 
 
 class DebugController(QObject):
     executableOpened = pyqtSignal('PyQt_PyObject')
+    # all async records, in batches as they were taken from the reader
+    asyncRecordsReceived = pyqtSignal('PyQt_PyObject')
+    # the time it took to load the symbols of an executable in seconds and
+    # a description of how the index cache was used
+    symbolsLoaded = pyqtSignal(float, str)
+
+    # notifications that are forwarded as lists of consecutive records
+    BULK_NOTIFICATIONS = {GdbOutput.THREAD_CREATED: "threadsCreated",
+                          GdbOutput.THREAD_EXITED: "threadsExited",
+                          GdbOutput.BREAKPOINT_MODIFIED: "breakpointsModified"}
 
     def __init__(self, do):
         QObject.__init__(self)
@@ -59,27 +81,113 @@ class DebugController(QObject):
 
         self.executableName = None
         self.lastCmdWasStep = False
-
-        self.ptyhandler.start()
-        self.connector.start()
-
-        self.connector.reader.asyncRecordReceived.connect(self.handleAsyncRecord, Qt.QueuedConnection)
+        # the numbers (as strings) of the break- and tracepoints that
+        # continue the program right away, for gdb's reader thread, which
+        # must not look into the models; see watchBreakpoints
+        self.autoContinuing = frozenset()
+
+        # the time each thread (or "all" in all-stop mode) stopped at, and
+        # how long the threads were halted per stop in seconds
+        self.__stoppedSince = {}
+        self.threadStopTimes = defaultdict(list)
+        self.__nonStop = False
+        self.__selectedThread = None
+        # the process id of the inferior, taken from =thread-group-started;
+        # gdb cannot be asked for it while the inferior runs in all-stop mode
+        self.inferiorPid = None
 
         self.__config = DebugConfig()
         self.do.configStore.registerConfigSet(self.__config)
+
         self.__config.itemsHaveChanged.connect(self.updateConfig)
+        self.connector.reader.setParser(self.__config.miParser.value)
+        self.__config.miParser.valueChanged.connect(self.connector.reader.setParser)
+        self.__setRecording(self.__config.recordMiSession.value)
+        self.__config.recordMiSession.valueChanged.connect(self.__setRecording)
+
+        self.ptyhandler.start()
+        self.connector.start(self.gdbCommand())
+        self.__setStandby(self.__config.standbyGdb.value)
+        self.__setLatency(self.__config.remoteLatency.value)
+        self.__config.remoteLatency.valueChanged.connect(self.__setLatency)
+        self.__config.standbyGdb.valueChanged.connect(self.__setStandby)
+
+        self.__indexCache = GdbIndexCache(self.connector, os.path.join(str(QDir.homePath()), ".ricodebug", "index-cache"))
+
+        self.connector.reader.asyncRecordsPending.connect(self.handleAsyncRecords, Qt.QueuedConnection)
 
         self.__binaryWatcher = QFileSystemWatcher()
         self.__binaryWatcher.fileChanged.connect(self.__binaryChanged)
 
-        self.do.signalProxy.addProxy(["openExecutable", "run", "setRecord", "next_", "reverse_next", "step", "reverse_step", "cont", "interrupt", "finish", "reverse_finish", "evaluateExpression", "executeCliCommand", "inferiorUntil", "getStackDepth", "selectStackFrame"], self)
+        self.do.signalProxy.addProxy(["openExecutable", "run", "setRecord", "next_", "reverse_next", "step", "reverse_step", "cont", "interrupt", "finish", "reverse_finish", "evaluateExpression", "evaluateMany", "connectRemote", "executeCliCommand", "inferiorUntil", "getStackDepth", "selectStackFrame", "selectThread"], self)
 
 
+    def __setRecording(self, enabled):
+        if enabled:
+            self.connector.startRecording(os.path.join(str(QDir.homePath()), ".ricodebug",
+                                                       time.strftime("mi-session-%Y%m%d-%H%M%S.gz")))
+        else:
+            self.connector.stopRecording()
+
+    def gdbCommand(self):
+        """The command line gdb is started with"""
+        return shlex.split(self.__config.gdbCommand.value)
+
+    def __setLatency(self, ms):
+        self.connector.latency = int(ms) / 1000.0
+
+    def __setStandby(self, enabled):
+        if enabled:
+            self.connector.spawnStandby(self.gdbCommand())
+        else:
+            self.connector.discardStandby()
+
     def __reloadAction(self):
         a = QAction("Reload", self)
-        a.triggered.connect(lambda: self.openExecutable(self.executableName))
+        a.triggered.connect(self.reloadExecutable)
         return a
 
+    def restartGdb(self):
+        """Replace the running gdb by a new one (the standby gdb, if any)"""
+        command = self.gdbCommand()
+        self.connector.start(command)
+        if self.__config.standbyGdb.value:
+            self.connector.spawnStandby(command)
+
+    def reloadExecutable(self):
+        """Open the current executable again, keeping the breakpoints
+
+        A warm reload loads the executable into the running gdb, which saves
+        starting gdb; which symbols gdb reads again is up to gdb. A cold
+        reload starts over with a new gdb. The breakpoints, including their
+        name, action and auto-continue setting, are recreated with a single
+        batch of commands; those without a line number are lost."""
+        if not self.executableName:
+            return
+        filename = self.executableName
+        # check what can make openExecutable give up before anything is
+        # thrown away
+        if not os.path.exists(filename):
+            logging.error("File %s was not found.", filename)
+            return
+        if not self.do.editorController.closeOpenedFiles():  # closing source files may be canceled by user
+            return
+        warm = self.__config.warmReload.value
+        start = time.time()
+        breakpoints = self.do.breakpointModel.breakpointSpecs()
+        if not warm:
+            # clear the models while the gdb that knows their breakpoints and
+            # variables is still running
+            self.signalProxy.cleanupModels.emit()
+            self.restartGdb()
+        if self.openExecutable(filename):
+            self.do.breakpointModel.restoreBreakpoints(breakpoints)
+            logging.info("%s reload of %s took %.2f s.", "Warm" if warm else "Cold",
+                         filename, time.time() - start)
+        elif not warm and breakpoints:
+            logging.error("Could not reload %s; the breakpoints at %s were lost.", filename,
+                          ", ".join(spec[0] for spec in breakpoints))
+
     def __binaryChanged(self):
         """ Slot for FileWatcher - Using QtMessagebox for interaction"""
         logging.warning("The executable was changed on the disc. Please reload the file.",
@@ -109,12 +217,50 @@ class DebugController(QObject):
                 self.__binaryWatcher.removePath(self.executableName)
 
             self.connector.changeWorkingDirectory(os.path.dirname(filename))
-            self.connector.openFile(filename)
+            # leave gdbs that do not know about non-stop mode alone unless
+            # it is (or was) enabled
+            nonStop = self.__config.nonStop.value
+            if nonStop or self.__nonStop:
+                self.connector.setNonStop(nonStop)
+            self.__nonStop = nonStop
+            self.__loadSymbols(filename)
+            if self.__config.remoteTarget.value:
+                self.connectRemote(self.__config.remoteTarget.value, filename)
             if self.__config.breakAtMain.value:
                 self.do.breakpointModel.insertBreakpoint("main", None)
             self.executableOpened.emit(filename)
             self.executableName = filename
             self.__binaryWatcher.addPath(self.executableName)
+            return True
+        return False
+
+    def connectRemote(self, target, executable=None):
+        """Debug on the gdbserver at target; every round trip to it is
+        expensive, so the queries after a stop are sent by the reader as
+        soon as gdb reports the stop"""
+        start = time.time()
+        self.connector.connectRemote(target, executable)
+        self.connector.setStopQueries(self.do.stopCoordinator.prefetchQueriesFor)
+        logging.info("Connected to %s in %.1f ms.", target, (time.time() - start) * 1000)
+
+    def __loadSymbols(self, filename):
+        if self.__config.indexCache.value and self.__indexCache.enable():
+            buildId = readBuildId(filename)
+            if buildId is None:
+                how = "no build id, index not cached"
+            elif self.__indexCache.hasIndex(buildId):
+                how = "index loaded from cache"
+            else:
+                how = "index written to cache"
+        else:
+            self.__indexCache.disable()
+            how = "index cache disabled" if not self.__config.indexCache.value else "index cache not supported by gdb"
+
+        start = time.time()
+        self.connector.openFile(filename)
+        elapsed = time.time() - start
+        logging.info("Loaded symbols of %s in %.1f s (%s).", filename, elapsed, how)
+        self.symbolsLoaded.emit(elapsed, how)
 
     @trace
     @pyqtSlot(str)
@@ -172,7 +318,10 @@ class DebugController(QObject):
     @trace
     @pyqtSlot()
     def interrupt(self):
-        self.connector.interrupt()
+        if self.__nonStop:
+            self.connector.interruptAll()
+        else:
+            self.connector.interrupt()
         self.lastCmdWasStep = False
 
     @trace
@@ -187,29 +336,113 @@ class DebugController(QObject):
         self.connector.finish(True)
         self.lastCmdWasStep = False
 
+    def __quote(self, exp):
+        exp = str(exp).replace('"', '\"')
+        return "\"" + exp + "\""
+
     @pyqtSlot(str)
     def evaluateExpression(self, exp):
         if exp == "":
             return None
-        exp = str(exp).replace('"', '\"')
-        return self.connector.evaluate("\"" + exp + "\"")
+        return self.connector.evaluate(self.__quote(exp))
+
+    def evaluateMany(self, exps):
+        """Evaluate all expressions with a single batch of commands; returns
+        their values in the same order, None for those that failed"""
+        values = iter(self.connector.evaluateMany([str(exp) for exp in exps if exp != ""]))
+        return [next(values) if exp != "" else None for exp in exps]
 
     @trace
     @pyqtSlot(str)
     def executeCliCommand(self, cmd):
         return self.connector.executeCliCommand(cmd)
 
+    def handleAsyncRecords(self):
+        """Handle all async records received since the last call
+
+        Runs of notifications in BULK_NOTIFICATIONS are forwarded as one
+        list, so that eg. thousands of =thread-created records turn into a
+        single model update. The order of the records is kept.
+        """
+        records = self.connector.reader.takeAsyncRecords()
+        if not records:
+            return
+        self.asyncRecordsReceived.emit(records)
+
+        bulk = []
+        for rec in records:
+            if rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ in self.BULK_NOTIFICATIONS:
+                if bulk and bulk[0].class_ != rec.class_:
+                    self.__emitBulk(bulk)
+                    bulk = []
+                bulk.append(rec)
+            else:
+                if bulk:
+                    self.__emitBulk(bulk)
+                    bulk = []
+                self.handleAsyncRecord(rec)
+        if bulk:
+            self.__emitBulk(bulk)
+
+    def __emitBulk(self, records):
+        getattr(self.signalProxy, self.BULK_NOTIFICATIONS[records[0].class_]).emit(records)
+
     def handleAsyncRecord(self, rec):
         if rec.type_ == GdbOutput.EXEC_ASYN and rec.class_ == GdbOutput.STOPPED:
+            if rec.timestamp:
+                logging.debug("*stopped dispatched %.1f ms after it was received", (time.time() - rec.timestamp) * 1000)
+            logging.debug("Query cache: %d hits, %d misses", *self.connector.queryCache.statistics())
+            self.__threadsStopped(rec)
             self.handleStoppedRecord(rec)
+        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.THREAD_GROUP_STARTED:
+            pid = dict((r.dest, r.src) for r in rec.results).get("pid")
+            self.inferiorPid = int(pid) if pid else None
+        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.THREAD_GROUP_EXITED:
+            self.inferiorPid = None
+        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.THREAD_SELECTED:
+            # the user selected a thread in gdb's console
+            self.__threadSelected(self.__threadIds(rec, "id")[0])
         elif rec.type_ == GdbOutput.EXEC_ASYN and rec.class_ == GdbOutput.RUNNING:
-            self.signalProxy.inferiorIsRunning.emit(rec)
-        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.THREAD_CREATED:
-            self.signalProxy.threadCreated.emit(rec)
-        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.THREAD_EXITED:
-            self.signalProxy.threadExited.emit(rec)
-        elif rec.type_ == GdbOutput.NOTIFY_ASYN and rec.class_ == GdbOutput.BREAKPOINT_MODIFIED:
-            self.signalProxy.breakpointModified.emit(rec)
+            self.__threadsResumed(rec)
+            # in non-stop mode, the inferior is running once the last
+            # stopped thread has been resumed
+            if not self.__nonStop or not self.__stoppedSince:
+                self.signalProxy.inferiorIsRunning.emit(rec)
+
+    @staticmethod
+    def __threadIds(rec, field):
+        """The ids of the threads rec refers to in field, or ["all"]"""
+        for r in rec.results:
+            if r.dest == field:
+                return [r.src] if isinstance(r.src, str) else list(r.src)
+        return ["all"]
+
+    def __threadsStopped(self, rec):
+        now = rec.timestamp or time.time()
+        ids = self.__threadIds(rec, "stopped-threads")
+        for id_ in ids:
+            self.__stoppedSince.setdefault(id_, now)
+        self.signalProxy.threadsStateChanged.emit(ids, False)
+
+        if self.__nonStop and ids != ["all"] and self.__selectedThread not in self.__stoppedSince:
+            # gdb keeps the selected thread when another one stops; select
+            # the stopped one so that the exec commands act on it. The
+            # command is queued before anything the handlers of the stop
+            # send.
+            self.__selectedThread = ids[0]
+            self.connector.executeAsync("-thread-select " + ids[0])
+
+    def __threadsResumed(self, rec):
+        now = rec.timestamp or time.time()
+        ids = self.__threadIds(rec, "thread-id")
+        if ids == ["all"]:
+            ids = list(self.__stoppedSince) or ids
+        for id_ in ids:
+            since = self.__stoppedSince.pop(id_, None)
+            if since is not None:
+                self.threadStopTimes[id_].append(now - since)
+                logging.debug("Thread %s was halted for %.1f ms", id_, (now - since) * 1000)
+        self.signalProxy.threadsStateChanged.emit(ids, True)
 
     def handleStoppedRecord(self, rec):
         # With reverse debugging, some stopped records might not contain a
@@ -223,6 +456,8 @@ class DebugController(QObject):
                 field[r.dest] = r.src
 
         if field["reason"] in ['exited-normally', 'exited']:
+            self.__stoppedSince.clear()
+            self.__selectedThread = None
             self.signalProxy.inferiorHasExited.emit(rec)
         elif field["reason"] == 'breakpoint-hit':
             # Ok, we're kind of frantically trying to cover all bases here. We
@@ -262,7 +497,7 @@ class DebugController(QObject):
                     self.do.scriptEnv.exec_(i.action)
 
             # if the last command was a step or any breakpoint tells us to not auto-continue, stop here
-            if self.lastCmdWasStep or any(not p.autoContinue for p in itertools.chain(bps, tps)):
+            if not self.autoContinues(int(field["bkptno"])):
                 self.signalProxy.inferiorStoppedNormally.emit(rec)
                 self.lastCmdWasStep = False
             else:
@@ -276,6 +511,29 @@ class DebugController(QObject):
         else:
             self.signalProxy.inferiorStoppedNormally.emit(rec)
 
+    def autoContinues(self, number):
+        """Whether the program is continued right away when it stops at the
+        break- or tracepoint number"""
+        return not self.lastCmdWasStep and self.__autoContinuesAt(number)
+
+    def __autoContinuesAt(self, number):
+        p = self.do.tracepointController.model().breakpointByNumber(number) or self.do.breakpointModel.breakpointByNumber(number)
+        if p is None:
+            return False
+        tps = self.do.tracepointController.model().breakpointsByLocation(p.fullname, p.line)
+        bps = self.do.breakpointModel.breakpointsByLocation(p.fullname, p.line)
+        return all(b.autoContinue for b in itertools.chain(bps, tps))
+
+    def watchBreakpoints(self, model):
+        """Keep autoContinuing up to date with the break- or tracepoints of
+        model"""
+        for signal in (model.rowsInserted, model.rowsRemoved, model.dataChanged, model.modelReset):
+            signal.connect(self.__updateAutoContinuing)
+
+    def __updateAutoContinuing(self, *_):
+        bps = itertools.chain(self.do.breakpointModel.breakpoints, self.do.tracepointController.model().breakpoints)
+        self.autoContinuing = frozenset(str(bp.number) for bp in bps if self.__autoContinuesAt(bp.number))
+
     @trace
     @pyqtSlot()
     def inferiorUntil(self):
@@ -295,3 +553,23 @@ class DebugController(QObject):
     @pyqtSlot()
     def selectStackFrame(self, exp):
         return self.connector.selectStackFrame(exp)
+
+    nonStop = property(lambda self: self.__nonStop)
+
+    @trace
+    @pyqtSlot(str)
+    def selectThread(self, id_):
+        """Make id_ the thread the exec commands and the views refer to, in
+        the session shown by the views"""
+        session = self.do.sessionPool.current
+        session.connector.selectThread(id_)
+        if session is self.do.sessionPool.primary:
+            self.__threadSelected(id_)
+        else:
+            self.signalProxy.threadSelected.emit(id_)
+
+    def __threadSelected(self, id_):
+        self.__selectedThread = id_
+        # the views may show another session
+        if self.do.sessionPool.current is self.do.sessionPool.primary:
+            self.signalProxy.threadSelected.emit(id_)
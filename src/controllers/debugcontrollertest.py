@@ -0,0 +1,226 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from PyQt4.QtCore import QSettings
+from PyQt4.QtGui import QApplication
+from controllers.debugcontroller import DebugController
+from controllers.stopcoordinator import StopCoordinator
+from helpers.configstore import ConfigStore
+from helpers.gdbconnector import GdbConnector
+from helpers.gdbexecutor import GdbExecutor
+from helpers.gdbextensions import GdbExtensions
+from helpers.gdbmidecoder import GdbMiDecoder
+from helpers.gdbsessionpool import GdbSessionPool
+from helpers.icons import Icons
+from helpers.scriptenv import ScriptEnv
+from helpers.signalproxy import SignalProxy
+from helpers.stlvectorparser import StlVectorParser
+from helpers import tracer
+from models.breakpointmodel import BreakpointModel
+from models.threadmodel import ThreadModel
+from models.tracepointmodel import TracepointModel
+
+
+def setUpModule():
+    global app
+    # the config sets need the icons; no GUI is shown
+    app = QApplication.instance() or QApplication([], False)
+    Icons()
+
+
+class EditorController:
+    """Stands in for the editor; the user may cancel closing the files"""
+    def __init__(self):
+        self.canClose = True
+
+    def closeOpenedFiles(self):
+        return self.canClose
+
+
+class TracepointController:
+    def __init__(self, do):
+        self.__model = TracepointModel(do)
+
+    def model(self):
+        return self.__model
+
+
+class DistributedObjects:
+    """What the DebugController needs to run, talking to a fake gdb (see
+    helpers/fakegdb.py) started with args"""
+    def __init__(self, settingsFile, args, config={}):
+        settings = QSettings(settingsFile, QSettings.IniFormat)
+        settings.setValue("Debugging/gdb command (used after a restart)",
+                          " ".join([sys.executable, "-m", "helpers.fakegdb"] + args))
+        for key, value in config.items():
+            settings.setValue("Debugging/" + key, value)
+        self.configStore = ConfigStore(settings)
+        self.gdb_connector = GdbConnector()
+        self.sessionPool = GdbSessionPool(self.gdb_connector)
+        self.gdbExecutor = GdbExecutor()
+        self.gdbExecutor.start()
+        self.signalProxy = SignalProxy(self)
+        self.editorController = EditorController()
+        self.debugController = DebugController(self)
+        self.breakpointModel = BreakpointModel(self)
+        self.tracepointController = TracepointController(self)
+        self.stopCoordinator = StopCoordinator(self)
+        # the calls of the traced methods, shown in the script view
+        self.transcript = []
+        tracer.setCallback(self.transcript.append)
+
+    def close(self):
+        self.sessionPool.shutdown()
+        self.gdbExecutor.stop()
+        self.gdb_connector.kill()
+        self.debugController.ptyhandler.stop = True
+        self.debugController.ptyhandler.wait()
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.do.close()
+        shutil.rmtree(self.dir)
+
+    def start(self, *args, **config):
+        self.do = DistributedObjects(os.path.join(self.dir, "settings.ini"), list(args), config)
+        return self.do.debugController
+
+    def coldReload(self, canClose):
+        dc = self.start(**{"keep gdb running when reloading the executable": "false"})
+        self.assertTrue(dc.openExecutable(sys.executable))
+        self.do.breakpointModel.insertBreakpoint("main.c", 12)
+        starts = []
+        start = self.do.gdb_connector.start
+        self.do.gdb_connector.start = lambda command: starts.append(command) or start(command)
+        self.do.editorController.canClose = canClose
+        dc.reloadExecutable()
+        return starts
+
+    def testColdReload(self):
+        self.assertEqual(len(self.coldReload(True)), 1)
+        self.assertEqual(self.do.debugController.executableName, os.path.abspath(sys.executable))
+        self.assertEqual(len(self.do.breakpointModel.breakpoints), 2)
+
+    def testCanceledColdReload(self):
+        # nothing may be thrown away if the user does not close the files
+        self.assertEqual(self.coldReload(False), [])
+        self.assertEqual(len(self.do.breakpointModel.breakpoints), 2)
+
+    def testEvaluateManyWithExtensions(self):
+        dc = self.start("--python")
+        self.assertTrue(self.do.gdb_connector.extensions.available)
+        self.assertEqual(dc.evaluateMany(["argc", "", "s.next.value", "x"]), ["0", None, "1", None])
+
+    def testEvaluateManyWithoutExtensions(self):
+        dc = self.start()
+        self.assertFalse(self.do.gdb_connector.extensions.available)
+        self.assertEqual(dc.evaluateMany(["argc", "", "s.next.value", "x"]), ["0", None, "1", None])
+
+    def testEvaluateManyWhenTheExtensionsFail(self):
+        dc = self.start()
+        # eg. the command raised a Python exception in gdb
+        self.do.gdb_connector.extensions.mode = GdbExtensions.MI
+        self.assertEqual(dc.evaluateMany(["argc", "", "s.next.value", "x"]), ["0", None, "1", None])
+
+    def testCallersOfEvaluateMany(self):
+        for args in [["--python"], []]:
+            self.start(*(["--array", "3"] + args))
+            self.assertEqual(StlVectorParser(self.do).getContent("arr"),
+                             ["(int *) 0x601040", "(int *) 0x601044", "(int *) 0x601048"])
+            self.assertEqual(self.do.signalProxy.gdbEvaluateMany(["arr[2]", "s.value"]), ["2", "0"])
+            ScriptEnv(self.do)
+            with self.assertLogs(level="INFO") as logs:
+                self.do.signalProxy.print_("argc", "arr[1]", "y")
+            self.assertEqual([r.getMessage() for r in logs.records], ["argc = 0", "arr[1] = 1", "y = None"])
+            self.do.close()
+
+    def testClearBreakpoints(self):
+        self.start()
+        model = self.do.breakpointModel
+        for line in (3, 5, 8):
+            model.insertBreakpoint("main.c", line)
+        removed = []
+        model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removed.append(
+            [model.breakpoints[i].line for i in range(first, last + 1)]))
+        model.clearBreakpoints()
+        self.assertEqual(removed, [[3, 5, 8]])
+        self.assertEqual(model.breakpoints, [])
+
+    def testThreadSelection(self):
+        dc = self.start("--threads", "4")
+        selected = []
+        self.do.signalProxy.threadSelected.connect(selected.append)
+        dc.selectThread("3")
+        # the user selected a thread in gdb's console
+        dc.handleAsyncRecord(GdbMiDecoder.parse(['=thread-selected,id="2",frame={level="0"}'])[0])
+        self.assertEqual(selected, ["3", "2"])
+
+    def testStopQueriesInAllStopMode(self):
+        self.start()
+        # gdb selects the thread that stopped by itself
+        rec = GdbMiDecoder.parse(['*stopped,reason="breakpoint-hit",thread-id="2",stopped-threads="all"'])[0]
+        self.assertEqual(self.do.stopCoordinator.queriesFor(rec), StopCoordinator.QUERIES)
+
+    def testNoStopQueriesAfterExit(self):
+        self.start()
+        rec = GdbMiDecoder.parse(['*stopped,reason="exited-normally"'])[0]
+        self.assertEqual(self.do.stopCoordinator.prefetchQueriesFor(rec), [])
+
+    def testNoStopQueriesForAutoContinue(self):
+        dc = self.start()
+        model = self.do.breakpointModel
+        model.insertBreakpoint("main.c", 3)
+        model.insertBreakpoint("main.c", 5)
+        model.setData(model.index(1, [c for c, _ in model.LAYOUT].index("autoContinue")), True, None)
+        self.assertEqual(dc.autoContinuing, frozenset(["2"]))
+
+        def queriesFor(line):
+            return self.do.stopCoordinator.prefetchQueriesFor(GdbMiDecoder.parse([line])[0])
+        self.assertEqual(queriesFor('*stopped,reason="breakpoint-hit",bkptno="2",thread-id="1"'), [])
+        self.assertEqual(queriesFor('*stopped,reason="breakpoint-hit",bkptno="1",thread-id="1"'), StopCoordinator.QUERIES)
+        # gdb does not always report the number
+        self.assertEqual(queriesFor('*stopped,reason="breakpoint-hit",thread-id="1"'), StopCoordinator.QUERIES)
+        model.clearBreakpoints()
+        self.assertEqual(dc.autoContinuing, frozenset())
+
+    def waitFor(self, condition):
+        # the snapshots are published from the event loop
+        deadline = time.time() + 5
+        while not condition() and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def testSessionSelection(self):
+        self.start("--threads", "2")
+        threads = ThreadModel(self.do)
+        snapshots = []
+        self.do.signalProxy.stopSnapshotReady.connect(snapshots.append)
+        pool = self.do.sessionPool
+        session = pool.addSession("rank 1", [sys.executable, "-m", "helpers.fakegdb", "--threads", "4"])
+        pool.select(session)
+        self.waitFor(lambda: len(snapshots) == 1)
+        self.assertEqual(threads.rowCount(None), 4)
+        # removing the session shows the primary one again
+        pool.removeSession(session)
+        self.assertIs(pool.current, pool.primary)
+        self.waitFor(lambda: len(snapshots) == 2)
+        self.assertEqual(threads.rowCount(None), 2)
+
+    def testInferiorPid(self):
+        dc = self.start()
+        dc.handleAsyncRecord(GdbMiDecoder.parse(['=thread-group-started,id="i1",pid="4242"'])[0])
+        self.assertEqual(dc.inferiorPid, 4242)
+        dc.handleAsyncRecord(GdbMiDecoder.parse(['=thread-group-exited,id="i1",exit-code="0"'])[0])
+        self.assertEqual(dc.inferiorPid, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,7 +44,7 @@ class StackController(QObject):
         self.stackView.setModel(self.stackModel)
         self.stackView.activated.connect(self.stackInStackViewActivated)
 
-        self.distributedObjects.signalProxy.inferiorStoppedNormally.connect(self.stackModel.update)
+        self.distributedObjects.signalProxy.stopSnapshotReady.connect(self.stackModel.applySnapshot)
         self.distributedObjects.signalProxy.inferiorHasExited.connect(self.stackModel.clear)
         self.distributedObjects.signalProxy.executableOpened.connect(self.stackModel.clear)
         self.distributedObjects.signalProxy.inferiorIsRunning.connect(self.removeStackMarkers)
@@ -54,18 +54,18 @@ class StackController(QObject):
 
     def stackInStackViewActivated(self, index):
         item = index.internalPointer()
-        self.distributedObjects.gdb_connector.selectStackFrame(item.level)
+        self.distributedObjects.sessionPool.current.connector.selectStackFrame(item.level)
         self.distributedObjects.signalProxy.openFile(item.fullname, item.line)
         self.stackFrameSelected.emit()
 
     def insertStackMarkers(self):
         for entry in self.stackModel.stack:
-            if int(entry.level) != 0 and hasattr(entry, "fullname") and hasattr(entry, "line"):
+            if entry.level != 0 and entry.fullname is not None and entry.line is not None:
                 self.editorController.addStackMarker(entry.fullname, entry.line)
 
     def removeStackMarkers(self):
         for entry in self.stackModel.stack:
-            if int(entry.level) != 0 and hasattr(entry, "fullname"):
+            if entry.level != 0 and entry.fullname is not None:
                 self.editorController.delStackMarkers(entry.fullname)
 
     def showStackTraceChanged(self, state):
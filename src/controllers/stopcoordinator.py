@@ -0,0 +1,147 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Prefetches everything the views need when the inferior stops
+
+Instead of each view querying gdb on its own after a stop, the
+StopCoordinator sends the queries for the stack, the threads, the locals and
+the changed variables as one batch and hands the decoded replies to the
+views as a single snapshot (see SignalProxy.stopSnapshotReady).
+"""
+
+import logging
+import time
+from collections import namedtuple
+
+from PyQt4.QtCore import QObject
+
+from helpers.gdboutput import GdbOutput
+from helpers.gdbreplies import decodeStack, decodeThreadInfo, decodeVariables, decodeVarUpdate
+
+# the state of the inferior after a stop; parts that could not be queried
+# are None
+StopSnapshot = namedtuple("StopSnapshot", "rec frames currentThread threads variables changes")
+
+
+class StopCoordinator(QObject):
+    QUERIES = ["-stack-list-frames", "-thread-info",
+               "-stack-list-variables --simple-values", '-var-update --all-values "*"']
+
+    def __init__(self, distributedObjects):
+        QObject.__init__(self)
+        self.do = distributedObjects
+        self.__stops = 0
+        # seconds from receiving the last *stopped until all views were
+        # updated
+        self.lastLatency = None
+
+        self.do.signalProxy.inferiorStoppedNormally.connect(self.primaryStopped)
+        self.do.signalProxy.threadSelected.connect(self.threadSelected)
+        self.do.sessionPool.currentChanged.connect(self.sessionSelected)
+        self.do.sessionPool.sessionStopped.connect(self.sessionStopped)
+
+    def queriesFor(self, rec):
+        """The queries for the stop reported by rec; in non-stop mode, the
+        stack and the variables are those of the thread that stopped, which
+        need not be the selected one
+
+        In all-stop mode, gdb selects the thread that stopped itself, even
+        though *stopped carries its thread-id as well."""
+        thread = None
+        if self.do.debugController.nonStop:
+            for r in getattr(rec, "results", []):
+                if r.dest == "thread-id":
+                    thread = r.src
+        if thread is None or thread == "all":
+            return self.QUERIES
+        return ["-stack-list-frames --thread %s" % thread, "-thread-info",
+                "-stack-list-variables --thread %s --frame 0 --simple-values" % thread,
+                self.QUERIES[3]]
+
+    def prefetch(self, rec):
+        """Query the selected session for the stop reported by rec"""
+        self.__stops += 1
+        stop = self.__stops
+        connector = self.do.sessionPool.current.connector
+        self.do.gdbExecutor.submit(lambda: self.query(rec, connector),
+                                   lambda snapshot: self.__publish(stop, snapshot))
+
+    def primaryStopped(self, rec):
+        # the stops of the primary session are not shown while another
+        # session is selected
+        if self.do.sessionPool.current is self.do.sessionPool.primary:
+            self.prefetch(rec)
+
+    def sessionSelected(self, _):
+        self.prefetch(None)
+
+    def sessionStopped(self, session):
+        # other sessions are queried without their stop record, like after
+        # selecting a thread
+        if session is self.do.sessionPool.current:
+            self.prefetch(None)
+
+    def prefetchQueriesFor(self, rec):
+        """Like queriesFor, but nothing for stops that will not be shown:
+        when the program exited, the frames are gone, and the controller
+        continues right away after auto-continuing break- and tracepoints
+
+        Runs in gdb's reader thread, so it only reads the controller's
+        snapshot of the auto-continuing breakpoints. A step that ends on one
+        of them is not prefetched; the views query it after the stop."""
+        fields = dict((r.dest, r.src) for r in getattr(rec, "results", []))
+        reason = fields.get("reason", "")
+        if reason.startswith("exited"):
+            return []
+        if reason == "breakpoint-hit" and fields.get("bkptno") in self.do.debugController.autoContinuing:
+            return []
+        return self.queriesFor(rec)
+
+    def threadSelected(self, _):
+        # the views show the selected thread; there is no stop record
+        self.prefetch(None)
+
+    def query(self, rec, connector):
+        """Query the gdb of connector for the snapshot after the stop
+        reported by rec, or for the selected thread if rec is None"""
+        stack, threads, variables, changes = (
+            None if res.class_ == GdbOutput.ERROR else res.raw
+            for res in connector.takeStopQueries(rec, self.queriesFor(rec)))
+        currentThread = None
+        if threads is not None:
+            currentThread, threads = decodeThreadInfo(threads)
+        return StopSnapshot(rec,
+                            None if stack is None else decodeStack(stack),
+                            currentThread, threads,
+                            None if variables is None else decodeVariables(variables),
+                            None if changes is None else decodeVarUpdate(changes))
+
+    def __publish(self, stop, snapshot):
+        # the inferior might have stopped again in the meantime
+        if stop != self.__stops:
+            return
+        self.do.signalProxy.stopSnapshotReady.emit(snapshot)
+
+        if snapshot.rec is not None and snapshot.rec.timestamp:
+            self.lastLatency = time.time() - snapshot.rec.timestamp
+            logging.debug("Views settled %.1f ms after *stopped was received", self.lastLatency * 1000)
@@ -67,6 +67,8 @@ class DataGraphController(QObject):
 
         # connect signals
         self.signalProxy.cleanupModels.connect(self.clearDataGraph)
+        # the graph shows the variables of one session
+        self.distributedObjects.sessionPool.currentChanged.connect(self.clearDataGraph)
 
         self.distributedObjects.mainwindow.insertDockWidget(self._view, "Graph", Qt.LeftDockWidgetArea, True, QIcon(":/icons/images/datagraph.png"))
 
@@ -0,0 +1,117 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Latency statistics per class of MI commands
+
+The class of a command is its first word, eg. -var-update. The latencies
+are collected in histograms with logarithmic buckets, so the memory needed
+does not grow with the number of commands; the percentiles are accurate to
+about BUCKET_GROWTH.
+"""
+
+import csv
+import math
+import time
+
+# the width of the buckets relative to their lower bound
+BUCKET_GROWTH = 0.05
+# latencies below one microsecond end up in the first bucket
+_MIN_LATENCY = 1e-6
+_LOG_GROWTH = math.log(1 + BUCKET_GROWTH)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency):
+        i = int(math.log(max(latency, _MIN_LATENCY) / _MIN_LATENCY) / _LOG_GROWTH)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, p):
+        """Return the latency p percent of the samples are below"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen >= rank:
+                # the middle of the bucket, but never more than the maximum
+                return min(_MIN_LATENCY * math.exp((i + 0.5) * _LOG_GROWTH), self.max)
+        return self.max
+
+
+class CommandStatistics:
+    COLUMNS = ["Command", "Count", "Rate [1/s]", "Total [s]", "Mean [ms]",
+               "p50 [ms]", "p95 [ms]", "p99 [ms]", "Max [ms]", "Timeouts"]
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.histograms = {}
+        self.timeouts = {}
+        self.__start = time.time()
+
+    @staticmethod
+    def commandClass(cmd):
+        return str(cmd).partition(" ")[0]
+
+    def record(self, cmd, latency):
+        """Record that cmd took latency seconds"""
+        cls = self.commandClass(cmd)
+        if cls not in self.histograms:
+            self.histograms[cls] = LatencyHistogram()
+        self.histograms[cls].add(latency)
+
+    def setTimeouts(self, timeouts):
+        """Set the number of timeouts per command class"""
+        self.timeouts = dict(timeouts)
+
+    def rows(self):
+        """Return a row for every command class, see COLUMNS"""
+        elapsed = max(time.time() - self.__start, 1e-6)
+        rows = []
+        for cls in set(self.histograms) | set(self.timeouts):
+            h = self.histograms.get(cls) or LatencyHistogram()
+            rows.append([cls, h.count, h.count / elapsed, h.total,
+                         1000 * h.total / h.count if h.count else 0.0,
+                         1000 * h.percentile(50), 1000 * h.percentile(95),
+                         1000 * h.percentile(99), 1000 * h.max,
+                         self.timeouts.get(cls, 0)])
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows
+
+    def writeCsv(self, f):
+        """Write the statistics to the text file f"""
+        writer = csv.writer(f)
+        writer.writerow(self.COLUMNS)
+        for row in self.rows():
+            writer.writerow(["%.6g" % v if isinstance(v, float) else v for v in row])
@@ -0,0 +1,37 @@
+import io
+import unittest
+from .commandstatistics import CommandStatistics, LatencyHistogram, BUCKET_GROWTH
+
+
+class Test(unittest.TestCase):
+    def testPercentiles(self):
+        h = LatencyHistogram()
+        for i in range(1, 1001):
+            h.add(i / 1000.0)
+        for p in (50, 95, 99):
+            self.assertAlmostEqual(h.percentile(p), p / 100.0, delta=p / 100.0 * BUCKET_GROWTH)
+        self.assertEqual(h.percentile(100), 1.0)
+        self.assertEqual(LatencyHistogram().percentile(50), 0.0)
+
+    def testRows(self):
+        s = CommandStatistics()
+        for i in range(10):
+            s.record('-var-update --all-values "*"', 0.002)
+        s.record("-stack-list-frames", 0.5)
+        s.setTimeouts({"-data-evaluate-expression": 2})
+
+        rows = s.rows()
+        self.assertEqual([r[0] for r in rows], ["-stack-list-frames", "-var-update", "-data-evaluate-expression"])
+        self.assertEqual(rows[1][1], 10)
+        self.assertAlmostEqual(rows[1][5], 2.0, delta=0.1)
+        self.assertEqual(rows[2][9], 2)
+
+        f = io.StringIO()
+        s.writeCsv(f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Command,Count,"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,8 +29,11 @@ from controllers.debugcontroller import DebugController
 from .signalproxy import SignalProxy
 from controllers.editorcontroller import EditorController
 from .gdbconnector import GdbConnector
+from .gdbexecutor import GdbExecutor
+from .gdbsessionpool import GdbSessionPool
 from controllers.filelistcontroller import FileListController
 from controllers.stackcontroller import StackController
+from controllers.stopcoordinator import StopCoordinator
 from controllers.tracepointcontroller import TracepointController
 from datagraph.datagraphcontroller import DataGraphController
 from variables.variablepool import VariablePool
@@ -49,6 +52,8 @@ from views.scriptview import ScriptView
 from views.threadview import ThreadView
 from models.threadmodel import ThreadModel
 from views.mitraceview import MiTraceView
+from views.sessionview import SessionView
+from views.livewatchview import LiveWatchView
 from helpers.icons import Icons
 from models.stoppointmodel import StoppointModel
 from models.watchmodel import WatchModel
@@ -66,14 +71,23 @@ class DistributedObjects:
         self.settings = QSettings("fh-hagenberg", "ricodebug")
         self.configStore = ConfigStore(self.settings)
         self.gdb_connector = GdbConnector()
+        self.sessionPool = GdbSessionPool(self.gdb_connector)
+        self.gdbExecutor = GdbExecutor()
+        self.gdbExecutor.start()
         self.signalProxy = SignalProxy(self)
         self.debugController = DebugController(self)
+        self.stopCoordinator = StopCoordinator(self)
         self.actions = Actions(self)
         self.sessionManager = SessionManager(self)
 
         self.breakpointModel, _ = self.buildModelAndView(StoppointModel, BreakpointView, "Breakpoints", Icons.bp)
 
+        # the pool of the selected session; connected before the models,
+        # which create their variables in the new pool when the session
+        # changes
         self.variablePool = VariablePool(self)
+        self.__variablePools = {self.sessionPool.primary: self.variablePool}
+        self.sessionPool.currentChanged.connect(self.__selectVariablePool)
         self.editorController = EditorController(self, mainwindow.ui.editorView)
         scriptView = self.buildView(ScriptView, "Python Console", Icons.python)
         tracer.setCallback(scriptView.appendTranscript)
@@ -97,9 +111,20 @@ class DistributedObjects:
         self.tracepointwaveController = TracepointWaveController(self)
 
         self.miView = self.buildView(MiTraceView, "MI Trace")
+        self.buildView(SessionView, "Sessions", Icons.thread)
+        self.buildView(LiveWatchView, "Live Watch", Icons.graph)
 
         self.scriptEnv = scriptenv.ScriptEnv(self)
 
+    def __selectVariablePool(self, session):
+        primary = self.__variablePools[self.sessionPool.primary]
+        # forget the pools of removed sessions
+        for old in [s for s in self.__variablePools if s not in self.sessionPool.sessions]:
+            del self.__variablePools[old]
+        if session not in self.__variablePools:
+            self.__variablePools[session] = VariablePool(self, session.connector, primary.config)
+        self.variablePool = self.__variablePools[session]
+
     def buildModelAndView(self, ModelCls, ViewCls, name, icon=None):
         view = self.buildView(ViewCls, name, icon)
         model = ModelCls(self)
@@ -32,6 +32,13 @@ class GdbError(Exception):
         return self.message
 
 
+class GdbTimeoutError(GdbError):
+    def __init__(self, cmd, timeout):
+        GdbError.__init__(self, "No result for command '%s' within %.1f s" % (cmd, timeout))
+        self.cmd = cmd
+        self.timeout = timeout
+
+
 class SourceFileNotFound(Exception):
     def __init__(self, filename):
         Exception.__init__(self)
@@ -0,0 +1,417 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""A stand-in for gdb speaking the MI protocol, for performance tests
+
+Answers the commands ricodebug sends from a synthetic program instead of a
+real debuggee. Its size and the latency of every reply can be configured:
+    python3 helpers/fakegdb.py --threads 10000 --array 1000000 --depth 50 --latency 5
+To run ricodebug against it, set the GDB command in the debugging options
+to such a command line. The program has the locals
+    argc      an int that is incremented on every stop
+    arr       an int array of --array elements
+    s         a struct nested --depth levels deep (members value and next)
+and --threads threads, each stopped in a stack of --frames frames. The
+function sleep(ms) can be called in expressions; like an inferior call that
+hangs, it only returns early if gdb receives SIGINT.
+"""
+
+import argparse
+import re
+import signal
+import sys
+import time
+
+
+def cstring(s):
+    return '"%s"' % s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def tuple_(**kwargs):
+    return "{%s}" % ",".join('%s=%s' % (k, v) for k, v in kwargs.items())
+
+
+class MiError(Exception):
+    pass
+
+
+class Program:
+    """The synthetic debuggee"""
+    def __init__(self, args):
+        self.args = args
+        self.stops = 0
+        self.currentThread = 1
+        self.currentFrame = 0
+
+    def frame(self, level, thread=1):
+        line = 10 + self.stops % 100 if level == 0 else 100 + level
+        return tuple_(level=cstring(str(level)), addr=cstring("0x%016x" % (0x400000 + 16 * level + thread)),
+                      func=cstring("main" if level == self.args.frames - 1 else "func%d" % level),
+                      file=cstring("main.c"), fullname=cstring("/tmp/fakegdb/main.c"),
+                      line=cstring(str(line)))
+
+    def lookup(self, exp):
+        """Return type, value and the number of children of an expression
+        of the program"""
+        # arr also answers what StlVectorParser asks a std::vector
+        m = re.match(r'^\(arr\)\.(?:size\(\)|begin\(\)\._M_current\+(\d+))$', exp.replace(" ", ""))
+        if m:
+            if m.group(1) is None:
+                return "size_type", str(self.args.array), 0
+            return "int *", "(int *) 0x%x" % (0x601040 + 4 * int(m.group(1))), 1
+        m = re.match(r'^(argc|arr|s)((?:\.\w+|\[\d+\])*)$', exp.replace(" ", ""))
+        if not m:
+            if re.match(r'^-?\d+$', exp):
+                return "int", exp, 0
+            raise MiError('No symbol "%s" in current context.' % exp)
+
+        base, path = m.groups()
+        if base == "argc":
+            node = ("int", str(self.stops))
+        elif base == "arr":
+            node = ("arr",)
+        else:
+            node = ("struct", 0)
+        for part in re.findall(r'\.\w+|\[\d+\]', path):
+            node = self.child(node, part)
+        return self.describe(node)
+
+    def child(self, node, part):
+        if node[0] == "arr" and part.startswith("["):
+            i = int(part[1:-1])
+            if i < self.args.array:
+                return ("int", str(i + self.stops))
+        elif node[0] == "struct" and part == ".value":
+            return ("int", str(node[1]))
+        elif node[0] == "struct" and part == ".next" and node[1] + 1 < self.args.depth:
+            return ("struct", node[1] + 1)
+        raise MiError("There is no member named %s." % part.strip(".[]"))
+
+    def describe(self, node):
+        if node[0] == "int":
+            return "int", node[1], 0
+        if node[0] == "arr":
+            return "int [%d]" % self.args.array, "[%d]" % self.args.array, self.args.array
+        return "struct level%d" % node[1], "{...}", 2 if node[1] + 1 < self.args.depth else 1
+
+    def children(self, exp):
+        """Return the child expressions (relative and absolute) of exp"""
+        type_, value, numchild = self.lookup(exp)
+        if type_.startswith("int ["):
+            return [(str(i), "%s[%d]" % (exp, i)) for i in range(numchild)]
+        members = ["value", "next"][:numchild]
+        return [(m, "%s.%s" % (exp, m)) for m in members]
+
+
+class FakeGdb:
+    def __init__(self, args, out=sys.stdout):
+        self.args = args
+        self.out = out
+        self.program = Program(args)
+        self.vars = {}
+        self.varId = 0
+        self.breakpoints = 0
+        # set when SIGINT is received, see interrupt
+        self.interrupted = False
+
+    def interrupt(self, *_):
+        self.interrupted = True
+
+    def write(self, *lines):
+        self.out.write("".join(l + "\n" for l in lines))
+
+    def run(self, input_=sys.stdin):
+        self.write('=thread-group-added,id="i1"', "(gdb) ")
+        self.out.flush()
+        for line in input_:
+            line = line.strip()
+            if not line:
+                continue
+            m = re.match(r'^(\d*)(-[\w-]+)\s*(.*)$', line)
+            if self.args.latency:
+                time.sleep(self.args.latency / 1000.0)
+            if not m:
+                self.write('&%s' % cstring(line + "\n"), '^error,msg="Undefined command: \\"%s\\"."' % line.split(" ")[0], "(gdb) ")
+            else:
+                token, cmd, args = m.groups()
+                if cmd == "-gdb-exit":
+                    self.write(token + "^exit")
+                    self.out.flush()
+                    return
+                self.execute(token, cmd, args)
+            self.out.flush()
+
+    def execute(self, token, cmd, args):
+        handler = getattr(self, "cmd_" + cmd[1:].replace("-", "_"), None)
+        if handler is None:
+            self.write(token + '^error,msg=%s' % cstring('Undefined MI command: %s' % cmd[1:]), "(gdb) ")
+            return
+        try:
+            after = handler(token, self.splitArgs(args))
+        except MiError as e:
+            self.write(token + '^error,msg=%s' % cstring(str(e)), "(gdb) ")
+            return
+        self.write("(gdb) ")
+        if after:
+            self.write(*after)
+
+    @staticmethod
+    def splitArgs(args):
+        return [re.sub(r'\\(.)', r'\1', a[1:-1]) if a.startswith('"') else a
+                for a in re.findall(r'"(?:[^"\\]|\\.)*"|\S+', args)]
+
+    def done(self, token, results=""):
+        self.write(token + "^done" + ("," + results if results else ""))
+
+    # commands that only need to succeed
+    def cmd_ok(self, token, args):
+        self.done(token)
+    cmd_file_exec_and_symbols = cmd_environment_cd = cmd_inferior_tty_set = cmd_ok
+    cmd_gdb_set = cmd_exec_arguments = cmd_break_delete = cmd_break_enable = cmd_ok
+    cmd_break_disable = cmd_break_after = cmd_break_condition = cmd_ok
+    cmd_enable_pretty_printing = cmd_interpreter_exec = cmd_ok
+
+    def cmd_target_select(self, token, args):
+        self.write(token + "^connected")
+
+    def cmd_file_list_exec_source_files(self, token, args):
+        self.done(token, 'files=[%s]' % tuple_(file=cstring("main.c"), fullname=cstring("/tmp/fakegdb/main.c")))
+
+    def cmd_break_insert(self, token, args):
+        self.breakpoints += 1
+        line = re.search(r':(\d+)$', args[-1]) if args else None
+        self.done(token, "bkpt=" + tuple_(number=cstring(str(self.breakpoints)), type=cstring("breakpoint"),
+                                          disp=cstring("keep"), enabled=cstring("y"), addr=cstring("0x0000000000400500"),
+                                          func=cstring("main"), file=cstring("main.c"), fullname=cstring("/tmp/fakegdb/main.c"),
+                                          line=cstring(line.group(1) if line else "10"), times=cstring("0"),
+                                          **{"original-location": cstring(args[-1] if args else "main")}))
+
+    def cmd_break_list(self, token, args):
+        self.done(token, 'BreakpointTable={nr_rows="0",nr_cols="6",hdr=[],body=[]}')
+
+    def __stop(self, token, reason):
+        """Answer an exec command: the program runs and stops again"""
+        self.program.stops += 1
+        self.program.currentFrame = 0
+        self.write(token + "^running", '*running,thread-id="all"')
+        return ['*stopped,reason=%s,frame=%s,thread-id="%d",stopped-threads="all"' % (
+                cstring(reason), self.program.frame(0, self.program.currentThread), self.program.currentThread),
+                "(gdb) "]
+
+    def cmd_exec_run(self, token, args):
+        return self.__stop(token, "breakpoint-hit")
+
+    def cmd_exec_continue(self, token, args):
+        return self.__stop(token, "breakpoint-hit")
+
+    def cmd_exec_next(self, token, args):
+        return self.__stop(token, "end-stepping-range")
+    cmd_exec_step = cmd_exec_until = cmd_exec_next
+
+    def cmd_exec_finish(self, token, args):
+        return self.__stop(token, "function-finished")
+
+    def cmd_exec_interrupt(self, token, args):
+        return self.__stop(token, "signal-received")
+
+    def cmd_stack_list_frames(self, token, args):
+        self.done(token, "stack=[%s]" % ",".join("frame=" + self.program.frame(i) for i in range(self.args.frames)))
+
+    def cmd_stack_info_depth(self, token, args):
+        self.done(token, 'depth="%d"' % self.args.frames)
+
+    def cmd_stack_select_frame(self, token, args):
+        level = int(args[0])
+        if level >= self.args.frames:
+            raise MiError("No frame at level %s." % args[0])
+        self.program.currentFrame = level
+        self.done(token)
+
+    @staticmethod
+    def printValues(args):
+        """Return 0, 1 or 2 for --no-values, --all-values or --simple-values"""
+        for i, option in enumerate(["--no-values", "--all-values", "--simple-values"]):
+            if option in args or str(i) in args:
+                return i
+        return 0
+
+    def cmd_stack_list_variables(self, token, args):
+        printValues = self.printValues(args)
+        variables = []
+        for name, arg in (("argc", True), ("arr", False), ("s", False)):
+            type_, value, numchild = self.program.lookup(name)
+            d = {"name": cstring(name)}
+            if arg:
+                d["arg"] = cstring("1")
+            if printValues == 2:
+                d["type"] = cstring(type_)
+            if printValues == 1 or printValues == 2 and numchild == 0:
+                d["value"] = cstring(value)
+            variables.append(tuple_(**d))
+        self.done(token, "variables=[%s]" % ",".join(variables))
+
+    def cmd_thread_info(self, token, args):
+        threads = []
+        for i in range(1, self.args.threads + 1):
+            threads.append(tuple_(id=cstring(str(i)), **{"target-id": cstring("Thread 0x%x (LWP %d)" % (0x7ffff7000000 + i, 1000 + i)),
+                                  "name": cstring("worker%d" % i), "frame": self.program.frame(0, i),
+                                  "state": cstring("stopped"), "core": cstring(str(i % 8))}))
+        self.done(token, 'threads=[%s],current-thread-id="%d"' % (",".join(threads), self.program.currentThread))
+
+    def cmd_thread_select(self, token, args):
+        thread = int(args[0])
+        if not 1 <= thread <= self.args.threads:
+            raise MiError("Invalid thread id: %s" % args[0])
+        self.program.currentThread = thread
+        self.done(token, 'new-thread-id="%d",frame=%s' % (thread, self.program.frame(0, thread)))
+
+    def cmd_data_evaluate_expression(self, token, args):
+        exp = args[-1] if args else ""
+        m = re.match(r'^sleep\((\d+)\)$', exp)
+        if m:
+            self.sleep(int(m.group(1)) / 1000.0)
+            self.done(token, 'value="0"')
+            return
+        if exp.startswith("&"):
+            self.program.lookup(exp[1:])
+            self.done(token, 'value="(int *) 0x601040"')
+            return
+        self.done(token, "value=" + cstring(self.program.lookup(exp)[1]))
+
+    def sleep(self, seconds):
+        """Call sleep in the inferior; it is aborted by SIGINT"""
+        self.interrupted = False
+        end = time.time() + seconds
+        while time.time() < end:
+            if self.interrupted:
+                raise MiError("The program being debugged was signaled while in a function called from GDB.")
+            time.sleep(0.005)
+
+    def cmd_var_create(self, token, args):
+        exp = args[-1]
+        type_, value, numchild = self.program.lookup(exp)
+        self.varId += 1
+        name = "var%d" % self.varId
+        self.vars[name] = (exp, value)
+        self.done(token, 'name="%s",numchild="%d",value=%s,type=%s,thread-id="1",has_more="0"' % (
+                  name, numchild, cstring(value), cstring(type_)))
+
+    def __var(self, name):
+        """Return the expression of a variable object"""
+        if name not in self.vars:
+            raise MiError("Variable object not found")
+        return self.vars[name][0]
+
+    def cmd_var_delete(self, token, args):
+        name = args[-1]
+        self.__var(name)
+        deleted = [n for n in self.vars if n == name or n.startswith(name + ".")]
+        for n in deleted:
+            del self.vars[n]
+        self.done(token, 'ndeleted="%d"' % len(deleted))
+
+    def cmd_var_list_children(self, token, args):
+        # [print-values] name [from to]
+        args = [a for a in args if not a.startswith("--")]
+        if args and args[0].isdigit():
+            args = args[1:]
+        name = args[0]
+        children = self.program.children(self.__var(name))
+        total = len(children)
+        end = total
+        if len(args) == 3:
+            end = int(args[2])
+            children = children[int(args[1]):end]
+        r = []
+        for exp, path in children:
+            type_, value, numchild = self.program.lookup(path)
+            self.vars[name + "." + exp] = (path, value)
+            r.append("child=" + tuple_(name=cstring(name + "." + exp), exp=cstring(exp), numchild=cstring(str(numchild)),
+                                       value=cstring(value), type=cstring(type_), **{"thread-id": cstring("1")}))
+        self.done(token, 'numchild="%d",children=[%s],has_more="%d"' % (
+                  len(r), ",".join(r), 1 if end < total else 0))
+
+    def cmd_var_update(self, token, args):
+        name = args[-1]
+        names = list(self.vars) if name == "*" else [name]
+        changes = []
+        for n in names:
+            exp, old = self.__var(n), self.vars[n][1]
+            value = self.program.lookup(exp)[1]
+            if value != old:
+                self.vars[n] = (exp, value)
+                changes.append(tuple_(name=cstring(n), value=cstring(value), in_scope=cstring("true"),
+                                      type_changed=cstring("false"), has_more=cstring("0")))
+        self.done(token, "changelist=[%s]" % ",".join(changes))
+
+    def cmd_var_evaluate_expression(self, token, args):
+        self.done(token, "value=" + cstring(self.program.lookup(self.__var(args[-1]))[1]))
+
+    def cmd_var_assign(self, token, args):
+        self.__var(args[0])
+        self.done(token, "value=" + cstring(args[1]))
+
+    def cmd_info_gdb_mi_command(self, token, args):
+        exists = self.args.python and args[-1] == "ricodebug-eval-many"
+        self.done(token, 'command={exists="%s"}' % ("true" if exists else "false"))
+
+    def cmd_ricodebug_eval_many(self, token, args):
+        """The command of helpers/ricodebuggdb.py, if started with --python"""
+        if not self.args.python:
+            raise MiError("Undefined MI command: ricodebug-eval-many")
+        values = []
+        for exp in args:
+            try:
+                values.append(tuple_(exp=cstring(exp), value=cstring(self.program.lookup(exp)[1])))
+            except MiError as e:
+                values.append(tuple_(exp=cstring(exp), error=cstring(str(e))))
+        self.done(token, "values=[%s]" % ",".join(values))
+
+    def cmd_list_features(self, token, args):
+        self.done(token, 'features=["frozen-varobjs","pending-breakpoints","thread-info","data-read-memory-bytes","python"]')
+
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, default=1, help="number of threads")
+    parser.add_argument("--frames", type=int, default=10, help="depth of the stack")
+    parser.add_argument("--array", type=int, default=100, help="number of elements of arr")
+    parser.add_argument("--depth", type=int, default=5, help="levels of nesting of s")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds to wait before every reply")
+    parser.add_argument("--python", action="store_true", help="provide the commands of helpers/ricodebuggdb.py")
+    # the options gdb is usually started with are ignored
+    parser.add_argument("-i", "--interpreter")
+    parser.add_argument("-q", action="store_true")
+    parser.add_argument("-nx", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    gdb = FakeGdb(parseArgs(argv))
+    # like gdb, survive the SIGINTs sent to interrupt the inferior
+    signal.signal(signal.SIGINT, gdb.interrupt)
+    gdb.run()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,33 @@
+import io
+import unittest
+from . import fakegdb
+from . import gdbreplies
+from .gdbmidecoder import GdbMiDecoder
+
+
+class Test(unittest.TestCase):
+    def run_(self, options, *cmds):
+        """Run the commands and return the result records by token"""
+        out = io.StringIO()
+        fakegdb.FakeGdb(fakegdb.parseArgs(options), out).run(io.StringIO("".join("%04d%s\n" % (i + 1, c) for i, c in enumerate(cmds))))
+        lines = [l for l in out.getvalue().splitlines() if not l.startswith("(gdb)")]
+        return {r.token: r for r in GdbMiDecoder.parse(lines) if r.token}
+
+    def testReplies(self):
+        res = self.run_(["--threads", "100", "--array", "1000", "--depth", "50"],
+                        "-exec-run", "-thread-info", "-stack-list-frames", '-var-create - * "arr"',
+                        '-var-create - * "s.next.next"', "-var-list-children --all-values var1",
+                        "-var-list-children var2", "-exec-next", '-var-update --all-values "*"',
+                        "-stack-list-variables --simple-values", '-data-evaluate-expression "x"')
+        self.assertEqual(len(gdbreplies.decodeThreadInfo(res["0002"].raw)[1]), 100)
+        self.assertEqual(len(gdbreplies.decodeStack(res["0003"].raw)), 10)
+        self.assertEqual(len(gdbreplies.decodeVarChildren(res["0006"].raw)), 1000)
+        self.assertEqual([c.exp for c in gdbreplies.decodeVarChildren(res["0007"].raw)], ["value", "next"])
+        # all elements of arr change on every step
+        self.assertEqual(len(gdbreplies.decodeVarUpdate(res["0009"].raw)), 1000)
+        self.assertEqual([v.name for v in gdbreplies.decodeVariables(res["0010"].raw)], ["argc", "arr", "s"])
+        self.assertEqual(res["0011"].msg, 'No symbol "x" in current context.')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,15 +22,23 @@
 #
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
+import copy
 import subprocess
 import signal
 import logging
+import threading
 import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError
 
 from PyQt4.QtCore import QObject, pyqtSignal
 
 from .gdbreader import GdbReader
 from .gdboutput import GdbOutput
+from .querycache import QueryCache
+from .misession import MiRecorder
+from .gdbextensions import GdbExtensions, quote
+from .gdbreplies import decodeVarUpdate, decodeVarChildren, decodeStack, decodeThreadInfo, decodeVariables
 import helpers
 import os
 
@@ -38,46 +46,282 @@ import os
 class GdbConnector(QObject):
     commandExecuted = pyqtSignal('PyQt_PyObject', 'PyQt_PyObject', float)
 
+    # seconds execute waits for the result of a command, unless DEADLINES
+    # has an entry for its class (the first word of the command)
+    RESULT_TIMEOUT = 2.0
+    DEADLINES = {
+        "-file-exec-and-symbols": 120.0,
+        "-file-list-exec-source-files": 30.0,
+        "-data-disassemble": 10.0,
+        "-target-select": 30.0,
+        "-interpreter-exec": 10.0,
+        "-data-evaluate-expression": 5.0,
+        "-var-create": 5.0,
+        "-var-update": 5.0,
+        "-ricodebug-eval-many": 10.0,
+        "-ricodebug-dump": 30.0,
+    }
+    # commands that may call functions of the inferior and hang there; gdb
+    # is interrupted if they time out
+    INTERRUPTIBLE = frozenset(["-data-evaluate-expression", "-var-create",
+                               "-var-update", "-var-evaluate-expression"])
+
     def __init__(self):
         QObject.__init__(self)
         self.__gdb = None
+        # a gdb started in advance as (command, process), see spawnStandby
+        self.__standby = None
+        self.queryCache = QueryCache()
         self.reader = GdbReader(self)
+        self.reader.queryCache = self.queryCache
         self.__cmdId = 0
-
-    def start(self):
-        self.kill()
-
+        # commands may be sent from several threads
+        self.__writeLock = threading.Lock()
+        # number of timeouts per command class
+        self.timeouts = Counter()
+        self.recorder = None
+        # seconds added to every round trip to gdb, to see how the views
+        # behave with a slow connection
+        self.latency = 0.0
+        # returns the commands to send as soon as a *stopped record arrives,
+        # see setStopQueries
+        self.__stopQueries = None
+        self.__prefetched = None
+        # the commands of helpers/ricodebuggdb.py, loaded on start
+        self.extensions = GdbExtensions(self)
+
+    DEFAULT_COMMAND = ['gdb', '-i', 'mi', '-q', '-nx']
+
+    def __spawn(self, command):
         try:
-            self.__gdb = subprocess.Popen(['gdb', '-i', 'mi', '-q', '-nx'], \
-                    shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+            return subprocess.Popen(command, shell=False, stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE, bufsize=0)
         except OSError as e:
             logging.critical("Could not start _gdb. Error message: %s", e)
+
+    def start(self, command=None):
+        """Start gdb; command may replace the default command line, eg. to
+        run helpers/fakegdb.py instead
+
+        A standby gdb started with the same command is used if available."""
+        command = command or self.DEFAULT_COMMAND
+        standby, self.__standby = self.__standby, None
+        if standby is not None and standby[0] == command and standby[1].poll() is None:
+            gdb = standby[1]
+        else:
+            if standby is not None:
+                standby[1].kill()
+            gdb = self.__spawn(command)
+        self.attachProcess(gdb)
+        self.extensions.load()
+
+    def spawnStandby(self, command=None):
+        """Start a gdb in advance that the next start will use, so that it
+        does not have to wait for gdb to start up"""
+        command = command or self.DEFAULT_COMMAND
+        if self.__standby is not None:
+            if self.__standby[0] == command and self.__standby[1].poll() is None:
+                return
+            self.discardStandby()
+        gdb = self.__spawn(command)
+        if gdb is not None:
+            self.__standby = (command, gdb)
+
+    def discardStandby(self):
+        if self.__standby is not None:
+            self.__standby[1].kill()
+            self.__standby = None
+
+    def attachProcess(self, process):
+        """Talk to process instead of the current gdb
+
+        process must provide stdin, stdout, kill and send_signal like a
+        subprocess.Popen, see eg. misession.ReplayProcess."""
+        self.kill()
+        # the reader must have seen the end of the old process' output
+        self.reader.wait()
+        self.__gdb = process
         self.reader.startReading(self.__gdb.stdout)
 
+    def startRecording(self, filename):
+        """Record the session with gdb to filename, see misession"""
+        self.stopRecording()
+        self.recorder = self.reader.recorder = MiRecorder(filename)
+        logging.info("Recording the MI session to %s", filename)
+
+    def stopRecording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = self.reader.recorder = None
+
     def kill(self):
         if self.__gdb:
             self.__gdb.kill()
-        self.__cmdId = 0
+        self.reader.failPending(helpers.excep.GdbError("gdb has been killed"))
+        self.queryCache.invalidate()
+        with self.__writeLock:
+            self.__cmdId = 0
+
+    def __send(self, cmds, delay=True):
+        """Send cmds with a single write; returns a future for each of them
+
+        Commands whose result is in the query cache are not sent; their
+        futures are already resolved. Unless delay is False, the artificial
+        latency is waited for first."""
+        futures = []
+        sent = []
+        data = []
+        if self.latency and delay:
+            time.sleep(self.latency)
+        with self.__writeLock:
+            start = time.time()
+            for cmd in cmds:
+                res, generation = self.queryCache.lookup(cmd)
+                future = Future()
+                futures.append(future)
+                if res is not None:
+                    future.token = None
+                    future.set_result(res)
+                    continue
+
+                self.__cmdId += 1
+                logging.debug("Running command %s as id %d", cmd, self.__cmdId)
+                future.token = "%04d" % self.__cmdId
+                self.reader.expectResult(future.token, future)
+                sent.append((cmd, generation, future))
+                data.append(bytes("%s%s" % (future.token, cmd), 'ascii') + b'\n')
+            if data:
+                data = b"".join(data)
+                recorder = self.recorder
+                if recorder is not None:
+                    recorder.recordSent(data)
+                self.__gdb.stdin.write(data)
+                self.__gdb.stdin.flush()
+
+        # the time is reported from the start of the batch
+        def executed(cmd, generation):
+            def done(f):
+                if not f.cancelled() and f.exception() is None:
+                    self.queryCache.store(cmd, generation, f.result())
+                    self.commandExecuted.emit(cmd, f.result(), time.time() - start)
+            return done
+        for cmd, generation, future in sent:
+            future.add_done_callback(executed(cmd, generation))
+
+        return futures
+
+    def executeAsync(self, cmd):
+        """Send cmd to gdb without waiting for its result
+
+        Returns a concurrent.futures.Future that the reader resolves with the
+        result record carrying the command's token. Several commands can
+        thus be sent back to back and cost about a single round trip.
+        """
+        return self.__send([cmd])[0]
+
+    @staticmethod
+    def commandClass(cmd):
+        return cmd.partition(" ")[0]
+
+    def deadline(self, cmd):
+        """Return the number of seconds to wait for the result of cmd"""
+        return self.DEADLINES.get(self.commandClass(cmd), self.RESULT_TIMEOUT)
+
+    def cancel(self, future):
+        """Cancel a command sent with executeAsync
+
+        Its result will be dropped when it arrives; gdb is interrupted to
+        abort evaluations that hang in the inferior. Returns False if the
+        result has already arrived."""
+        self.reader.forgetResult(future.token)
+        if not future.cancel():
+            return False
+        self.interrupt()
+        return True
+
+    def __wait(self, future, cmd, start):
+        deadline = self.deadline(cmd)
+        try:
+            return future.result(max(0, start + deadline - time.time()))
+        except TimeoutError:
+            self.reader.forgetResult(future.token)
+            cls = self.commandClass(cmd)
+            self.timeouts[cls] += 1
+            logging.warning("Command '%s' timed out after %.1f s (%d timeouts for %s)",
+                    cmd, deadline, self.timeouts[cls], cls)
+            if cls in self.INTERRUPTIBLE and future.cancel():
+                self.interrupt()
+            raise helpers.excep.GdbTimeoutError(cmd, deadline)
 
     def execute(self, cmd, error_msg=None):
-        __start = time.time()
-
-        self.__cmdId += 1
-        logging.debug("Running command %s as id %d", cmd, self.__cmdId)
-        token = "%04d" % self.__cmdId
-        self.__gdb.stdin.write(bytes("%s%s" % (token, cmd), 'ascii')+b'\n')
-        self.__gdb.stdin.flush()
-        res = self.reader.getResult(GdbOutput.RESULT_RECORD)
-        assert (res.token == token)
+        """Send cmd to gdb and wait for its result record, which may be
+        shared with other callers by the query cache and must not be
+        changed"""
+        res = self.__wait(self.executeAsync(cmd), cmd, time.time())
 
         if res.class_ == GdbOutput.ERROR:
             logging.debug("Command '%s' failed with %s (%s, '%s')",
                     cmd, res.msg, res.raw, error_msg)
 
-        self.commandExecuted.emit(cmd, res, time.time() - __start)
-
         return res
 
+    def executeBatch(self, cmds):
+        """Send all cmds to gdb at once and wait for their results
+
+        Returns the result records in the order of cmds; failed commands
+        are not raised but returned as error records.
+        """
+        if not cmds:
+            return []
+        return self.__collect(cmds, self.__send(cmds), time.time())
+
+    def setStopQueries(self, queriesFor):
+        """Send queriesFor(rec) from the reader thread as soon as gdb
+        reports a stop with rec
+
+        The results are waiting (or already there) when the gui gets to
+        handle the stop, see takeStopQueries; this saves the time the
+        *stopped record spends in the event queue, which matters with a
+        remote target. queriesFor may return no commands for stops that
+        are not shown, and None disables the prefetching."""
+        self.__stopQueries = queriesFor
+        self.__prefetched = None
+        self.reader.stopHook = self.__prefetchStopQueries if queriesFor else None
+
+    def __prefetchStopQueries(self, rec):
+        queriesFor = self.__stopQueries
+        cmds = queriesFor(rec) if queriesFor else None
+        if cmds:
+            # sleeping for the artificial latency here would hold back the
+            # *stopped record, so takeStopQueries waits for it instead
+            self.__prefetched = (rec, cmds, self.__send(cmds, delay=False), time.time())
+
+    def takeStopQueries(self, rec, cmds):
+        """Return the results of cmds prefetched for the stop reported by
+        rec, or execute them now if they have not been prefetched"""
+        prefetched, self.__prefetched = self.__prefetched, None
+        if prefetched is None or prefetched[0] is not rec or prefetched[1] != cmds:
+            return self.executeBatch(cmds)
+        # the results cannot have arrived before one latency after sending
+        remaining = prefetched[3] + self.latency - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+        return self.__collect(*prefetched[1:])
+
+    def __collect(self, cmds, futures, start):
+        try:
+            results = [self.__wait(f, cmd, start) for cmd, f in zip(cmds, futures)]
+        except helpers.excep.GdbError:
+            for f in futures:
+                self.reader.forgetResult(f.token)
+            raise
+
+        for cmd, res in zip(cmds, results):
+            if res.class_ == GdbOutput.ERROR:
+                logging.debug("Command '%s' failed with %s (%s)", cmd, res.msg, res.raw)
+
+        return results
+
     def executeAndRaiseIfFailed(self, cmd, error_msg=None):
         res = self.execute(cmd, error_msg)
 
@@ -126,26 +370,20 @@ class GdbConnector(QObject):
 
         breakpoints = []
         for bp in res.BreakpointTable.body:
+            bp = bp.src
             if not hasattr(bp, "fullname"):
+                # the result may be cached, see execute
+                bp = copy.copy(bp)
                 bp.fullname = "n/a"
-            breakpoints.append(bp.src)
+            breakpoints.append(bp)
 
         return breakpoints
 
     def getLocals(self):
+        """Return the locals and arguments of the selected frame as a list
+        of gdbreplies.Variable"""
         res = self.executeAndRaiseIfFailed("-stack-list-variables --no-values")
-
-        variables = []
-
-        if hasattr(res, "variables"):
-            for v in res.variables:
-                if not hasattr(v, "arg"):
-                    v.arg = False
-                else:
-                    v.arg = True
-                variables.append(v)
-
-        return variables
+        return decodeVariables(res.raw)
 
     def getStack(self, thread_id=None):
         if thread_id:
@@ -163,6 +401,14 @@ class GdbConnector(QObject):
 
         return stack
 
+    def getFrames(self, thread_id=None):
+        """Like getStack, but returns a list of gdbreplies.Frame"""
+        if thread_id:
+            res = self.executeAndRaiseIfFailed("-stack-list-frames --thread %s" % thread_id)
+        else:
+            res = self.executeAndRaiseIfFailed("-stack-list-frames")
+        return decodeStack(res.raw)
+
     def insertWatchpoint(self, exp):
         addr = self.evaluate("&" + exp)
         if not addr:
@@ -179,6 +425,28 @@ class GdbConnector(QObject):
     def deleteBreakpoint(self, number):
         return self.executeAndRaiseIfFailed("-break-delete " + str(number))
 
+    def deleteBreakpoints(self, numbers):
+        """Delete several breakpoints with a single command"""
+        return self.executeAndRaiseIfFailed("-break-delete " + " ".join(str(n) for n in numbers))
+
+    def insertBreakpoints(self, specs):
+        """Insert several breakpoints at once
+
+        specs is a list of (location, condition, skip, enabled) tuples;
+        returns the result record for each of them, failed insertions are
+        returned as error records."""
+        cmds = []
+        for loc, condition, skip, enabled in specs:
+            cmd = "-break-insert"
+            if condition and condition != "true":
+                cmd += ' -c "%s"' % condition.replace("\\", "\\\\").replace('"', '\\"')
+            if skip and int(skip) > 0:
+                cmd += " -i %d" % int(skip)
+            if not enabled:
+                cmd += " -d"
+            cmds.append(cmd + " " + loc)
+        return self.executeBatch(cmds)
+
     def enableBreakpoint(self, number):
         return self.executeAndRaiseIfFailed("-break-enable " + str(number),
                 "Could not enable breakpoint " + str(number) + ".")
@@ -197,6 +465,15 @@ class GdbConnector(QObject):
                 + " " + str(condition), "Could not set condition '" +
                 str(condition) + "' for breakpoint " + str(number) + ".")
 
+    def connectRemote(self, target, executable=None):
+        """Connect to a gdbserver listening at target (host:port)
+
+        In extended-remote mode, the gdbserver starts executable on -exec-run."""
+        self.executeAndRaiseIfFailed("-target-select extended-remote " + target,
+                "Could not connect to " + target + ".")
+        if executable:
+            self.executeAndRaiseIfFailed("-gdb-set remote exec-file " + executable)
+
     def changeWorkingDirectory(self, dir_):
         return self.executeAndRaiseIfFailed("-environment-cd " + dir_)
 
@@ -248,6 +525,30 @@ class GdbConnector(QObject):
         self.__gdb.send_signal(signal.SIGINT)
         # return self.executeAndRaiseIfFailed("-exec-interrupt")
 
+    def getInferiorPid(self):
+        """The process id of the (first) inferior, or None if it has not
+        been started"""
+        res = self.execute("-list-thread-groups")
+        if res.class_ == GdbOutput.ERROR:
+            return None
+        for group in res.groups:
+            pid = getattr(group, "pid", None)
+            if pid is not None:
+                return int(pid)
+        return None
+
+    def interruptAll(self):
+        """Stop all threads; in non-stop mode, interrupt only stops the
+        current one"""
+        return self.executeAndRaiseIfFailed("-exec-interrupt --all")
+
+    def setNonStop(self, enabled):
+        """Only halt the thread that stops (eg. at a breakpoint) and keep
+        the others running; must be set before the program is started"""
+        # non-stop mode requires the asynchronous execution of commands
+        self.executeAndRaiseIfFailed("-gdb-set mi-async " + ("on" if enabled else "off"))
+        self.executeAndRaiseIfFailed("-gdb-set non-stop " + ("on" if enabled else "off"))
+
     def until(self, file_, line):
         loc = file_ + ":" + str(line)
         return self.executeAndRaiseIfFailed("-exec-until " + loc)
@@ -259,6 +560,18 @@ class GdbConnector(QObject):
         else:
             return res.value
 
+    def evaluateMany(self, exps):
+        """Evaluate all exps with a single batch of commands; returns their
+        values in the same order, None for the ones that failed
+
+        Unlike for evaluate, the expressions must not be quoted."""
+        if self.extensions.available:
+            values = self.extensions.evaluateMany(exps)
+            if values is not None:
+                return values
+        results = self.executeBatch(["-data-evaluate-expression " + quote(exp) for exp in exps])
+        return [None if res.class_ == GdbOutput.ERROR else res.value for res in results]
+
     def executeCliCommand(self, cmd):
         res = self.execute("-interpreter-exec console \"" + cmd + "\"")
         if res.class_ == GdbOutput.ERROR:
@@ -282,6 +595,22 @@ class GdbConnector(QObject):
     def var_update(self, exp):
         return self.execute("-var-update --all-values \"" + exp + "\"")
 
+    def getVarChanges(self, exp):
+        """Return the changelist of var_update as a list of
+        gdbreplies.VarChange, or None if the update failed"""
+        res = self.var_update(exp)
+        if res.class_ == GdbOutput.ERROR:
+            return None
+        return decodeVarUpdate(res.raw)
+
+    def getVarChildren(self, exp):
+        """Return the children of var_list_children as a list of
+        gdbreplies.VarChild; the list is empty if the command failed"""
+        res = self.var_list_children(exp)
+        if res.class_ == GdbOutput.ERROR:
+            return []
+        return decodeVarChildren(res.raw)
+
     def getStackDepth(self):
         res = self.execute("-stack-info-depth")
         if res.class_ == GdbOutput.ERROR:
@@ -295,6 +624,11 @@ class GdbConnector(QObject):
     def threadInfo(self):
         return self.executeAndRaiseIfFailed("-thread-info")
 
+    def getThreads(self):
+        """Return the id of the current thread and a list of
+        gdbreplies.Thread"""
+        return decodeThreadInfo(self.threadInfo().raw)
+
     def selectThread(self, id_):
         return self.executeAndRaiseIfFailed("-thread-select %s" % id_)
 
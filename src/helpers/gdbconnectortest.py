@@ -0,0 +1,80 @@
+import sys
+import time
+import unittest
+from .excep import GdbTimeoutError
+from .gdbconnector import GdbConnector
+from .gdboutput import GdbOutput
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.connector = GdbConnector()
+        self.connector.start([sys.executable, "-m", "helpers.fakegdb"])
+
+    def tearDown(self):
+        self.connector.kill()
+
+    def waitForStop(self):
+        while True:
+            for rec in self.connector.reader.takeAsyncRecords():
+                if rec.type_ == GdbOutput.EXEC_ASYN and rec.class_ == GdbOutput.STOPPED:
+                    return rec
+            time.sleep(0.001)
+
+    def testPrefetchedStopQueries(self):
+        c = self.connector
+        c.latency = 0.2
+        c.setStopQueries(lambda rec: ["-stack-list-frames"])
+        c.next_()
+        rec = self.waitForStop()
+        # sending the queries does not hold back the *stopped record...
+        self.assertLess(time.time() - rec.timestamp, 0.1)
+        res = c.takeStopQueries(rec, ["-stack-list-frames"])
+        # ...but their results still take a round trip
+        self.assertGreaterEqual(time.time() - rec.timestamp, 0.2)
+        self.assertEqual(res[0].class_, GdbOutput.DONE)
+
+    def testCachedResultsAreNotChanged(self):
+        c = self.connector
+        res = c.execute("-stack-list-variables --no-values")
+        self.assertEqual([(v.name, v.arg) for v in c.getLocals()], [("argc", True), ("arr", False), ("s", False)])
+        # getLocals got the cached record
+        self.assertEqual(c.queryCache.statistics(), (1, 1))
+        self.assertFalse(any(hasattr(v, "arg") for v in res.variables[1:]))
+
+    def testTimeout(self):
+        c = self.connector
+        c.DEADLINES = dict(c.DEADLINES, **{"-data-evaluate-expression": 0.2})
+        self.assertRaises(GdbTimeoutError, c.execute, '-data-evaluate-expression "sleep(5000)"')
+        self.assertEqual(c.timeouts["-data-evaluate-expression"], 1)
+        # the evaluation was interrupted, so gdb answers right away
+        start = time.time()
+        self.assertEqual(c.execute('-data-evaluate-expression "argc"').value, "0")
+        self.assertLess(time.time() - start, 1)
+
+    def testLateReplyIsDropped(self):
+        c = self.connector
+        c.DEADLINES = dict(c.DEADLINES, **{"-stack-info-depth": 0.2})
+        # gdb is busy with the first command when the second one times out
+        slow = c.executeAsync('-data-evaluate-expression "sleep(500)"')
+        self.assertRaises(GdbTimeoutError, c.execute, "-stack-info-depth")
+        self.assertEqual(slow.result(2).value, "0")
+        # the late reply of -stack-info-depth arrives now; it must not be
+        # taken for the result of the next command
+        self.assertEqual(c.execute('-data-evaluate-expression "argc"').value, "0")
+        self.assertEqual(c.getStackDepth(), 10)
+
+    def testCancel(self):
+        c = self.connector
+        future = c.executeAsync('-data-evaluate-expression "sleep(5000)"')
+        time.sleep(0.1)
+        self.assertTrue(c.cancel(future))
+        self.assertTrue(future.cancelled())
+        # gdb was interrupted instead of finishing the evaluation
+        start = time.time()
+        self.assertEqual(c.execute('-data-evaluate-expression "argc"').value, "0")
+        self.assertLess(time.time() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Executes gdb queries off the GUI thread
+
+Waiting for gdb in the GUI thread freezes the UI for as long as gdb takes
+to answer. The GdbExecutor runs queries in a worker thread and hands their
+results to callbacks that are called in the GUI thread, where the models
+may be updated.
+"""
+
+import logging
+import queue
+from concurrent.futures import Future
+
+from PyQt4.QtCore import QThread, Qt, pyqtSignal
+
+
+class GdbExecutor(QThread):
+    queryDone = pyqtSignal('PyQt_PyObject')
+
+    def __init__(self, parent=None):
+        QThread.__init__(self, parent)
+        self.__queue = queue.Queue()
+        # the executor lives in the GUI thread, so the slot runs there
+        self.queryDone.connect(self.__deliver, Qt.QueuedConnection)
+
+    def submit(self, fn, callback=None, errback=None):
+        """Run fn() in the worker thread
+
+        callback is called with the result in the GUI thread; if fn raises,
+        errback is called with the exception instead (or the exception is
+        logged). The queries run in the order they were submitted. Returns a
+        concurrent.futures.Future for the result.
+        """
+        future = Future()
+        future.callback = callback
+        future.errback = errback
+        self.__queue.put((fn, future))
+        return future
+
+    def stop(self):
+        """Finish the queued queries and end the worker thread"""
+        self.__queue.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                return
+            fn, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+            self.queryDone.emit(future)
+
+    def __deliver(self, future):
+        e = future.exception()
+        if e is None:
+            if future.callback:
+                future.callback(future.result())
+        elif future.errback:
+            future.errback(e)
+        else:
+            logging.error("Query to gdb failed: %s", e)
@@ -0,0 +1,136 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Client for the commands that ricodebuggdb adds to gdb
+
+GdbExtensions sources helpers/ricodebuggdb.py into gdb and finds out how
+its commands can be used: as MI commands (gdb 13 and later), as CLI
+commands writing their results into a file (gdb with Python, but without
+gdb.MICommand), or not at all (gdb without Python), in which case the
+callers fall back to one MI command per value.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from .gdboutput import GdbOutput, Result
+
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ricodebuggdb.py")
+
+
+def quote(s):
+    return '"%s"' % s.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def toPython(o):
+    """Turn Results (and lists of them) into dicts and lists"""
+    if isinstance(o, Result):
+        return dict((name, toPython(value)) for name, value in o.items())
+    if isinstance(o, list):
+        return [toPython(i) for i in o]
+    return o
+
+
+class GdbExtensions:
+    NONE, CLI, MI = range(3)
+
+    def __init__(self, connector):
+        self.connector = connector
+        self.mode = GdbExtensions.NONE
+
+    @property
+    def available(self):
+        return self.mode != GdbExtensions.NONE
+
+    def load(self):
+        """Source the script into gdb and detect how to use its commands"""
+        self.mode = GdbExtensions.NONE
+        if self.__miCommandExists():
+            # already loaded, eg. by a .gdbinit
+            self.mode = GdbExtensions.MI
+        else:
+            res = self.connector.execute("-interpreter-exec console " + quote("source " + SCRIPT))
+            if res.class_ == GdbOutput.ERROR:
+                logging.debug("Could not load the gdb extensions: %s", res.msg)
+            elif self.__miCommandExists():
+                self.mode = GdbExtensions.MI
+            elif self.__cli("ricodebug-eval-many", ["1"]) is not None:
+                self.mode = GdbExtensions.CLI
+        logging.debug("gdb extensions: %s", ["not available", "CLI", "MI"][self.mode])
+        return self.mode
+
+    def __miCommandExists(self):
+        res = self.connector.execute("-info-gdb-mi-command ricodebug-eval-many")
+        return res.class_ != GdbOutput.ERROR and res.command.exists == "true"
+
+    def __cli(self, command, args):
+        """Run a CLI command of the script; returns its result, or None if
+        it failed"""
+        fd, filename = tempfile.mkstemp(prefix="ricodebug-", suffix=".json")
+        os.close(fd)
+        try:
+            cmd = " ".join([command, quote(filename)] + [quote(a) for a in args])
+            res = self.connector.execute("-interpreter-exec console " + quote(cmd))
+            if res.class_ == GdbOutput.ERROR:
+                return None
+            with open(filename) as f:
+                return json.load(f)
+        except ValueError:
+            # the command did not write anything
+            return None
+        finally:
+            os.remove(filename)
+
+    def __run(self, command, args):
+        if self.mode == GdbExtensions.MI:
+            res = self.connector.execute(" ".join(["-" + command] + [quote(a) for a in args]))
+            if res.class_ == GdbOutput.ERROR:
+                logging.debug("%s failed: %s", command, res.msg)
+                return None
+            return toPython(res.values if command == "ricodebug-eval-many" else res.tree)
+        if self.mode == GdbExtensions.CLI:
+            res = self.__cli(command, args)
+            if res is None:
+                return None
+            return res["values"] if command == "ricodebug-eval-many" else res["tree"]
+        raise RuntimeError("The gdb extensions are not available")
+
+    def evaluateMany(self, exps):
+        """Evaluate all exps with a single command; returns their values in
+        the same order, None for the ones that failed, or None if the
+        command itself failed"""
+        if not exps:
+            return []
+        values = self.__run("ricodebug-eval-many", exps)
+        if values is None:
+            return None
+        return [v.get("value") for v in values]
+
+    def dump(self, exp, depth=3, maxChildren=100):
+        """Return the tree of members and elements below exp as nested
+        dicts with the keys name, type and either value, children (a list
+        of such dicts) or error; None if exp cannot be evaluated"""
+        return self.__run("ricodebug-dump", [exp, str(depth), str(maxChildren)])
@@ -0,0 +1,64 @@
+import json
+import re
+import unittest
+from .gdbextensions import GdbExtensions
+from .gdbmidecoder import GdbMiDecoder
+
+
+class Connector:
+    """Answers commands with replies looked up by a prefix of the command"""
+    def __init__(self, replies):
+        self.replies = replies
+        self.executed = []
+
+    def execute(self, cmd):
+        self.executed.append(cmd)
+        for prefix, reply in self.replies:
+            if cmd.startswith(prefix):
+                if callable(reply):
+                    reply = reply(cmd)
+                return GdbMiDecoder.parse([reply])[0]
+        return GdbMiDecoder.parse(['^error,msg="Undefined MI command"'])[0]
+
+
+class Test(unittest.TestCase):
+    def testMi(self):
+        c = Connector([("-info-gdb-mi-command", '^done,command={exists="true"}'),
+                       ("-ricodebug-eval-many", '^done,values=[{exp="a",value="1"},{exp="b[",error="syntax error"}]'),
+                       ("-ricodebug-dump", '^done,tree={name="s",type="struct s",children=[{name="x",type="int",value="2"}]}')])
+        ext = GdbExtensions(c)
+        self.assertEqual(ext.load(), GdbExtensions.MI)
+        self.assertEqual(ext.evaluateMany(["a", "b["]), ["1", None])
+        self.assertEqual(c.executed[-1], '-ricodebug-eval-many "a" "b["')
+        self.assertEqual(ext.dump("s"), {"name": "s", "type": "struct s",
+                                         "children": [{"name": "x", "type": "int", "value": "2"}]})
+
+    def testCli(self):
+        def cli(cmd):
+            # the results are written to the file given as first argument
+            m = re.search(r'ricodebug-eval-many \\"(.*?)\\"', cmd)
+            if m:
+                with open(m.group(1), "w") as f:
+                    json.dump({"values": [{"exp": "1", "value": "1"}]}, f)
+            return "^done"
+        c = Connector([("-interpreter-exec", cli)])
+        ext = GdbExtensions(c)
+        self.assertEqual(ext.load(), GdbExtensions.CLI)
+        self.assertEqual(ext.evaluateMany(["1"]), ["1"])
+
+    def testFailure(self):
+        c = Connector([("-info-gdb-mi-command", '^done,command={exists="true"}'),
+                       ("-ricodebug-eval-many", '^error,msg="Python Exception <class \'gdb.error\'>"')])
+        ext = GdbExtensions(c)
+        ext.load()
+        # the caller falls back to one command per expression
+        self.assertIsNone(ext.evaluateMany(["a"]))
+
+    def testUnavailable(self):
+        ext = GdbExtensions(Connector([("-interpreter-exec", '^error,msg="Python scripting is not supported"')]))
+        self.assertEqual(ext.load(), GdbExtensions.NONE)
+        self.assertFalse(ext.available)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Cache for the symbol indices gdb builds when loading a binary
+
+Without an index, gdb has to scan all of the DWARF information of a binary
+before it can look up a single symbol, which takes tens of seconds for large
+debug builds. gdb can store the index it builds in a cache directory, keyed
+by the build id of the binary, and use it on later loads of the same build.
+"""
+
+import os
+import struct
+
+from .gdbextensions import quote
+from .gdboutput import GdbOutput
+
+_SHT_NOTE = 7
+_NT_GNU_BUILD_ID = 3
+
+
+def readBuildId(filename):
+    """Return the GNU build id of an ELF file as a hex string, or None if
+    the file is not an ELF file or has no build id"""
+    try:
+        with open(filename, "rb") as f:
+            ident = f.read(16)
+            if len(ident) < 16 or ident[:4] != b"\x7fELF":
+                return None
+            is64 = ident[4] == 2
+            endian = "<" if ident[5] == 1 else ">"
+
+            # the location of the section header table
+            if is64:
+                f.seek(0x28)
+                shoff, = struct.unpack(endian + "Q", f.read(8))
+                f.seek(0x3a)
+            else:
+                f.seek(0x20)
+                shoff, = struct.unpack(endian + "I", f.read(4))
+                f.seek(0x2e)
+            shentsize, shnum = struct.unpack(endian + "HH", f.read(4))
+
+            for i in range(shnum):
+                f.seek(shoff + i * shentsize)
+                if is64:
+                    _, type_, _, _, offset, size = struct.unpack(endian + "IIQQQQ", f.read(40))
+                else:
+                    _, type_, _, _, offset, size = struct.unpack(endian + "IIIIII", f.read(24))
+                if type_ != _SHT_NOTE:
+                    continue
+                f.seek(offset)
+                buildId = _findBuildId(f.read(size), endian)
+                if buildId is not None:
+                    return buildId
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _findBuildId(notes, endian):
+    pos = 0
+    while pos + 12 <= len(notes):
+        namesz, descsz, type_ = struct.unpack_from(endian + "III", notes, pos)
+        pos += 12
+        name = notes[pos:pos + namesz]
+        # name and descriptor are padded to 4 bytes
+        pos += (namesz + 3) & ~3
+        desc = notes[pos:pos + descsz]
+        pos += (descsz + 3) & ~3
+        if type_ == _NT_GNU_BUILD_ID and name.rstrip(b"\0") == b"GNU":
+            return desc.hex()
+    return None
+
+
+class GdbIndexCache:
+    """Points gdb to a per-build-id index cache directory"""
+
+    # the setting was renamed in gdb 13; older versions (8.3 and later) only
+    # know the short form
+    ENABLE_COMMANDS = ["-gdb-set index-cache enabled on", "-gdb-set index-cache on"]
+
+    def __init__(self, connector, directory):
+        self.connector = connector
+        self.directory = directory
+        self.supported = None
+
+    def enable(self):
+        """Enable the cache in gdb; returns False if gdb does not support
+        it, in which case binaries are simply loaded without it"""
+        os.makedirs(self.directory, exist_ok=True)
+        res = self.connector.execute("-gdb-set index-cache directory " + quote(self.directory))
+        self.supported = False
+        if res.class_ != GdbOutput.ERROR:
+            for cmd in self.ENABLE_COMMANDS:
+                if self.connector.execute(cmd).class_ != GdbOutput.ERROR:
+                    self.supported = True
+                    break
+        return self.supported
+
+    def disable(self):
+        if self.supported:
+            self.connector.execute("-gdb-set index-cache off")
+
+    def hasIndex(self, buildId):
+        """Whether gdb has stored an index for the build id in the cache"""
+        if buildId is None:
+            return False
+        try:
+            return any(name.startswith(buildId) for name in os.listdir(self.directory))
+        except OSError:
+            return False
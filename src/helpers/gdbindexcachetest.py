@@ -0,0 +1,70 @@
+import os
+import struct
+import tempfile
+import unittest
+from .gdbindexcache import readBuildId, GdbIndexCache
+from .gdbmidecoder import GdbMiDecoder
+
+
+def elf64(notes):
+    """A minimal little endian ELF64 file with a single note section"""
+    header = b"\x7fELF\x02\x01\x01" + bytes(9)
+    header += struct.pack("<HHIQQQIHHHHHH", 2, 62, 1, 0, 0, 64, 0, 64, 0, 0, 64, 2, 0)
+    shdrs = bytes(64) + struct.pack("<IIQQQQIIQQ", 0, 7, 2, 0, 64 + 128, len(notes), 0, 0, 4, 0)
+    return header + shdrs + notes
+
+
+def note(name, type_, desc):
+    pad = lambda b: b + bytes(-len(b) % 4)
+    return struct.pack("<III", len(name), len(desc), type_) + pad(name) + pad(desc)
+
+
+class Connector:
+    """Records the commands sent to gdb"""
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        return GdbMiDecoder.parse(["^done"])[0]
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, data):
+        filename = os.path.join(self.dir.name, "a.out")
+        with open(filename, "wb") as f:
+            f.write(data)
+        return filename
+
+    def testBuildId(self):
+        buildId = bytes(range(20))
+        notes = note(b"GNU\0", 1, bytes(16)) + note(b"GNU\0", 3, buildId)
+        self.assertEqual(readBuildId(self.write(elf64(notes))), buildId.hex())
+
+        self.assertIsNone(readBuildId(self.write(elf64(note(b"GNU\0", 1, bytes(16))))))
+        self.assertIsNone(readBuildId(self.write(b"#!/bin/sh\n")))
+        self.assertIsNone(readBuildId(os.path.join(self.dir.name, "missing")))
+
+    def testHasIndex(self):
+        cache = GdbIndexCache(None, self.dir.name)
+        open(os.path.join(self.dir.name, "0011ff.gdb-index"), "w").close()
+        self.assertTrue(cache.hasIndex("0011ff"))
+        self.assertFalse(cache.hasIndex("0011fe"))
+        self.assertFalse(cache.hasIndex(None))
+
+    def testEnable(self):
+        directory = os.path.join(self.dir.name, "index cache")
+        connector = Connector()
+        self.assertTrue(GdbIndexCache(connector, directory).enable())
+        self.assertEqual(connector.commands[0], '-gdb-set index-cache directory "%s"' % directory)
+        self.assertTrue(os.path.isdir(directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
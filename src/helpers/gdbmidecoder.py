@@ -0,0 +1,267 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Single pass decoder for the gdb output
+
+Produces the same GdbOutput/Result/Assignment structures as the grammar in
+gdbresultparser, which is kept as the reference implementation. Nested
+tuples and lists are handled with an explicit stack instead of recursion, so
+the decoder runs in linear time regardless of the size and depth of the
+records.
+"""
+
+import re
+import sys
+
+from .gdboutput import GdbOutput, Result, Assignment
+from .excep import GdbError
+from .tools import unBackslashify
+
+
+_HEADER = re.compile(r'(\d*)([\^*+=])([\w-]+)')
+_VARIABLE = re.compile(r'([\w-]+)=')
+# same rule as the lexer in gdbresultparser: a string ends at a quote that is
+# not escaped and is followed by a delimiter
+_C_STRING = re.compile(r'"(.*?)(?<!\\)"(?=(,|\}|\]|$))', re.DOTALL)
+
+_TYPES = {
+    "^": GdbOutput.RESULT_RECORD,
+    "*": GdbOutput.EXEC_ASYN,
+    "+": GdbOutput.STATUS_ASYN,
+    "=": GdbOutput.NOTIFY_ASYN,
+    "~": GdbOutput.CONSOLE_STREAM,
+    "@": GdbOutput.TARGET_STREAM,
+    "&": GdbOutput.LOG_STREAM,
+}
+
+_RESULT_CLASSES = {
+    "done": GdbOutput.DONE,
+    "running": GdbOutput.RUNNING,
+    "connected": GdbOutput.CONNECTED,
+    "error": GdbOutput.ERROR,
+    "exit": GdbOutput.EXIT,
+}
+
+_ASYNC_CLASSES = {
+    "stopped": GdbOutput.STOPPED,
+    "running": GdbOutput.RUNNING,
+    "thread-created": GdbOutput.THREAD_CREATED,
+    "thread-group-created": GdbOutput.THREAD_GROUP_CREATED,
+    "thread-group-added": GdbOutput.THREAD_GROUP_ADDED,
+    "thread-group-started": GdbOutput.THREAD_GROUP_STARTED,
+    "thread-exited": GdbOutput.THREAD_EXITED,
+    "thread-group-exited": GdbOutput.THREAD_GROUP_EXITED,
+    "thread-selected": GdbOutput.THREAD_SELECTED,
+    "library-loaded": GdbOutput.LIBRARY_LOADED,
+    "library-unloaded": GdbOutput.LIBRARY_UNLOADED,
+    "breakpoint-modified": GdbOutput.BREAKPOINT_MODIFIED,
+    "breakpoint-created": GdbOutput.BREAKPOINT_CREATED,
+    "breakpoint-deleted": GdbOutput.BREAKPOINT_DELETED,
+    "record-started": GdbOutput.RECORD_STARTED,
+    "record-stopped": GdbOutput.RECORD_STOPPED,
+    "cmd-param-changed": GdbOutput.CMD_PARAM_CHANGED,
+}
+
+_TOP, _TUPLE, _LIST = range(3)
+
+
+def _syntaxError(s, pos):
+    return GdbError("Syntax error in input, col %d: %s" % (pos, s[pos:pos + 20]))
+
+
+def decodeResults(s, pos, factories=None):
+    """Decode the comma separated results from s[pos] to the end of s
+
+    Returns a list of Assignments, just like result_list in the grammar.
+    Tuples are turned into Results, unless factories maps the name of the
+    tuple (or of the list, for tuples that are elements of a list) to a
+    function that builds something else from the tuple's Assignments.
+    """
+    n = len(s)
+    items = []
+    kind = _TOP
+    stack = []
+
+    while True:
+        # an element is either "variable=value" or, inside lists, a value
+        c = s[pos:pos + 1]
+        if c == '"' or c == '{' or c == '[':
+            if kind != _LIST:
+                raise _syntaxError(s, pos)
+            key = None
+        else:
+            m = _VARIABLE.match(s, pos)
+            if not m:
+                raise _syntaxError(s, pos)
+            key = sys.intern(m.group(1))
+            pos = m.end()
+            c = s[pos:pos + 1]
+
+        if c == '"':
+            m = _C_STRING.match(s, pos)
+            if not m:
+                raise _syntaxError(s, pos)
+            value = m.group(1)
+            if "\\" in value:
+                value = unBackslashify(value)
+            pos = m.end()
+        elif c == '{' or c == '[':
+            pos += 1
+            if s[pos:pos + 1] == ('}' if c == '{' else ']'):
+                # the grammar returns an empty list for both "{}" and "[]"
+                pos += 1
+                value = []
+            else:
+                stack.append((items, kind, key))
+                items = []
+                kind = _TUPLE if c == '{' else _LIST
+                continue
+        else:
+            raise _syntaxError(s, pos)
+
+        # store the value and close all containers that end here
+        while True:
+            items.append(value if key is None else Assignment(key, value))
+            c = s[pos:pos + 1]
+            if c == ",":
+                pos += 1
+                break
+            if kind == _TOP:
+                if pos != n:
+                    raise _syntaxError(s, pos)
+                return items
+            if c != ('}' if kind == _TUPLE else ']'):
+                raise _syntaxError(s, pos)
+            pos += 1
+            value = items
+            isTuple = (kind == _TUPLE)
+            items, kind, key = stack.pop()
+            if isTuple:
+                make = Result.fromAssignments
+                if factories:
+                    # elements of a list are named after the list
+                    name = key if key is not None or kind != _LIST else stack[-1][2]
+                    make = factories.get(name, make)
+                value = make(value)
+
+
+def decodeHeader(s, res):
+    """Decode everything up to the results of a record into res
+
+    Sets type_, class_ and token of the GdbOutput res (or string for stream
+    records) and returns the position where the results start, or None if
+    there are none.
+    """
+    c = s[:1]
+    if c == '~' or c == '@' or c == '&':
+        m = _C_STRING.match(s, 1)
+        if not m or m.end() != len(s):
+            raise _syntaxError(s, 1)
+        res.type_ = _TYPES[c]
+        res.string = unBackslashify(m.group(1))
+        return None
+
+    m = _HEADER.match(s)
+    if not m:
+        raise _syntaxError(s, 0)
+    token, prefix, class_ = m.groups()
+    classes = _RESULT_CLASSES if prefix == "^" else _ASYNC_CLASSES
+    if class_ not in classes:
+        raise GdbError("Got " + class_ + " which cannot occur here!")
+
+    res.type_ = _TYPES[prefix]
+    res.class_ = classes[class_]
+    res.token = token or None
+
+    pos = m.end()
+    if pos == len(s):
+        return None
+    if s[pos] != ",":
+        raise _syntaxError(s, pos)
+    return pos + 1
+
+
+def decodePayload(s, pos, res):
+    """Decode the results starting at s[pos] into res"""
+    results = decodeResults(s, pos)
+    if res.type_ == GdbOutput.RESULT_RECORD:
+        for a in results:
+            setattr(res, a.dest, a.src)
+    else:
+        res.results = results
+
+
+class LazyGdbOutput(GdbOutput):
+    """A GdbOutput that decodes its results on first access
+
+    Only the header (type_, class_ and token) is decoded right away; most
+    consumers never look further than that. Note that syntax errors in the
+    results will therefore only be raised when the results are accessed.
+    """
+    def __getattr__(self, name):
+        # only called for attributes that have not been set (yet)
+        if not self.decode():
+            raise AttributeError("%s instance has no attribute '%s'" % (self.__class__.__name__, name))
+        return getattr(self, name)
+
+    def decode(self):
+        """Decode the results if that has not happened yet; returns whether
+        there was anything to decode"""
+        pending = self.__dict__.pop("_pending", None)
+        if pending is None:
+            return False
+        decodePayload(pending[0], pending[1], self)
+        return True
+
+
+def decodeRecord(s, lazy=False):
+    """Decode a single, stripped line of gdb output"""
+    res = LazyGdbOutput() if lazy else GdbOutput()
+    pos = decodeHeader(s, res)
+    if pos is not None:
+        if lazy:
+            res._pending = (s, pos)
+        else:
+            decodePayload(s, pos, res)
+    return res
+
+
+class GdbMiDecoder:
+    lazy = False
+
+    @classmethod
+    def parse(cls, lines):
+        """Decode the lines; drop-in replacement for GdbResultParser.parse
+        """
+        r = []
+        for line in lines:
+            line = line.strip()
+            r.append(decodeRecord(line, cls.lazy))
+            r[-1].raw = line
+
+        return r
+
+
+class LazyGdbMiDecoder(GdbMiDecoder):
+    """Decoder returning LazyGdbOutputs"""
+    lazy = True
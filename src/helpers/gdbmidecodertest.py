@@ -0,0 +1,136 @@
+import unittest
+from . import gdbresultparser
+from . import gdbmidecoder
+from .gdboutput import GdbOutput, Result, Assignment
+from .excep import GdbError
+from .gdbresultparsertest import loadCorpus
+
+
+def listChildren(n):
+    children = ",".join('child={name="var1.%d",exp="%d",numchild="0",value="%d",type="int",thread-id="1"}' % (i, i, i) for i in range(n))
+    return '^done,numchild="%d",children=[%s],has_more="0"' % (n, children)
+
+
+def changelist(n):
+    changes = ",".join('{name="var%d",value="%d",in_scope="true",type_changed="false",has_more="0"}' % (i, i) for i in range(n))
+    return '^done,changelist=[%s]' % changes
+
+
+def nested(depth):
+    return '*stopped,' + 'a={' * depth + 'b="leaf",c=["1","2"]' + '}' * depth
+
+
+def dump(o):
+    """Turn parsed records into plain Python objects that can be compared"""
+    if isinstance(o, list):
+        return [dump(i) for i in o]
+    if isinstance(o, Assignment):
+        return ("ASSIGN", o.dest, dump(o.src))
+    if isinstance(o, gdbmidecoder.LazyGdbOutput):
+        o.decode()
+    if isinstance(o, GdbOutput):
+        d = {k: getattr(o, k) for k in ("class_", "string", "type_", "token", "raw")}
+        d.update(vars(o))
+        return ("OUTPUT", {k: dump(v) for k, v in d.items()})
+    if isinstance(o, Result):
+        return ("RESULT", {k: dump(v) for k, v in o.items()})
+    return o
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.reference = gdbresultparser.GdbResultParser()
+        self.parser = gdbmidecoder.GdbMiDecoder()
+        self.lazyParser = gdbmidecoder.LazyGdbMiDecoder()
+
+    def assertParity(self, lines):
+        expected = dump(self.reference.parse(lines))
+        self.assertEqual(expected, dump(self.parser.parse(lines)))
+        self.assertEqual(expected, dump(self.lazyParser.parse(lines)))
+
+    def testCorpus(self):
+        for batch in loadCorpus():
+            self.assertParity(batch)
+
+    def testListChildren(self):
+        self.assertParity([listChildren(2000)])
+
+    def testChangelist(self):
+        self.assertParity([changelist(2000)])
+
+    def testNested(self):
+        self.assertParity([nested(50)])
+
+    def testTokens(self):
+        self.assertParity(['0042^done', '0043^error,msg="No symbol \\"foo\\" in current context."', '12*running,thread-id="all"'])
+
+    def testStreams(self):
+        self.assertParity(['~"Breakpoint 1 at 0x40056f: file main.cpp, line 14.\\n"', '@"target output\\t"', '&"info break 1\\n"'])
+
+    def testEmpty(self):
+        self.assertParity(['^done,stack=[],locals={}', '=thread-group-added,id="i1",list=[{}]'])
+
+    def testValueLists(self):
+        self.assertParity(['^done,thread-ids={thread-id="2",thread-id="1"},number-of-threads="2",values=["1","2",["3",{a="4"}]]'])
+
+    def testDeeplyNested(self):
+        res = self.parser.parse([nested(100000)])[0]
+        self.assertEqual(res.type_, GdbOutput.EXEC_ASYN)
+        a = res.results[0].src
+        for _ in range(100000 - 1):
+            a = a.a
+        self.assertEqual(a.b, "leaf")
+        self.assertEqual(a.c, ["1", "2"])
+
+    def testLarge(self):
+        res = self.parser.parse([listChildren(100000)])[0]
+        self.assertEqual(len(res.children), 100000)
+        self.assertEqual(res.children[-1].src.name, "var1.99999")
+
+    def testLazy(self):
+        res = self.lazyParser.parse(['0012' + changelist(3)])[0]
+        self.assertEqual(res.token, "0012")
+        self.assertEqual(res.class_, GdbOutput.DONE)
+        self.assertIn("_pending", vars(res))
+        self.assertTrue(hasattr(res, "changelist"))
+        self.assertNotIn("_pending", vars(res))
+        self.assertEqual(res.changelist[2].name, "var2")
+        self.assertFalse(hasattr(res, "msg"))
+
+        res = self.lazyParser.parse(['*stopped,reason="exited-normally"'])[0]
+        self.assertEqual(res.results[0].src, "exited-normally")
+
+        # errors in the header are raised right away, errors in the results
+        # on first access
+        self.assertRaises(GdbError, self.lazyParser.parse, ['^foo,a="b"'])
+        res = self.lazyParser.parse(['^done,a={b="c"'])[0]
+        self.assertRaises(GdbError, getattr, res, "a")
+
+    def testCompactResults(self):
+        res = self.parser.parse([listChildren(3)])[0]
+        a, b = res.children[0].src, res.children[1].src
+        self.assertEqual(a.name, "var1.0")
+        self.assertEqual(getattr(a, "thread-id"), "1")
+        self.assertFalse(hasattr(a, "foo"))
+        # all children share their names and the common values
+        self.assertIs(a._schema, b._schema)
+        self.assertIs(a.type, b.type)
+
+        # results may still be changed and extended
+        a.level = 1
+        a.name = "foo"
+        self.assertEqual((a.level, a.name, a.exp), (1, "foo", "0"))
+        self.assertEqual(b.name, "var1.1")
+        self.assertFalse(hasattr(b, "level"))
+
+        self.assertEqual(Result.fromAssignments([Assignment("a", "1"), Assignment("a", "2")]).items(), [("a", "2")])
+
+    def testErrors(self):
+        for line in ['^done,', '^foo', '^done,a="x"junk', '^done,a={b="c"', '^done,a=[b="c"}', 'garbage', '^done,"x"',
+                     '^done,files={{file="a"},{file="b"}}']:
+            self.assertRaises(GdbError, self.parser.parse, [line])
+            self.assertRaises(Exception, self.reference.parse, [line])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,9 +23,11 @@
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
 """
-Predefined constants for the gdb output
+Predefined constants and the data structures for the gdb output
 """
 
+import sys
+
 
 class GdbOutput:
     RESULT_RECORD, \
@@ -58,8 +60,121 @@ class GdbOutput:
     ERROR \
  = range(28)
 
+    # the results of a record are stored in __dict__
+    __slots__ = ("class_", "string", "type_", "token", "raw", "timestamp", "__dict__")
+
     def __init__(self):
         self.class_ = None  # done, running,...
         self.string = None  # the string of a stream output
         self.type_ = None   # the type of a async response
         self.token = None   # the token of the command this is the result to
+        self.timestamp = None  # when the GdbReader received the record
+
+
+# values of these results are interned, since the same few strings are
+# repeated over and over again (eg. for all children of an array)
+INTERNED_VALUES = frozenset([
+    "type", "numchild", "in_scope", "type_changed", "has_more", "thread-id",
+    "dynamic", "displayhint", "new_type", "new_num_children", "arg", "func",
+    "file", "fullname", "from", "state", "core", "target-id", "enabled",
+    "disp", "thread-groups", "times", "addr", "level"])
+
+
+class _Schema:
+    """The names of a Result; shared by all Results with the same names"""
+    __slots__ = ("names", "index", "extensions")
+
+    def __init__(self, names):
+        self.names = tuple(sys.intern(n) for n in names)
+        self.index = {n: i for i, n in enumerate(names)}
+        self.extensions = {}
+
+    def extend(self, name):
+        """Return the schema with name appended to our names"""
+        try:
+            return self.extensions[name]
+        except KeyError:
+            s = self.extensions[name] = _schema(self.names + (name,))
+            return s
+
+
+_schemas = {}
+
+
+def _schema(names):
+    try:
+        return _schemas[names]
+    except KeyError:
+        return _schemas.setdefault(names, _Schema(names))
+
+
+class Result:
+    """A tuple of the gdb output, eg. {name="var1",numchild="0",...}
+
+    The values are accessible as attributes. They are stored in a tuple,
+    together with a reference to the (interned) names shared by all Results
+    with the same names, which needs considerably less memory than one
+    dictionary per Result.
+    """
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self):
+        object.__setattr__(self, "_schema", _schema(()))
+        object.__setattr__(self, "_values", ())
+
+    @classmethod
+    def fromAssignments(cls, assignments):
+        """Build a Result from a list of Assignments; if a name occurs more
+        than once, the last value wins"""
+        d = {}
+        for a in assignments:
+            v = a.src
+            if a.dest in INTERNED_VALUES and v.__class__ is str:
+                v = sys.intern(v)
+            d[a.dest] = v
+        r = cls.__new__(cls)
+        object.__setattr__(r, "_schema", _schema(tuple(d)))
+        object.__setattr__(r, "_values", tuple(d.values()))
+        return r
+
+    def __getattr__(self, name):
+        # only called if name is not one of the slots
+        try:
+            return self._values[self._schema.index[name]]
+        except KeyError:
+            raise AttributeError("%s instance has no attribute '%s'" % (self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        i = self._schema.index.get(name)
+        if i is None:
+            object.__setattr__(self, "_schema", self._schema.extend(name))
+            object.__setattr__(self, "_values", self._values + (value,))
+        else:
+            v = self._values
+            object.__setattr__(self, "_values", v[:i] + (value,) + v[i + 1:])
+
+    def __getstate__(self):
+        return self.items()
+
+    def __setstate__(self, state):
+        Result.__init__(self)
+        for name, value in state:
+            setattr(self, name, value)
+
+    def items(self):
+        """Return a list of (name, value) pairs of all results"""
+        return list(zip(self._schema.names, self._values))
+
+    def __str__(self):
+        return "RESULT(" + dict(self.items()).__str__() + ")"
+
+
+class Assignment:
+    __slots__ = ("dest", "src")
+
+    def __init__(self, dest, src):
+        self.dest = dest
+        self.src = src
+
+    def __str__(self):
+        return "ASSIGN(" + self.dest.__str__() + "," + self.src.__str__() + ")"
@@ -26,24 +26,81 @@ from helpers.excep import GdbError
 """GdbReader that listens to the gnu debugger output
 """
 
-from PyQt4.QtCore import QThread, QMutex, QSemaphore, pyqtSignal
+import logging
+import threading
+import time
+
+from PyQt4.QtCore import QThread, pyqtSignal
 from .gdbresultparser import GdbResultParser
+from .gdbmidecoder import GdbMiDecoder, LazyGdbMiDecoder
 from .gdboutput import GdbOutput
-from collections import deque
+from .linereader import LineReader
 import helpers.excep
 
 
+class RecordQueue:
+    """Hands records over from the reader thread to the gui in batches
+
+    Only the first record put into an empty queue emits the wake signal.
+    The receiver (connected with a queued connection) takes all records
+    that arrived until its slot runs, so a flood of records costs one
+    event per event loop iteration instead of one per record.
+    """
+    def __init__(self, wake):
+        self.__wake = wake
+        self.__records = []
+        self.__lock = threading.Lock()
+
+    def put(self, rec):
+        with self.__lock:
+            wake = not self.__records
+            self.__records.append(rec)
+        if wake:
+            self.__wake.emit()
+
+    def take(self):
+        """Return and remove all queued records"""
+        with self.__lock:
+            records = self.__records
+            self.__records = []
+        return records
+
+
 class GdbReader(QThread):
-    asyncRecordReceived = pyqtSignal('PyQt_PyObject')
-    consoleRecordReceived = pyqtSignal('PyQt_PyObject')
+    # emitted when the first record is put into an empty queue; fetch the
+    # records with takeAsyncRecords and takeConsoleRecords, respectively
+    asyncRecordsPending = pyqtSignal()
+    consoleRecordsPending = pyqtSignal()
     forwardMultipleBreakpointInfo = pyqtSignal('PyQt_PyObject')
 
+    # the parsers available for the gdb output; the grammar based one is kept
+    # as a reference for the faster hand-written decoder
+    PARSERS = {"lazy": LazyGdbMiDecoder, "fast": GdbMiDecoder, "ply": GdbResultParser}
+
     def __init__(self, connector, parent=None):
         QThread.__init__(self, parent)
 
-        self.resultRecordQueue = deque()
-        self.resultRecordMutex = QMutex()
-        self.resultRecordSem = QSemaphore(0)
+        self.parser = LazyGdbMiDecoder
+        # the cache of the connector, if any; async records start a new
+        # generation
+        self.queryCache = None
+        # a misession.MiRecorder for the lines received, if any
+        self.recorder = None
+        # called with every *stopped record in the reader thread, before
+        # the record is forwarded
+        self.stopHook = None
+
+        # futures waiting for the result record with their token
+        self.__pending = {}
+        self.__pendingLock = threading.Lock()
+
+        # records not yet fetched by the gui
+        self.__asyncRecords = RecordQueue(self.asyncRecordsPending)
+        self.__consoleRecords = RecordQueue(self.consoleRecordsPending)
+
+    def setParser(self, name):
+        """Select the parser used for the gdb output, see PARSERS"""
+        self.parser = self.PARSERS[name]
 
     def startReading(self, stdout):
         """Intialise and start the gdbreader thread
@@ -60,31 +117,63 @@ class GdbReader(QThread):
 
     def listener(self):
         """Main method for listening to the gdb output
+
+        Every line is parsed and forwarded as soon as it arrives, so that
+        async records do not have to wait for the end of a long reply. The
+        "(gdb)" prompt only marks the end of gdb's output for a command.
         """
-        lines = []
-        while True:
-            line = str(self.stdout.readline(), "UTF-8")
-            if line.startswith("(gdb)"):
-                # Check if there is a multiple break
-                if lines[0].startswith("&\"info break "):
-                    asString = "<Multiple Break>"
-                    for line in lines:
-                        asString += line
-                    self.forwardMultipleBreakPointInfo(asString)
-                # FIXME: the line below might throw an execption; we should
-                # handle this gracefully
-                try:
-                    results = GdbResultParser.parse(lines)
-                except GdbError as e:
-                    # we can't use logging here since this will run inside a
-                    # thread. for now, use brute force
-                    raise
-
-                lines = []
-                for res in results:
-                    self.forwardResult(res)
-            else:
-                lines.append(line)
+        multipleBreak = None
+        atPrompt = True
+        # the lines are only decoded once they are known to be records
+        for line in LineReader(self.stdout).lines():
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.recordReceived(line)
+
+            if line[:5] == b"(gdb)":
+                if multipleBreak is not None:
+                    self.forwardMultipleBreakPointInfo("<Multiple Break>" + "".join(multipleBreak))
+                    multipleBreak = None
+                atPrompt = True
+                continue
+
+            line = str(line, "UTF-8")
+
+            # Check if there is a multiple break
+            if atPrompt and line.startswith("&\"info break "):
+                multipleBreak = []
+            if multipleBreak is not None:
+                multipleBreak.append(line + "\n")
+            atPrompt = False
+
+            self.processLine(line)
+
+        # gdb has been killed
+        self.failPending(helpers.excep.GdbError("gdb has been terminated"))
+
+    def processLine(self, line):
+        """Parse a line of gdb output and forward the record"""
+        received = time.time()
+        # FIXME: the line below might throw an execption; we should
+        # handle this gracefully
+        try:
+            res = self.parser.parse([line])[0]
+        except GdbError as e:
+            # we can't use logging here since this will run inside a
+            # thread. for now, use brute force
+            raise
+
+        res.timestamp = received
+        if self.queryCache is not None and (res.type_ == GdbOutput.EXEC_ASYN or res.type_ == GdbOutput.NOTIFY_ASYN):
+            self.queryCache.invalidate()
+        if self.stopHook is not None and res.type_ == GdbOutput.EXEC_ASYN and res.class_ == GdbOutput.STOPPED:
+            # an exception here would end the reader and leave every pending
+            # command waiting forever
+            try:
+                self.stopHook(res)
+            except Exception:
+                logging.exception("The stop hook failed for %s", line)
+        self.forwardResult(res)
 
     def forwardMultipleBreakPointInfo(self, lines):
         """Documentation Incomplete for this method!"""
@@ -96,42 +185,52 @@ class GdbReader(QThread):
         """
         type_ = res.type_
         if type_ == GdbOutput.RESULT_RECORD:
-            self.enqueueResult(res)
+            self.resolveResult(res)
         elif type_ == GdbOutput.EXEC_ASYN or \
              type_ == GdbOutput.STATUS_ASYN or \
              type_ == GdbOutput.NOTIFY_ASYN:
-            self.asyncRecordReceived.emit(res)
+            self.__asyncRecords.put(res)
         elif type_ == GdbOutput.CONSOLE_STREAM or \
              type_ == GdbOutput.TARGET_STREAM or \
              type_ == GdbOutput.LOG_STREAM:
-            self.consoleRecordReceived.emit(res)
+            self.__consoleRecords.put(res)
         else:
             raise helpers.excep.GdbError("Illegal type_!")
 
-    def enqueueResult(self, gdbresult):
-        # enqueueResult will be deprecated for other types
+    def takeAsyncRecords(self):
+        """Return and remove the async records received so far"""
+        return self.__asyncRecords.take()
+
+    def takeConsoleRecords(self):
+        """Return and remove the stream records received so far"""
+        return self.__consoleRecords.take()
+
+    def expectResult(self, token, future):
+        """Resolve future with the result record carrying token
+
+        Must be called before the command is sent to gdb."""
+        with self.__pendingLock:
+            self.__pending[token] = future
+
+    def forgetResult(self, token):
+        """Stop waiting for the result record carrying token; it will be
+        dropped when it arrives"""
+        with self.__pendingLock:
+            return self.__pending.pop(token, None)
+
+    def failPending(self, exception):
+        """Fail all futures that are still waiting for their result"""
+        with self.__pendingLock:
+            pending = list(self.__pending.values())
+            self.__pending.clear()
+        for future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exception)
+
+    def resolveResult(self, gdbresult):
         assert(gdbresult.type_ == GdbOutput.RESULT_RECORD)
-        q = self.resultRecordQueue
-        m = self.resultRecordMutex
-        s = self.resultRecordSem
-
-        m.lock()
-        q.append(gdbresult)
-        m.unlock()
-        s.release()
-
-    def getResult(self, type_):
-        """Get the first result in the queue
-        """
-        # getResult will be deprecated for other types
-        assert(type_ == GdbOutput.RESULT_RECORD)
-        q = self.resultRecordQueue
-        m = self.resultRecordMutex
-        s = self.resultRecordSem
-
-        if not s.tryAcquire(1, 2000):
-            return None
-        m.lock()
-        res = q.popleft()
-        m.unlock()
-        return res
+        future = self.forgetResult(gdbresult.token)
+        # results nobody waits for any more (or that have no token at all)
+        # are dropped
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_result(gdbresult)
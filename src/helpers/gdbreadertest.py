@@ -0,0 +1,75 @@
+import unittest
+from concurrent.futures import Future
+from .gdbreader import GdbReader
+from .excep import GdbError
+from .gdboutput import GdbOutput
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.reader = GdbReader(None)
+
+    def testTokens(self):
+        futures = {}
+        for token in ("0001", "0002", "0003"):
+            futures[token] = Future()
+            self.reader.expectResult(token, futures[token])
+
+        # results are matched by token, not by their order
+        self.reader.processLine('0002^done,value="2"')
+        self.reader.processLine('0001^error,msg="No symbol \\"x\\" in current context."')
+        self.assertEqual(futures["0002"].result(0).value, "2")
+        self.assertEqual(futures["0001"].result(0).msg, 'No symbol "x" in current context.')
+        self.assertFalse(futures["0003"].done())
+
+        # late and unknown results are dropped
+        self.reader.forgetResult("0003")
+        self.reader.processLine('0003^done')
+        self.reader.processLine('^done')
+        self.assertFalse(futures["0003"].done())
+
+    def testFailPending(self):
+        f = Future()
+        self.reader.expectResult("0001", f)
+        self.reader.failPending(GdbError("gdb has been terminated"))
+        self.assertRaises(GdbError, f.result, 0)
+
+    def testConsoleRecords(self):
+        for i in range(3):
+            self.reader.processLine('~"line %d\\n"' % i)
+
+        records = self.reader.takeConsoleRecords()
+        self.assertEqual([r.string for r in records], ["line 0\n", "line 1\n", "line 2\n"])
+        self.assertEqual(self.reader.takeConsoleRecords(), [])
+
+    def testAsyncRecords(self):
+        for i in range(1, 4):
+            self.reader.processLine('=thread-created,id="%d",group-id="i1"' % i)
+        self.reader.processLine('*running,thread-id="all"')
+
+        records = self.reader.takeAsyncRecords()
+        self.assertEqual([r.results[0].src for r in records[:3]], ["1", "2", "3"])
+        self.assertEqual(records[3].class_, GdbOutput.RUNNING)
+        self.assertEqual(self.reader.takeAsyncRecords(), [])
+
+    def testStopHook(self):
+        stops = []
+        self.reader.stopHook = stops.append
+        self.reader.processLine('*running,thread-id="all"')
+        self.reader.processLine('*stopped,reason="end-stepping-range",thread-id="1"')
+        # the hook sees the record before anybody else
+        self.assertEqual(len(stops), 1)
+        self.assertIs(stops[0], self.reader.takeAsyncRecords()[1])
+
+    def testFailingStopHook(self):
+        def hook(rec):
+            raise KeyError("bkptno")
+        self.reader.stopHook = hook
+        with self.assertLogs(level="ERROR"):
+            self.reader.processLine('*stopped,reason="breakpoint-hit",thread-id="1"')
+        # the record is forwarded anyway
+        self.assertEqual(self.reader.takeAsyncRecords()[0].class_, GdbOutput.STOPPED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Typed decoders for the most frequent replies of gdb
+
+Instead of generic Result trees, these decoders turn the raw line of a reply
+directly into lists of named tuples. Optional fields that gdb did not report
+are None.
+"""
+
+import re
+from collections import namedtuple
+
+from .gdboutput import GdbOutput
+from .gdbmidecoder import decodeHeader, decodeResults
+from .tools import unBackslashify
+
+
+# an entry of -var-update's changelist
+VarChange = namedtuple("VarChange", "name value in_scope type_changed new_type new_num_children has_more")
+
+# a child reported by -var-list-children; the pseudo children public,
+# private and protected do not have a type
+VarChild = namedtuple("VarChild", "name exp numchild value type thread_id")
+
+# a frame reported by -stack-list-frames and -thread-info
+Frame = namedtuple("Frame", "level addr func file fullname line")
+
+# a thread reported by -thread-info
+Thread = namedtuple("Thread", "id target_id name state core frame")
+
+# a local variable or argument reported by -stack-list-variables; type and
+# value are only reported with --simple-values and --all-values
+Variable = namedtuple("Variable", "name arg type value")
+
+
+_PAIR = re.compile(r'([\w-]+)="(.*?)(?<!\\)"(?=(,|\}|\]|$))', re.DOTALL)
+_TUPLE_NAME = re.compile(r'[\w-]+=(?=\{)')
+
+
+def _varChange(d):
+    n = d.get("new_num_children")
+    return VarChange(d["name"], d.get("value"), d.get("in_scope", "true"),
+                     d.get("type_changed") == "true", d.get("new_type"),
+                     None if n is None else int(n), d.get("has_more") == "1")
+
+
+def _varChild(d):
+    return VarChild(d["name"], d["exp"], int(d["numchild"]), d.get("value"),
+                    d.get("type"), d.get("thread-id"))
+
+
+def _frame(d):
+    level = d.get("level")
+    return Frame(None if level is None else int(level), d.get("addr"),
+                 d.get("func"), d.get("file"), d.get("fullname"), d.get("line"))
+
+
+def _thread(d):
+    return Thread(d["id"], d.get("target-id"), d.get("name"), d.get("state"),
+                  d.get("core"), d.get("frame"))
+
+
+def _variable(d):
+    return Variable(d["name"], d.get("arg") == "1", d.get("type"), d.get("value"))
+
+
+def _fromAssignments(make):
+    return lambda items: make({a.dest: a.src for a in items})
+
+
+def _decodeFlat(s, pos, listName, make):
+    """Fast path for replies consisting of strings and one list of flat
+    tuples, eg. -var-update's changelist
+
+    Returns the results as a dictionary, with the list's tuples turned into
+    make(dict), or None if the reply does not look like that.
+    """
+    results = {}
+    listStart = listName + "=["
+    while pos < len(s):
+        m = _PAIR.match(s, pos)
+        if m:
+            results[m.group(1)] = unBackslashify(m.group(2))
+            pos = m.end()
+        elif s.startswith(listStart, pos):
+            pos += len(listStart)
+            l = results[listName] = []
+            while s[pos:pos + 1] != "]":
+                # tuples may be named, as in children=[child={...},...]
+                m = _TUPLE_NAME.match(s, pos)
+                if m:
+                    pos = m.end()
+                if s[pos:pos + 1] != "{":
+                    return None
+                pos += 1
+                d = {}
+                while True:
+                    m = _PAIR.match(s, pos)
+                    if not m:
+                        return None
+                    value = m.group(2)
+                    d[m.group(1)] = unBackslashify(value) if "\\" in value else value
+                    c = s[m.end():m.end() + 1]
+                    pos = m.end() + 1
+                    if c == "}":
+                        break
+                l.append(make(d))
+                if s[pos:pos + 1] == ",":
+                    pos += 1
+            pos += 1
+        else:
+            return None
+
+        if pos < len(s):
+            if s[pos] != ",":
+                return None
+            pos += 1
+    return results
+
+
+def _decode(raw, listName, makers):
+    """Decode the results of the result record raw into a dictionary
+
+    makers maps the names of tuples to the functions building the typed
+    tuples from a dictionary; makers[listName] is used for the elements of
+    the list listName.
+    """
+    res = GdbOutput()
+    pos = decodeHeader(raw, res)
+    if res.type_ != GdbOutput.RESULT_RECORD or res.class_ == GdbOutput.ERROR:
+        raise ValueError("'%s' is not a successful result record" % raw)
+    if pos is None:
+        return {}
+
+    d = _decodeFlat(raw, pos, listName, makers[listName])
+    if d is not None:
+        return d
+
+    factories = {name: _fromAssignments(make) for name, make in makers.items()}
+    d = {a.dest: a.src for a in decodeResults(raw, pos, factories)}
+    if listName in d:
+        # named tuples come wrapped in Assignments
+        d[listName] = [getattr(v, "src", v) for v in d[listName]]
+    return d
+
+
+def decodeVarUpdate(raw):
+    """Return the list of VarChanges of a -var-update reply"""
+    return _decode(raw, "changelist", {"changelist": _varChange}).get("changelist", [])
+
+
+def decodeVarChildren(raw):
+    """Return the list of VarChilds of a -var-list-children reply"""
+    return _decode(raw, "children", {"children": _varChild, "child": _varChild}).get("children", [])
+
+
+def decodeStack(raw):
+    """Return the list of Frames of a -stack-list-frames reply"""
+    return _decode(raw, "stack", {"stack": _frame, "frame": _frame}).get("stack", [])
+
+
+def decodeThreadInfo(raw):
+    """Return the id of the current thread and the list of Threads of a
+    -thread-info reply"""
+    d = _decode(raw, "threads", {"threads": _thread, "frame": _frame})
+    return d.get("current-thread-id"), d.get("threads", [])
+
+
+def decodeVariables(raw):
+    """Return the list of Variables of a -stack-list-variables reply"""
+    return _decode(raw, "variables", {"variables": _variable}).get("variables", [])
@@ -0,0 +1,48 @@
+import unittest
+from . import gdbreplies
+from .gdbmidecodertest import changelist, listChildren
+
+
+class Test(unittest.TestCase):
+    def testVarUpdate(self):
+        changes = gdbreplies.decodeVarUpdate('0003^done,changelist=[{name="var17.public.array.1",value="200",in_scope="true",type_changed="false",has_more="0"},{name="var2",in_scope="false",type_changed="true",new_type="int *",new_num_children="1",has_more="0"}]')
+        self.assertEqual(changes, [
+            gdbreplies.VarChange("var17.public.array.1", "200", "true", False, None, None, False),
+            gdbreplies.VarChange("var2", None, "false", True, "int *", 1, False)])
+        self.assertEqual(gdbreplies.decodeVarUpdate('^done,changelist=[]'), [])
+        self.assertEqual(len(gdbreplies.decodeVarUpdate(changelist(10000))), 10000)
+
+    def testVarChildren(self):
+        children = gdbreplies.decodeVarChildren('^done,numchild="2",children=[child={name="var4.public",exp="public",numchild="2"},child={name="var4.public.array",exp="array",numchild="200",value="[200]",type="int [200]",thread-id="1"}],has_more="0"')
+        self.assertEqual(children, [
+            gdbreplies.VarChild("var4.public", "public", 2, None, None, None),
+            gdbreplies.VarChild("var4.public.array", "array", 200, "[200]", "int [200]", "1")])
+        self.assertEqual(gdbreplies.decodeVarChildren('^done,numchild="0",has_more="0"'), [])
+        self.assertEqual(gdbreplies.decodeVarChildren(listChildren(100))[99].name, "var1.99")
+
+    def testStack(self):
+        frames = gdbreplies.decodeStack('^done,stack=[frame={level="0",addr="0x000000000040056f",func="main",file="main.cpp",fullname="/tmp/main.cpp",line="14"},frame={level="1",addr="0x00007ffff7a2d830",func="__libc_start_main",from="/lib/libc.so.6"}]')
+        self.assertEqual(frames, [
+            gdbreplies.Frame(0, "0x000000000040056f", "main", "main.cpp", "/tmp/main.cpp", "14"),
+            gdbreplies.Frame(1, "0x00007ffff7a2d830", "__libc_start_main", None, None, None)])
+
+    def testThreadInfo(self):
+        current, threads = gdbreplies.decodeThreadInfo('^done,threads=[{id="2",target-id="Thread 0xb7e14b90 (LWP 21257)",frame={level="0",addr="0xffffe410",func="__kernel_vsyscall",args=[]},state="running"},{id="1",target-id="Thread 0xb7e156b0 (LWP 21254)",name="main",frame={level="0",addr="0x0804891f",func="foo",args=[{name="i",value="10"}],file="/tmp/a.c",fullname="/tmp/a.c",line="158"},state="stopped",core="1"}],current-thread-id="1"')
+        self.assertEqual(current, "1")
+        self.assertEqual(threads[0], gdbreplies.Thread("2", "Thread 0xb7e14b90 (LWP 21257)", None, "running", None,
+                                                       gdbreplies.Frame(0, "0xffffe410", "__kernel_vsyscall", None, None, None)))
+        self.assertEqual(threads[1].frame.line, "158")
+        self.assertEqual(threads[1].name, "main")
+
+    def testVariables(self):
+        variables = gdbreplies.decodeVariables('^done,variables=[{name="argc",arg="1",type="int",value="1"},{name="s",type="struct foo"}]')
+        self.assertEqual(variables, [
+            gdbreplies.Variable("argc", True, "int", "1"),
+            gdbreplies.Variable("s", False, "struct foo", None)])
+
+    def testErrors(self):
+        self.assertRaises(ValueError, gdbreplies.decodeStack, '^error,msg="No stack."')
+
+
+if __name__ == "__main__":
+    unittest.main()
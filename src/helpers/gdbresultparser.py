@@ -27,12 +27,13 @@ For futher information see the ply python module documentation.
 """
 
 import re
+import sys
+import threading
 
 import ply.lex as lex
 import ply.yacc as yacc
-from PyQt4.QtCore import QDir
 
-from .gdboutput import GdbOutput
+from .gdboutput import GdbOutput, Result, Assignment
 import helpers.excep
 from .tools import unBackslashify
 
@@ -117,20 +118,6 @@ def t_error(t):
     raise TypeError("Unknown text '%s'" % (t.value,))
 
 
-class Result:
-    def __str__(self):
-        return "RESULT(" + self.__dict__.__str__() + ")"
-
-
-class Assignment:
-    def __init__(self, dest, src):
-        self.dest = dest
-        self.src = src
-
-    def __str__(self):
-        return "ASSIGN(" + self.dest.__str__() + "," + self.src.__str__() + ")"
-
-
 def p_result_record(p):
     '''result_record : result_class
                      | result_class COMMA result_list'''
@@ -252,9 +239,7 @@ def p_tuple_(p):
     '''tuple_ : LBRACE RBRACE
               | LBRACE result_list RBRACE'''
     if len(p) > 3:
-        p[0] = Result()
-        for a in p[2]:
-            setattr(p[0], a.dest, a.src)
+        p[0] = Result.fromAssignments(p[2])
     else:
         p[0] = []
 
@@ -337,18 +322,46 @@ def p_top(p):
         p[0].token = p[1]
 
 
+# name of the module holding the pregenerated LALR tables, see the Makefile
+TABMODULE = "gdbresultparsetab"
+
+
 class GdbResultParser:
+    # lexer and parser are not reentrant, therefore every thread that parses
+    # gdb output gets its own pair; in practice, this is only the GdbReader
+    __local = threading.local()
+
+    @classmethod
+    def __build(cls):
+        """Build the lexer and the parser for the current thread
+
+        The parser is built from the tables in TABMODULE; yacc will only
+        regenerate them (in memory) if they do not match the grammar above.
+        """
+        module = sys.modules[__name__]
+        cls.__local.lexer = lex.lex(module=module, reflags=re.DOTALL)
+        cls.__local.parser = yacc.yacc(module=module, start='top', debug=False,
+                tabmodule=TABMODULE, write_tables=False)
+
     @classmethod
     def parse(cls, lines):
         """Parse the lines with the above defined lexical rules
         """
-        lex.lex(reflags=re.DOTALL)
+        if not hasattr(cls.__local, "parser"):
+            cls.__build()
+        lexer = cls.__local.lexer
+        parser = cls.__local.parser
 
-        parser = yacc.yacc(start='top', debug=0, outputdir=str(QDir.homePath()) + "/.ricodebug")
         r = []
         for line in lines:
             line = line.strip()
-            r.append(parser.parse(line))
+            r.append(parser.parse(line, lexer=lexer))
             r[-1].raw = line
 
         return r
+
+    @classmethod
+    def writeTables(cls, outputdir):
+        """Regenerate the table module TABMODULE in outputdir"""
+        yacc.yacc(module=sys.modules[__name__], start='top', debug=False,
+                tabmodule=TABMODULE, outputdir=outputdir)
@@ -0,0 +1,143 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Micro-benchmark for the gdb output parsers
+
+Parses the records used in gdbresultparsertest and some large synthetic
+records over and over again and reports the throughput. Run it from the src directory:
+    python -m helpers.gdbresultparserbenchmark [seconds]
+"""
+
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from . import gdbresultparser
+from .gdbresultparser import GdbResultParser
+from .gdbresultparsertest import loadCorpus
+from .gdboutput import Result, Assignment
+from .gdbmidecoder import GdbMiDecoder, LazyGdbMiDecoder
+from .gdbmidecodertest import listChildren, changelist
+from .gdbreplies import decodeVarUpdate
+
+
+def parseRebuilding(lines, outputdir):
+    """Parse the way GdbResultParser.parse used to: rebuild the lexer and
+    the parser (and write the tables) for every batch of lines"""
+    lex.lex(module=gdbresultparser, reflags=re.DOTALL)
+    parser = yacc.yacc(module=gdbresultparser, start='top', debug=0,
+            outputdir=outputdir, tabmodule="benchmarkparsetab")
+    return [parser.parse(line.strip()) for line in lines]
+
+
+class PlainResult:
+    """The former, __dict__ based representation of a tuple"""
+
+
+def plainCopy(o):
+    """Copy parsed records into PlainResults, with a separate string for
+    every name and value like the parser used to create them"""
+    if isinstance(o, list):
+        return [plainCopy(i) for i in o]
+    if isinstance(o, Assignment):
+        return Assignment(plainCopy(o.dest), plainCopy(o.src))
+    if isinstance(o, Result):
+        r = PlainResult()
+        for name, value in o.items():
+            setattr(r, plainCopy(name), plainCopy(value))
+        return r
+    return (o + ".")[:-1]
+
+
+def measure(name, build, n):
+    tracemalloc.start()
+    res = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("%-12s %10.0f bytes/child" % (name, size / n))
+    return res
+
+
+def run(name, parse, corpus, duration):
+    records = 0
+    start = time.time()
+    while time.time() - start < duration:
+        for batch in corpus:
+            parse(batch)
+            records += len(batch)
+    elapsed = time.time() - start
+    print("%-12s %10.0f records/s" % (name, records / elapsed))
+    return records / elapsed
+
+
+def parseLazily(batch):
+    """Parse batch lazily and decode the payload of each record, as a
+    consumer looking past the header would"""
+    records = LazyGdbMiDecoder.parse(batch)
+    for r in records:
+        r.decode()
+    return records
+
+
+def main(duration=2.0):
+    corpus = loadCorpus()
+    print("corpus: %d batches, %d records" % (len(corpus), sum(len(b) for b in corpus)))
+
+    with tempfile.TemporaryDirectory() as outputdir:
+        before = run("rebuilding", lambda b: parseRebuilding(b, outputdir), corpus, duration)
+    after = run("persistent", GdbResultParser.parse, corpus, duration)
+    print("speedup: %.1fx" % (after / before))
+    fast = run("fast", GdbMiDecoder.parse, corpus, duration)
+    print("speedup: %.1fx" % (fast / after))
+    lazy = run("lazy", parseLazily, corpus, duration)
+    print("speedup: %.1fx" % (lazy / after))
+
+    for n in (1000, 10000):
+        print("-var-list-children with %d children" % n)
+        batch = [[listChildren(n)]]
+        ply = run("ply", GdbResultParser.parse, batch, duration)
+        fast = run("fast", GdbMiDecoder.parse, batch, duration)
+        print("speedup: %.1fx" % (fast / ply))
+        lazy = run("lazy", parseLazily, batch, duration)
+        print("speedup: %.1fx" % (lazy / ply))
+
+    print("-var-update with 10000 changes")
+    batch = [[changelist(10000)]]
+    generic = run("generic", lambda b: GdbMiDecoder.parse(b)[0].changelist, batch, duration)
+    typed = run("typed", lambda b: decodeVarUpdate(b[0]), batch, duration)
+    print("speedup: %.1fx" % (typed / generic))
+
+    n = 10000
+    print("memory for %d children of -var-list-children" % n)
+    line = listChildren(n)
+    children = measure("compact", lambda: GdbMiDecoder.parse([line])[0].children, n)
+    measure("plain", lambda: plainCopy(children), n)
+
+
+if __name__ == "__main__":
+    main(*(float(a) for a in sys.argv[1:]))
@@ -84,5 +84,32 @@ class Test(unittest.TestCase):
         =breakpoint-created,bkpt={number="2",type="breakpoint",disp="keep",enabled="y",addr="0x00000000004004d7",func="main()",file="main.cpp",fullname="/home/rainer/tmp/testprog/macro/main.cpp",line="6",times="0",original-location="main.cpp:6"}
         """])
 
+
+def loadCorpus():
+    """Return the batches of records parsed by the tests above
+
+    Each batch is what the GdbReader would pass to the parser after one
+    "(gdb)" prompt. Records the tests expect to fail are skipped.
+    """
+    class Recorder:
+        def __init__(self):
+            self.batches = []
+
+        def parse(self, lines):
+            self.batches.append([l.strip() for l in lines])
+
+    corpus = []
+    for name in unittest.TestLoader().getTestCaseNames(Test):
+        test = Test(name)
+        test.parser = Recorder()
+        try:
+            getattr(test, name)()
+        except AssertionError:
+            # the test wanted the parser to raise an exception
+            continue
+        corpus.extend(test.parser.batches)
+    return corpus
+
+
 if __name__ == "__main__":
     unittest.main()
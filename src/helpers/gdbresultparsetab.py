@@ -0,0 +1,81 @@
+
+# gdbresultparsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'topAMP ASSIGN AT BREAKPOINT_CREATED BREAKPOINT_DELETED BREAKPOINT_MODIFIED CMD_PARAM_CHANGED COMMA CONNECTED C_STRING DONE ERROR EXIT HAT LBRACE LBRACKET LIBRARY_LOADED LIBRARY_UNLOADED PLUS RBRACE RBRACKET RECORD_STARTED RECORD_STOPPED RUNNING STAR STOPPED STRING THREAD_CREATED THREAD_EXITED THREAD_GROUP_ADDED THREAD_GROUP_CREATED THREAD_GROUP_EXITED THREAD_GROUP_STARTED THREAD_SELECTED TILDE TOKENresult_record : result_class\n                     | result_class COMMA result_listasync_output : async_class\n                    | async_class COMMA result_listresult_class : DONE\n                    | RUNNING\n                    | CONNECTED\n                    | ERROR\n                    | EXITasync_class : STOPPED\n                   | RUNNING\n                   | THREAD_CREATED\n                   | THREAD_GROUP_CREATED\n                   | THREAD_GROUP_ADDED\n                   | THREAD_GROUP_STARTED\n                   | THREAD_EXITED\n                   | THREAD_GROUP_EXITED\n                   | THREAD_SELECTED\n                   | LIBRARY_LOADED\n                   | LIBRARY_UNLOADED\n                   | BREAKPOINT_MODIFIED\n                   | BREAKPOINT_CREATED\n                   | BREAKPOINT_DELETED\n                   | RECORD_STARTED\n                   | RECORD_STOPPED\n                   | CMD_PARAM_CHANGEDresult : variable ASSIGN valuevariable : STRINGvalue : const\n             | tuple_\n             | list_const : C_STRINGtuple_ : LBRACE RBRACE\n              | LBRACE result_list RBRACElist_ : LBRACKET RBRACKET\n             | LBRACKET value_list RBRACKET\n             | LBRACKET result_list RBRACKETstream_output : C_STRINGresult_list : result\n                   | result COMMA result_listvalue_list : value\n                  | value COMMA value_list token :\n              | TOKENtop : token HAT result_record\n           | token STAR async_output\n           | token PLUS async_output\n           | token ASSIGN async_output\n           | TILDE stream_output\n           | AT stream_output\n           | AMP stream_output'
+    
+_lr_action_items = {'TILDE':([0,],[3,]),'AT':([0,],[4,]),'AMP':([0,],[5,]),'HAT':([0,2,6,],[-43,7,-44,]),'STAR':([0,2,6,],[-43,8,-44,]),'PLUS':([0,2,6,],[-43,9,-44,]),'ASSIGN':([0,2,6,47,48,],[-43,10,-44,51,-28,]),'TOKEN':([0,],[6,]),'$end':([1,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,45,46,49,52,53,54,55,56,57,60,62,66,67,68,],[0,-49,-38,-50,-51,-45,-1,-5,-6,-7,-8,-9,-46,-3,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-47,-48,-2,-39,-4,-40,-27,-29,-30,-31,-32,-33,-35,-34,-36,-37,]),'C_STRING':([3,4,5,51,59,69,],[12,12,12,57,57,57,]),'DONE':([7,],[17,]),'RUNNING':([7,8,9,10,],[18,25,25,25,]),'CONNECTED':([7,],[19,]),'ERROR':([7,],[20,]),'EXIT':([7,],[21,]),'STOPPED':([8,9,10,],[24,24,24,]),'THREAD_CREATED':([8,9,10,],[26,26,26,]),'THREAD_GROUP_CREATED':([8,9,10,],[27,27,27,]),'THREAD_GROUP_ADDED':([8,9,10,],[28,28,28,]),'THREAD_GROUP_STARTED':([8,9,10,],[29,29,29,]),'THREAD_EXITED':([8,9,10,],[30,30,30,]),'THREAD_GROUP_EXITED':([8,9,10,],[31,31,31,]),'THREAD_SELECTED':([8,9,10,],[32,32,32,]),'LIBRARY_LOADED':([8,9,10,],[33,33,33,]),'LIBRARY_UNLOADED':([8,9,10,],[34,34,34,]),'BREAKPOINT_MODIFIED':([8,9,10,],[35,35,35,]),'BREAKPOINT_CREATED':([8,9,10,],[36,36,36,]),'BREAKPOINT_DELETED':([8,9,10,],[37,37,37,]),'RECORD_STARTED':([8,9,10,],[38,38,38,]),'RECORD_STOPPED':([8,9,10,],[39,39,39,]),'CMD_PARAM_CHANGED':([8,9,10,],[40,40,40,]),'COMMA':([16,17,18,19,20,21,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,46,53,54,55,56,57,60,62,65,66,67,68,],[43,-5,-6,-7,-8,-9,44,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,50,-27,-29,-30,-31,-32,-33,-35,69,-34,-36,-37,]),'STRING':([43,44,50,58,59,],[48,48,48,48,48,]),'RBRACE':([46,52,53,54,55,56,57,58,60,61,62,66,67,68,],[-39,-40,-27,-29,-30,-31,-32,60,-33,66,-35,-34,-36,-37,]),'RBRACKET':([46,52,53,54,55,56,57,59,60,62,63,64,65,66,67,68,70,],[-39,-40,-27,-29,-30,-31,-32,62,-33,-35,67,68,-41,-34,-36,-37,-42,]),'LBRACE':([51,59,69,],[58,58,58,]),'LBRACKET':([51,59,69,],[59,59,59,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'top':([0,],[1,]),'token':([0,],[2,]),'stream_output':([3,4,5,],[11,13,14,]),'result_record':([7,],[15,]),'result_class':([7,],[16,]),'async_output':([8,9,10,],[22,41,42,]),'async_class':([8,9,10,],[23,23,23,]),'result_list':([43,44,50,58,59,],[45,49,52,61,64,]),'result':([43,44,50,58,59,],[46,46,46,46,46,]),'variable':([43,44,50,58,59,],[47,47,47,47,47,]),'value':([51,59,69,],[53,65,65,]),'const':([51,59,69,],[54,54,54,]),'tuple_':([51,59,69,],[55,55,55,]),'list_':([51,59,69,],[56,56,56,]),'value_list':([59,69,],[63,70,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> top","S'",1,None,None,None),
+  ('result_record -> result_class','result_record',1,'p_result_record','gdbresultparser.py',136),
+  ('result_record -> result_class COMMA result_list','result_record',3,'p_result_record','gdbresultparser.py',137),
+  ('async_output -> async_class','async_output',1,'p_async_output','gdbresultparser.py',147),
+  ('async_output -> async_class COMMA result_list','async_output',3,'p_async_output','gdbresultparser.py',148),
+  ('result_class -> DONE','result_class',1,'p_result_class','gdbresultparser.py',157),
+  ('result_class -> RUNNING','result_class',1,'p_result_class','gdbresultparser.py',158),
+  ('result_class -> CONNECTED','result_class',1,'p_result_class','gdbresultparser.py',159),
+  ('result_class -> ERROR','result_class',1,'p_result_class','gdbresultparser.py',160),
+  ('result_class -> EXIT','result_class',1,'p_result_class','gdbresultparser.py',161),
+  ('async_class -> STOPPED','async_class',1,'p_async_class','gdbresultparser.py',175),
+  ('async_class -> RUNNING','async_class',1,'p_async_class','gdbresultparser.py',176),
+  ('async_class -> THREAD_CREATED','async_class',1,'p_async_class','gdbresultparser.py',177),
+  ('async_class -> THREAD_GROUP_CREATED','async_class',1,'p_async_class','gdbresultparser.py',178),
+  ('async_class -> THREAD_GROUP_ADDED','async_class',1,'p_async_class','gdbresultparser.py',179),
+  ('async_class -> THREAD_GROUP_STARTED','async_class',1,'p_async_class','gdbresultparser.py',180),
+  ('async_class -> THREAD_EXITED','async_class',1,'p_async_class','gdbresultparser.py',181),
+  ('async_class -> THREAD_GROUP_EXITED','async_class',1,'p_async_class','gdbresultparser.py',182),
+  ('async_class -> THREAD_SELECTED','async_class',1,'p_async_class','gdbresultparser.py',183),
+  ('async_class -> LIBRARY_LOADED','async_class',1,'p_async_class','gdbresultparser.py',184),
+  ('async_class -> LIBRARY_UNLOADED','async_class',1,'p_async_class','gdbresultparser.py',185),
+  ('async_class -> BREAKPOINT_MODIFIED','async_class',1,'p_async_class','gdbresultparser.py',186),
+  ('async_class -> BREAKPOINT_CREATED','async_class',1,'p_async_class','gdbresultparser.py',187),
+  ('async_class -> BREAKPOINT_DELETED','async_class',1,'p_async_class','gdbresultparser.py',188),
+  ('async_class -> RECORD_STARTED','async_class',1,'p_async_class','gdbresultparser.py',189),
+  ('async_class -> RECORD_STOPPED','async_class',1,'p_async_class','gdbresultparser.py',190),
+  ('async_class -> CMD_PARAM_CHANGED','async_class',1,'p_async_class','gdbresultparser.py',191),
+  ('result -> variable ASSIGN value','result',3,'p_result','gdbresultparser.py',231),
+  ('variable -> STRING','variable',1,'p_variable','gdbresultparser.py',236),
+  ('value -> const','value',1,'p_value','gdbresultparser.py',241),
+  ('value -> tuple_','value',1,'p_value','gdbresultparser.py',242),
+  ('value -> list_','value',1,'p_value','gdbresultparser.py',243),
+  ('const -> C_STRING','const',1,'p_const','gdbresultparser.py',248),
+  ('tuple_ -> LBRACE RBRACE','tuple_',2,'p_tuple_','gdbresultparser.py',253),
+  ('tuple_ -> LBRACE result_list RBRACE','tuple_',3,'p_tuple_','gdbresultparser.py',254),
+  ('list_ -> LBRACKET RBRACKET','list_',2,'p_list_','gdbresultparser.py',264),
+  ('list_ -> LBRACKET value_list RBRACKET','list_',3,'p_list_','gdbresultparser.py',265),
+  ('list_ -> LBRACKET result_list RBRACKET','list_',3,'p_list_','gdbresultparser.py',266),
+  ('stream_output -> C_STRING','stream_output',1,'p_stream_output','gdbresultparser.py',274),
+  ('result_list -> result','result_list',1,'p_result_list','gdbresultparser.py',280),
+  ('result_list -> result COMMA result_list','result_list',3,'p_result_list','gdbresultparser.py',281),
+  ('value_list -> value','value_list',1,'p_value_list','gdbresultparser.py',289),
+  ('value_list -> value COMMA value_list','value_list',3,'p_value_list','gdbresultparser.py',290),
+  ('token -> <empty>','token',0,'p_token','gdbresultparser.py',305),
+  ('token -> TOKEN','token',1,'p_token','gdbresultparser.py',306),
+  ('top -> token HAT result_record','top',3,'p_top','gdbresultparser.py',311),
+  ('top -> token STAR async_output','top',3,'p_top','gdbresultparser.py',312),
+  ('top -> token PLUS async_output','top',3,'p_top','gdbresultparser.py',313),
+  ('top -> token ASSIGN async_output','top',3,'p_top','gdbresultparser.py',314),
+  ('top -> TILDE stream_output','top',2,'p_top','gdbresultparser.py',315),
+  ('top -> AT stream_output','top',2,'p_top','gdbresultparser.py',316),
+  ('top -> AMP stream_output','top',2,'p_top','gdbresultparser.py',317),
+]
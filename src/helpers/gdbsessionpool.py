@@ -0,0 +1,185 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Several gdb sessions debugging the processes of one deployment
+
+The first session is the GdbConnector the rest of ricodebug works with;
+more sessions can be added, eg. by attaching to the other ranks of an MPI
+job. Each session has its own gdb process and reader thread, and broadcast
+operations run the same query in all sessions in parallel, so they take
+about as long as the slowest session instead of the sum of all of them.
+
+The views that show the state of a stop (stack, threads, locals, watches)
+follow the selected session, see select.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt4.QtCore import QObject, pyqtSignal, Qt
+
+from .gdbconnector import GdbConnector
+from .gdboutput import GdbOutput
+
+
+class GdbSession:
+    STOPPED, RUNNING, EXITED = range(3)
+
+    def __init__(self, name, connector):
+        self.name = name
+        self.connector = connector
+        self.pid = None
+        self.state = GdbSession.STOPPED
+
+
+class GdbSessionPool(QObject):
+    sessionsChanged = pyqtSignal()
+    currentChanged = pyqtSignal('PyQt_PyObject')
+    # an additional session stopped; the primary one is handled by the
+    # DebugController
+    sessionStopped = pyqtSignal('PyQt_PyObject')
+
+    def __init__(self, primary, parent=None):
+        """@param primary  the GdbConnector of the primary session; its
+                           records are handled by the DebugController"""
+        QObject.__init__(self, parent)
+        self.sessions = [GdbSession("main", primary)]
+        self.current = self.sessions[0]
+        self.__executor = None
+        # broadcasts submit to the executor while sessions are added
+        self.__executorLock = threading.Lock()
+
+    def addSession(self, name, command=None):
+        """Start a new gdb for a session; must be called in the gui thread,
+        which handles the records of the session"""
+        connector = GdbConnector()
+        session = GdbSession(name, connector)
+        # nobody else takes the records of the additional sessions
+        connector.reader.asyncRecordsPending.connect(lambda: self.__handleAsyncRecords(session), Qt.QueuedConnection)
+        connector.reader.consoleRecordsPending.connect(connector.reader.takeConsoleRecords, Qt.QueuedConnection)
+        connector.start(command)
+        self.sessions.append(session)
+        self.__resizeExecutor()
+        self.sessionsChanged.emit()
+        return session
+
+    def attach(self, session, pid):
+        """Attach the gdb of session to the process pid; may be called from
+        a worker thread. Returns whether gdb could attach."""
+        res = session.connector.execute("-target-attach %d" % pid)
+        if res.class_ == GdbOutput.ERROR:
+            logging.error("Could not attach to process %d: %s", pid, res.msg)
+            return False
+        session.pid = pid
+        return True
+
+    primary = property(lambda self: self.sessions[0])
+
+    def select(self, session):
+        """Show session in the views; must be called in the gui thread"""
+        if session is not self.current:
+            self.current = session
+            self.currentChanged.emit(session)
+
+    def removeSession(self, session):
+        if session is self.sessions[0]:
+            raise ValueError("The primary session cannot be removed")
+        # the views let go of the session while its gdb is still running
+        if session is self.current:
+            self.select(self.sessions[0])
+        self.__close(session)
+        self.sessions.remove(session)
+        self.sessionsChanged.emit()
+
+    def shutdown(self):
+        self.select(self.sessions[0])
+        for session in self.sessions[1:]:
+            self.__close(session)
+        del self.sessions[1:]
+        with self.__executorLock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    @staticmethod
+    def __close(session):
+        # killing gdb would take an attached process with it
+        if session.pid is not None:
+            res = session.connector.execute("-target-detach")
+            if res.class_ == GdbOutput.ERROR:
+                logging.error("Could not detach from process %d: %s", session.pid, res.msg)
+        session.connector.kill()
+
+    def __resizeExecutor(self):
+        # one worker per session, so that no session waits for another one;
+        # broadcasts still running on the old executor finish there
+        with self.__executorLock:
+            old, self.__executor = self.__executor, ThreadPoolExecutor(len(self.sessions))
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def __handleAsyncRecords(self, session):
+        stopped = False
+        for rec in session.connector.reader.takeAsyncRecords():
+            if rec.type_ != GdbOutput.EXEC_ASYN:
+                continue
+            if rec.class_ == GdbOutput.RUNNING:
+                session.state = GdbSession.RUNNING
+            elif rec.class_ == GdbOutput.STOPPED:
+                reason = dict((r.dest, r.src) for r in rec.results).get("reason", "")
+                session.state = GdbSession.EXITED if reason.startswith("exited") else GdbSession.STOPPED
+                stopped = True
+        self.sessionsChanged.emit()
+        if stopped and session.state == GdbSession.STOPPED:
+            self.sessionStopped.emit(session)
+
+    def broadcast(self, fn, sessions=None):
+        """Call fn(connector) for all sessions in parallel and wait for them
+
+        Returns a list of (session, result) in the order of the sessions; if
+        fn raised, the exception is returned as the result."""
+        sessions = list(sessions or self.sessions)
+        if len(sessions) == 1:
+            return [(sessions[0], self.__call(fn, sessions[0]))]
+        with self.__executorLock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(len(self.sessions))
+            futures = [self.__executor.submit(self.__call, fn, s) for s in sessions]
+        return [(s, f.result()) for s, f in zip(sessions, futures)]
+
+    @staticmethod
+    def __call(fn, session):
+        try:
+            return fn(session.connector)
+        except Exception as e:
+            return e
+
+    def interruptAll(self):
+        return self.broadcast(lambda c: c.interrupt())
+
+    def continueAll(self):
+        return self.broadcast(lambda c: c.cont())
+
+    def evaluateAll(self, exp):
+        return self.broadcast(lambda c: c.evaluate(exp))
@@ -0,0 +1,81 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Benchmark for broadcasting to several gdb sessions
+
+Starts a number of fake gdbs (see fakegdb) that answer every command after
+a delay, stops all of them and inspects their stack, threads and locals,
+once session after session and once in parallel. Run it from the src
+directory:
+    python -m helpers.gdbsessionpoolbenchmark [sessions] [latency in ms]
+"""
+
+import sys
+import time
+
+from .gdbconnector import GdbConnector
+from .gdbsessionpool import GdbSessionPool
+
+INSPECT = ["-stack-list-frames", "-thread-info", "-stack-list-variables --simple-values"]
+
+
+def stopAndInspect(connector):
+    connector.next_()
+    return connector.executeBatch(INSPECT)
+
+
+def main(sessions=16, latency=20):
+    command = [sys.executable, "-m", "helpers.fakegdb", "--latency", str(latency)]
+    primary = GdbConnector()
+    primary.start(command)
+    pool = GdbSessionPool(primary)
+    for i in range(1, sessions):
+        pool.addSession("rank %d" % i, command)
+
+    try:
+        start = time.time()
+        stopAndInspect(primary)
+        single = time.time() - start
+        print("one session:      %7.1f ms" % (single * 1000))
+
+        start = time.time()
+        for session in pool.sessions:
+            stopAndInspect(session.connector)
+        sequential = time.time() - start
+        print("%d sessions, one after the other: %7.1f ms" % (sessions, sequential * 1000))
+
+        start = time.time()
+        results = pool.broadcast(stopAndInspect)
+        parallel = time.time() - start
+        print("%d sessions, in parallel:         %7.1f ms" % (sessions, parallel * 1000))
+        failed = [s.name for s, r in results if isinstance(r, Exception)]
+        if failed:
+            print("failed: " + ", ".join(failed))
+        print("speedup: %.1fx, %.1f times a single session" % (sequential / parallel, parallel / single))
+    finally:
+        pool.shutdown()
+        primary.kill()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
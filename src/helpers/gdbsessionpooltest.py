@@ -0,0 +1,72 @@
+import threading
+import unittest
+from .gdbmidecoder import GdbMiDecoder
+from .gdbsessionpool import GdbSessionPool, GdbSession
+
+
+class Connector:
+    """Records the commands sent to gdb"""
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        return GdbMiDecoder.parse(["^done"])[0]
+
+    def kill(self):
+        self.commands.append("kill")
+
+
+class Test(unittest.TestCase):
+    def testBroadcast(self):
+        pool = GdbSessionPool("c0")
+        pool.sessions += [GdbSession("s%d" % i, "c%d" % i) for i in range(1, 4)]
+
+        # all calls must run at the same time to get past the barrier
+        barrier = threading.Barrier(len(pool.sessions), timeout=5)
+
+        def query(connector):
+            barrier.wait()
+            if connector == "c2":
+                raise ValueError(connector)
+            return connector.upper()
+
+        try:
+            results = pool.broadcast(query)
+        finally:
+            sessions = pool.sessions[:]
+            del pool.sessions[1:]
+            pool.shutdown()
+        self.assertEqual([s.name for s, _ in results], ["main", "s1", "s2", "s3"])
+        self.assertEqual([s for s, _ in results], sessions)
+        self.assertEqual([r for _, r in results if not isinstance(r, Exception)], ["C0", "C1", "C3"])
+        self.assertIsInstance(results[2][1], ValueError)
+
+    def testRemoveDetaches(self):
+        pool = GdbSessionPool(Connector())
+        session = GdbSession("s1", Connector())
+        pool.sessions.append(session)
+        self.assertTrue(pool.attach(session, 1234))
+        pool.removeSession(session)
+        self.assertEqual(session.connector.commands, ["-target-attach 1234", "-target-detach", "kill"])
+        self.assertEqual(len(pool.sessions), 1)
+
+    def testSelect(self):
+        pool = GdbSessionPool(Connector())
+        session = GdbSession("s1", Connector())
+        pool.sessions.append(session)
+        selected = []
+        pool.currentChanged.connect(selected.append)
+        pool.select(session)
+        pool.select(session)
+        self.assertIs(pool.current, session)
+        # the views go back to the primary session before its gdb is killed
+        commands = []
+        pool.currentChanged.connect(lambda _: commands.append(list(session.connector.commands)))
+        pool.removeSession(session)
+        self.assertEqual(selected, [session, pool.primary])
+        self.assertEqual(commands, [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
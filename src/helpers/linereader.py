@@ -0,0 +1,84 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Line splitting for unbuffered pipes
+
+Reading an unbuffered pipe line by line costs one system call per line (or
+even per byte). The LineReader reads large chunks into a reusable buffer
+and splits them into lines without copying them.
+"""
+
+
+class LineReader:
+    def __init__(self, stream, chunkSize=1 << 16):
+        """@param stream     raw binary stream supporting readinto, eg. the
+                             stdout of a subprocess started with bufsize=0
+           @param chunkSize  initial size of the buffer; it grows as needed
+                             for lines that do not fit into it
+        """
+        self.__stream = stream
+        self.__buf = bytearray(chunkSize)
+
+    def lines(self):
+        """Yield the lines read from the stream, without the line break
+
+        The lines are memoryviews into the internal buffer; they are
+        released as soon as the next line is requested, so copy or decode
+        them before that. The last line is yielded even if it is not
+        terminated by a line break.
+        """
+        buf = self.__buf
+        # buf[start:scanned] is known to contain no line break; resuming the
+        # search from there keeps long lines read in many chunks linear
+        start = scanned = end = 0
+        while True:
+            nl = buf.find(b"\n", scanned, end)
+            if nl >= 0:
+                lineEnd = nl - 1 if nl > start and buf[nl - 1] == 0x0d else nl
+                with memoryview(buf) as view:
+                    line = view[start:lineEnd]
+                    yield line
+                    line.release()
+                start = scanned = nl + 1
+                continue
+
+            # no complete line left; move the beginning of the next line to
+            # the front of the buffer and read more data behind it
+            if start > 0:
+                buf[:end - start] = buf[start:end]
+                end -= start
+                start = 0
+            scanned = end
+            if end == len(buf):
+                buf.extend(bytes(len(buf)))
+            with memoryview(buf) as view:
+                n = self.__stream.readinto(view[end:])
+
+            if not n:
+                if end > start:
+                    with memoryview(buf) as view:
+                        line = view[start:end]
+                        yield line
+                        line.release()
+                return
+            end += n
@@ -0,0 +1,111 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Benchmark for reading gdb's output from a pipe
+
+Replays a stream of gdb output through a pipe and reports the throughput of
+reading it line by line, like the GdbReader used to, and with the
+LineReader. Run it from the src directory:
+    python -m helpers.linereaderbenchmark [recorded stream]
+Without a recorded stream, a synthetic one of several megabytes is used.
+"""
+
+import os
+import sys
+import threading
+import time
+
+from .linereader import LineReader
+from .gdbmidecodertest import listChildren, changelist
+from .gdbresultparsertest import loadCorpus
+
+
+def syntheticStream():
+    """Some MB of gdb output: the test corpus, console output and a few
+    large replies, each followed by a prompt"""
+    records = [line.replace("\n", "\\n") for batch in loadCorpus() for line in batch]
+    records += ['~"%s\\n"' % ("x" * (i % 120)) for i in range(2000)]
+    records += [listChildren(1000), changelist(1000)]
+    # a string value larger than the buffer of the reader
+    records.append('^done,value="%s"' % ("y" * 200000))
+    chunk = "".join(r + "\n(gdb) \n" for r in records).encode("UTF-8")
+    return chunk * max(1, (8 << 20) // len(chunk))
+
+
+def replay(data, read):
+    """Write data into a pipe from a separate thread and read it"""
+    r, w = os.pipe()
+
+    def write():
+        with os.fdopen(w, "wb", buffering=0) as f:
+            f.write(data)
+    writer = threading.Thread(target=write)
+
+    with os.fdopen(r, "rb", buffering=0) as f:
+        start = time.time()
+        writer.start()
+        lines = read(f)
+        elapsed = time.time() - start
+    writer.join()
+    return lines, elapsed
+
+
+def readLines(f):
+    """The way GdbReader used to read: decode every line"""
+    lines = 0
+    while True:
+        line = str(f.readline(), "UTF-8")
+        if not line:
+            return lines
+        if not line.startswith("(gdb)"):
+            lines += 1
+
+
+def readChunks(f):
+    lines = 0
+    for line in LineReader(f).lines():
+        if line[:5] != b"(gdb)":
+            str(line, "UTF-8")
+            lines += 1
+    return lines
+
+
+def main(path=None):
+    if path:
+        with open(path, "rb") as f:
+            data = f.read()
+    else:
+        data = syntheticStream()
+    mb = len(data) / float(1 << 20)
+    print("stream: %.1f MB" % mb)
+
+    results = []
+    for name, read in (("readline", readLines), ("chunked", readChunks)):
+        lines, elapsed = replay(data, read)
+        print("%-12s %10.1f MB/s %10d records" % (name, mb / elapsed, lines))
+        results.append(mb / elapsed)
+    print("speedup: %.1fx" % (results[1] / results[0]))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,49 @@
+import io
+import unittest
+from .linereader import LineReader
+
+
+class Trickle(io.RawIOBase):
+    """A raw stream returning at most a few bytes per read, like a pipe"""
+    def __init__(self, data, step):
+        self.data = data
+        self.step = step
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self.step, len(self.data))
+        b[:n] = self.data[:n]
+        self.data = self.data[n:]
+        return n
+
+
+class Test(unittest.TestCase):
+    def read(self, data, step, chunkSize=8):
+        return [bytes(l) for l in LineReader(Trickle(data, step), chunkSize).lines()]
+
+    def testLines(self):
+        data = b'^done\n(gdb) \r\n~"a"\n\n*stopped,reason="exited"'
+        expected = [b'^done', b'(gdb) ', b'~"a"', b'', b'*stopped,reason="exited"']
+        for step in (1, 3, 7, 100):
+            self.assertEqual(expected, self.read(data, step))
+
+    def testLongLines(self):
+        data = b"x" * 1000 + b"\n" + b"y" * 5 + b"\n"
+        self.assertEqual([b"x" * 1000, b"y" * 5], self.read(data, 64))
+        # the line break is found in a later read than the carriage return
+        data = b"x" * 1000 + b"\r\n" + b"y" * 5
+        for step in (1, 1001, 64):
+            self.assertEqual([b"x" * 1000, b"y" * 5], self.read(data, step))
+
+    def testReleased(self):
+        lines = LineReader(io.BytesIO(b"a\nb\n")).lines()
+        first = next(lines)
+        self.assertEqual(first, b"a")
+        next(lines)
+        self.assertRaises(ValueError, bytes, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
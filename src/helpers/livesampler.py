@@ -0,0 +1,177 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Sampling variables of the running inferior without stopping it
+
+The address, size and type of a variable are resolved through gdb once;
+afterwards, the LiveSampler reads the variable's memory from
+/proc/<pid>/mem at a fixed rate while the program keeps running, without
+any round trips to gdb. Reading another process' memory requires ptrace
+permissions; ricodebug is an ancestor of the inferior (which gdb started),
+so this works with the default Yama ptrace_scope of 1.
+"""
+
+import collections
+import os
+import re
+import struct
+import threading
+import time
+
+from PyQt4.QtCore import QThread, pyqtSignal
+
+from .gdboutput import GdbOutput
+from .excep import GdbError
+
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]+")
+_ARRAY = re.compile(r"^(.*?)\s*\[\d+\]$")
+
+_SIGNED = {1: "b", 2: "h", 4: "i", 8: "q"}
+_FLOAT = {4: "f", 8: "d"}
+
+
+def structFormat(type_, size):
+    """Return the struct format for a scalar of the C type type_ with size
+    bytes, or None if it cannot be sampled"""
+    t = re.sub(r"\b(const|volatile)\b", "", type_).strip()
+    if t.endswith("*"):
+        return {4: "I", 8: "Q"}.get(size)
+    if t in ("float", "double", "long double"):
+        return _FLOAT.get(size)
+    if t in ("bool", "_Bool"):
+        return "?" if size == 1 else None
+    code = _SIGNED.get(size)
+    if code is None:
+        return None
+    if t.startswith("unsigned") or t.startswith("uint") or t in ("size_t", "uintptr_t"):
+        code = code.upper()
+    return code
+
+
+class LiveVariable:
+    def __init__(self, exp, address, type_, format_, count=1, maxSamples=10000):
+        """@param format_  struct format of a single element
+           @param count    number of elements, for arrays"""
+        self.exp = exp
+        self.address = address
+        self.type = type_
+        self.count = count
+        self.struct = struct.Struct("=%d%s" % (count, format_))
+        self.size = self.struct.size
+        # (time, values) tuples; the oldest ones are dropped
+        self.samples = collections.deque(maxlen=maxSamples)
+
+    def unpack(self, data):
+        values = self.struct.unpack(data)
+        return values[0] if self.count == 1 else values
+
+
+def resolveLiveVariable(connector, exp, maxSamples=10000):
+    """Ask gdb for the address, size and type of exp (which must be an
+    lvalue of a scalar type or an array of scalars)"""
+    escaped = exp.replace("\\", "\\\\").replace('"', '\\"')
+    address, size, var = connector.executeBatch([
+        '-data-evaluate-expression "&(%s)"' % escaped,
+        '-data-evaluate-expression "sizeof(%s)"' % escaped,
+        '-var-create - * "%s"' % escaped])
+    for res in (address, size, var):
+        if res.class_ == GdbOutput.ERROR:
+            raise GdbError("Cannot sample %s: %s" % (exp, res.msg))
+    connector.execute("-var-delete " + var.name)
+
+    m = _ADDRESS.search(address.value)
+    if not m:
+        raise GdbError("Cannot sample %s: no address" % exp)
+    size = int(size.value)
+
+    type_ = var.type
+    count = 1
+    m2 = _ARRAY.match(type_)
+    if m2:
+        type_ = m2.group(1)
+        count = int(var.numchild)
+    format_ = structFormat(type_, size // count if count else 0)
+    if format_ is None:
+        raise GdbError("Cannot sample %s of type %s" % (exp, var.type))
+    return LiveVariable(exp, int(m.group(0), 16), var.type, format_, count, maxSamples)
+
+
+class LiveSampler(QThread):
+    # emitted when sampling ends because the memory cannot be read any
+    # more, eg. because the inferior has exited
+    samplingFailed = pyqtSignal(str)
+
+    def __init__(self, pid, variables, rate, parent=None):
+        """@param rate  samples per second"""
+        QThread.__init__(self, parent)
+        self.pid = pid
+        self.variables = variables
+        self.period = 1.0 / rate
+        self.lock = threading.Lock()
+        self.__running = False
+
+    def start(self):
+        # set here rather than in run, so that a stop() before the thread
+        # runs is not overridden
+        self.__running = True
+        QThread.start(self)
+
+    def stop(self):
+        self.__running = False
+        self.wait()
+
+    def samples(self, variable):
+        """A copy of the samples of variable taken so far"""
+        with self.lock:
+            return list(variable.samples)
+
+    def sample(self, fd, t):
+        """Read all variables once"""
+        values = [(v, v.unpack(os.pread(fd, v.size, v.address))) for v in self.variables]
+        with self.lock:
+            for v, value in values:
+                v.samples.append((t, value))
+
+    def run(self):
+        try:
+            fd = os.open("/proc/%d/mem" % self.pid, os.O_RDONLY)
+        except OSError as e:
+            self.samplingFailed.emit(str(e))
+            return
+        try:
+            start = time.time() - time.perf_counter()
+            next_ = time.perf_counter()
+            while self.__running:
+                now = time.perf_counter()
+                self.sample(fd, start + now)
+                next_ += self.period
+                delay = next_ - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # too slow for the rate; do not try to catch up
+                    next_ = time.perf_counter()
+        except (OSError, struct.error) as e:
+            self.samplingFailed.emit(str(e))
+        finally:
+            os.close(fd)
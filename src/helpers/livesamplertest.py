@@ -0,0 +1,76 @@
+import ctypes
+import os
+import threading
+import time
+import unittest
+from .livesampler import LiveVariable, LiveSampler, resolveLiveVariable, structFormat
+from .gdbmidecoder import GdbMiDecoder
+from .excep import GdbError
+
+
+class Connector:
+    """Answers the queries of resolveLiveVariable with fixed replies"""
+    def __init__(self, *replies):
+        self.replies = replies
+        self.executed = []
+
+    def executeBatch(self, cmds):
+        self.executed += cmds
+        return GdbMiDecoder.parse(self.replies)
+
+    def execute(self, cmd):
+        self.executed.append(cmd)
+
+
+class Test(unittest.TestCase):
+    def testStructFormat(self):
+        self.assertEqual(structFormat("int", 4), "i")
+        self.assertEqual(structFormat("const unsigned long", 8), "Q")
+        self.assertEqual(structFormat("double", 8), "d")
+        self.assertEqual(structFormat("char *", 8), "Q")
+        self.assertEqual(structFormat("struct foo", 12), None)
+
+    def testResolve(self):
+        c = Connector('^done,value="(int (*)[4]) 0x601060 <arr>"', '^done,value="16"',
+                      '^done,name="var1",numchild="4",value="[4]",type="int [4]",has_more="0"')
+        v = resolveLiveVariable(c, "arr")
+        self.assertEqual((v.address, v.count, v.size), (0x601060, 4, 16))
+        self.assertEqual(c.executed[-1], "-var-delete var1")
+
+        c = Connector('^done,value="0x601040 <s>"', '^done,value="12"',
+                      '^done,name="var2",numchild="3",value="{...}",type="struct s",has_more="0"')
+        self.assertRaises(GdbError, resolveLiveVariable, c, "s")
+
+    def testSample(self):
+        # sample the memory of this process
+        counter = ctypes.c_int(42)
+        arr = (ctypes.c_double * 3)(1.5, 2.5, 3.5)
+        variables = [LiveVariable("counter", ctypes.addressof(counter), "int", "i"),
+                     LiveVariable("arr", ctypes.addressof(arr), "double [3]", "d", 3, maxSamples=2)]
+        sampler = LiveSampler(os.getpid(), variables, 1000)
+
+        fd = os.open("/proc/self/mem", os.O_RDONLY)
+        try:
+            for t in range(3):
+                counter.value = t
+                sampler.sample(fd, t)
+        finally:
+            os.close(fd)
+        self.assertEqual(sampler.samples(variables[0]), [(0, 0), (1, 1), (2, 2)])
+        self.assertEqual(sampler.samples(variables[1]), [(1, (1.5, 2.5, 3.5)), (2, (1.5, 2.5, 3.5))])
+
+    def testStopBeforeRun(self):
+        class LateSampler(LiveSampler):
+            def run(self):
+                # the thread only gets to run after stop() was called
+                time.sleep(0.1)
+                LiveSampler.run(self)
+
+        sampler = LateSampler(os.getpid(), [], 1000)
+        sampler.start()
+        threading.Thread(target=sampler.stop, daemon=True).start()
+        self.assertTrue(sampler.wait(2000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Recording and replaying the MI session with gdb
+
+The MiRecorder writes everything sent to and received from gdb into a
+gzipped file; every line is prefixed with its direction (">" for commands,
+"<" for gdb's output) and the seconds since the start of the recording:
+    > 0.000112 0001-file-exec-and-symbols /tmp/a.out
+    < 0.052700 0001^done
+    < 0.052731 (gdb)
+
+A ReplayProcess stands in for the gdb process and answers the commands of a
+GdbConnector from a recording, so sessions can be reproduced without gdb or
+an inferior. Run this module to feed a recording through the parsers:
+    python -m helpers.misession recording.gz
+"""
+
+import gzip
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from .gdbmidecoder import LazyGdbOutput
+
+# a line of a recording; sent is True for commands sent to gdb
+MiLine = namedtuple("MiLine", "sent time data")
+
+_TOKEN = re.compile(rb'\d*')
+
+
+class MiRecorder:
+    def __init__(self, filename):
+        self.filename = filename
+        self.__file = gzip.open(filename, "wb")
+        self.__start = time.time()
+        self.__lock = threading.Lock()
+
+    def __write(self, prefix, data):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.write(b"%s %.6f %s\n" % (prefix, time.time() - self.__start, data))
+
+    def recordSent(self, data):
+        """Record the bytes written to gdb, one or more lines"""
+        for line in data.splitlines():
+            self.__write(b">", line)
+
+    def recordReceived(self, line):
+        """Record a line received from gdb, without the line break"""
+        self.__write(b"<", line)
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+
+def loadSession(filename):
+    """Return the lines of a recording as a list of MiLines"""
+    lines = []
+    with gzip.open(filename, "rb") as f:
+        for line in f:
+            direction, t, data = line.rstrip(b"\n").split(b" ", 2)
+            lines.append(MiLine(direction == b">", float(t), data))
+    return lines
+
+
+def _splitToken(data):
+    token = _TOKEN.match(data).group(0)
+    return token, data[len(token):]
+
+
+class _ReplayInput:
+    """The stdin of a ReplayProcess"""
+    def __init__(self, process):
+        self.__process = process
+        self.__buf = b""
+
+    def write(self, data):
+        self.__buf += data
+        *lines, self.__buf = self.__buf.split(b"\n")
+        for line in lines:
+            self.__process.answer(line)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.__process.kill()
+
+
+class ReplayProcess:
+    """Replays a recording in place of the gdb process of a GdbConnector
+
+    A command is answered with the result record that gdb sent for the
+    first command in the recording with the same text that has not been
+    answered yet; only the token is replaced. gdb's other output is replayed
+    in order up to that result. Commands that are not found get an error.
+    Use GdbConnector.attachProcess to replay a session.
+    """
+    def __init__(self, lines):
+        self.__lines = lines
+        self.__pos = 0
+        self.__lock = threading.Lock()
+
+        # the indices of the results of the recorded commands, by command
+        self.__results = {}
+        sent = {}
+        for i, l in enumerate(lines):
+            token, data = _splitToken(l.data)
+            if l.sent:
+                sent[token] = data
+            elif data.startswith(b"^") and token in sent:
+                self.__results.setdefault(sent.pop(token), []).append(i)
+
+        # the output is written by a separate thread, so that answering
+        # never blocks on a full pipe
+        r, w = os.pipe()
+        self.stdout = os.fdopen(r, "rb", buffering=0)
+        self.__out = queue.Queue()
+        threading.Thread(target=self.__writer, args=(os.fdopen(w, "wb", buffering=0),), daemon=True).start()
+        self.stdin = _ReplayInput(self)
+        # the output before the first command
+        self.__replayUntil(self.__nextCommand(-1))
+
+    def __replayUntil(self, end):
+        """Write gdb's output up to (excluding) the line end to stdout; the
+        result records are left out, they are sent as answers"""
+        out = []
+        for l in self.__lines[self.__pos:end]:
+            if not l.sent and not _splitToken(l.data)[1].startswith(b"^"):
+                out.append(l.data + b"\n")
+        self.__pos = max(self.__pos, end)
+        self.__out.put(b"".join(out))
+
+    def __writer(self, f):
+        with f:
+            for data in iter(self.__out.get, None):
+                f.write(data)
+
+    def answer(self, line):
+        token, cmd = _splitToken(line)
+        with self.__lock:
+            if self.__out is None:
+                return
+            results = self.__results.get(cmd)
+            if not results:
+                self.__out.put(token + b'^error,msg="Command not found in the recording"\n(gdb) \n')
+                return
+
+            i = results.pop(0)
+            self.__replayUntil(i)
+            self.__out.put(token + _splitToken(self.__lines[i].data)[1] + b"\n")
+            # and what gdb sent before the next command, eg. the prompt or
+            # the *stopped following a ^running
+            self.__replayUntil(self.__nextCommand(i))
+
+    def __nextCommand(self, i):
+        for j in range(i + 1, len(self.__lines)):
+            if self.__lines[j].sent:
+                return j
+        return len(self.__lines)
+
+    def send_signal(self, sig):
+        pass
+
+    def kill(self):
+        """End the replay; the reader sees the end of gdb's output"""
+        with self.__lock:
+            if self.__out is not None:
+                self.__out.put(None)
+                self.__out = None
+
+
+def replayOutput(lines, parser):
+    """Parse gdb's output in a recording; returns the completely decoded
+    records"""
+    records = parser.parse([str(l.data, "UTF-8") for l in lines
+                            if not l.sent and not l.data.startswith(b"(gdb)")])
+    for r in records:
+        if isinstance(r, LazyGdbOutput):
+            r.decode()
+    return records
+
+
+def main(filename):
+    from .gdbreader import GdbReader
+
+    lines = loadSession(filename)
+    received = [l for l in lines if not l.sent]
+    size = sum(len(l.data) + 1 for l in received)
+    print("%s: %d commands, %d lines (%.1f MB) received in %.1f s" % (
+          filename, len(lines) - len(received), len(received), size / float(1 << 20),
+          lines[-1].time if lines else 0))
+
+    for name, parser in sorted(GdbReader.PARSERS.items()):
+        start = time.time()
+        records = replayOutput(lines, parser)
+        elapsed = time.time() - start
+        print("%-12s %10.0f records/s %10.1f MB/s" % (name, len(records) / elapsed, size / float(1 << 20) / elapsed))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
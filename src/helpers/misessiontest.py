@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from . import misession
+from .linereader import LineReader
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".gz")
+        os.close(fd)
+        recorder = misession.MiRecorder(self.filename)
+        recorder.recordReceived(b'=thread-group-added,id="i1"')
+        recorder.recordReceived(b'(gdb) ')
+        recorder.recordSent(b'0001-exec-run\n0002-data-evaluate-expression x\n')
+        recorder.recordReceived(b'0001^running')
+        recorder.recordReceived(b'*running,thread-id="all"')
+        recorder.recordReceived(b'(gdb) ')
+        recorder.recordReceived(b'0002^done,value="42"')
+        recorder.recordReceived(b'(gdb) ')
+        recorder.recordReceived(b'*stopped,reason="exited-normally"')
+        recorder.close()
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def testLoad(self):
+        lines = misession.loadSession(self.filename)
+        self.assertEqual(len(lines), 10)
+        self.assertEqual([l.sent for l in lines[:4]], [False, False, True, True])
+        self.assertEqual(lines[3].data, b'0002-data-evaluate-expression x')
+        self.assertTrue(all(a.time <= b.time for a, b in zip(lines, lines[1:])))
+
+    def testReplay(self):
+        process = misession.ReplayProcess(misession.loadSession(self.filename))
+        # answered in a different order and with different tokens
+        process.stdin.write(b'0007-data-evaluate-expression x\n0008-exec-')
+        process.stdin.write(b'run\n0009-foo\n')
+        process.kill()
+        lines = [bytes(l) for l in LineReader(process.stdout).lines()]
+        self.assertEqual(lines, [
+            b'=thread-group-added,id="i1"', b'(gdb) ',
+            b'*running,thread-id="all"', b'(gdb) ', b'0007^done,value="42"', b'(gdb) ', b'*stopped,reason="exited-normally"',
+            b'0008^running',
+            b'0009^error,msg="Command not found in the recording"', b'(gdb) '])
+
+
+if __name__ == "__main__":
+    unittest.main()
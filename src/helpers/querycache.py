@@ -0,0 +1,121 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Cache for the results of side-effect free gdb commands
+
+Several views ask gdb the same questions whenever the inferior stops. The
+answers cannot change until the inferior runs again, a different frame or
+thread is selected or something is assigned, so they are cached for the
+current "stop generation". Every event that might change the answers starts
+a new generation and empties the cache.
+
+Cached results are handed out to every caller asking the same question, so
+the records returned by GdbConnector.execute are read-only; copy them (or
+decode them with gdbreplies) before changing anything.
+"""
+
+import re
+import threading
+
+from .gdbmidecoder import LazyGdbOutput
+
+# commands whose results only depend on the state of the stopped inferior
+CACHEABLE = frozenset([
+    "-stack-list-frames", "-stack-list-variables", "-stack-list-locals",
+    "-stack-list-arguments", "-stack-info-depth", "-stack-info-frame",
+    "-thread-info", "-thread-list-ids", "-data-evaluate-expression",
+    "-data-list-register-names", "-data-list-register-values",
+    "-data-disassemble", "-break-list", "-file-list-exec-source-files",
+])
+
+# commands that neither change the state of the inferior nor the selected
+# frame or thread, and therefore need not start a new generation
+NEUTRAL = frozenset([
+    "-var-create", "-var-delete", "-var-update", "-var-list-children",
+    "-var-info-type", "-var-info-expression", "-var-info-path-expression",
+    "-var-info-num-children", "-var-show-format", "-var-show-attributes",
+    "-var-evaluate-expression", "-var-set-format", "-list-features",
+    "-info-gdb-mi-command", "-gdb-version",
+])
+
+# assignments (including the compound shifts <<= and >>=, whose = follows
+# a < or > like in a comparison), increments and decrements in an expression
+_SIDE_EFFECTS = re.compile(r'<<=|>>=|(?<![=!<>])=(?!=)|\+\+|--')
+
+
+class QueryCache:
+    def __init__(self):
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def isCacheable(cmd):
+        """Whether the result of cmd may be cached; expressions are assumed
+        to be free of side effects unless they assign something"""
+        name, _, args = cmd.partition(" ")
+        if name not in CACHEABLE:
+            return False
+        return name != "-data-evaluate-expression" or not _SIDE_EFFECTS.search(args)
+
+    def lookup(self, cmd):
+        """Return the cached result of cmd and the current generation; the
+        result is None if cmd must be sent to gdb. Any command that might
+        change the answers to other commands starts a new generation."""
+        cacheable = self.isCacheable(cmd)
+        if not cacheable and cmd.partition(" ")[0] not in NEUTRAL:
+            self.invalidate()
+        with self.__lock:
+            res = self.__entries.get(cmd) if cacheable else None
+            if cacheable:
+                if res is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            return res, self.generation
+
+    def store(self, cmd, generation, res):
+        """Cache the result of cmd, unless the generation has changed since
+        the command was sent"""
+        if not self.isCacheable(cmd):
+            return
+        # the result may be shared between threads, so do not decode it on
+        # demand
+        if isinstance(res, LazyGdbOutput):
+            res.decode()
+        with self.__lock:
+            if generation == self.generation:
+                self.__entries[cmd] = res
+
+    def invalidate(self):
+        """Start a new generation"""
+        with self.__lock:
+            self.generation += 1
+            self.__entries.clear()
+
+    def statistics(self):
+        """Return the number of hits and misses so far"""
+        with self.__lock:
+            return self.hits, self.misses
@@ -0,0 +1,49 @@
+import unittest
+from .querycache import QueryCache
+from .gdbmidecoder import LazyGdbMiDecoder
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache()
+
+    def fetch(self, cmd, reply='^done,value="1"'):
+        res, generation = self.cache.lookup(cmd)
+        if res is None:
+            res = LazyGdbMiDecoder.parse([reply])[0]
+            self.cache.store(cmd, generation, res)
+        return res
+
+    def testCacheable(self):
+        self.assertTrue(QueryCache.isCacheable("-stack-list-frames"))
+        self.assertTrue(QueryCache.isCacheable('-data-evaluate-expression "a == b && c <= d"'))
+        self.assertFalse(QueryCache.isCacheable('-data-evaluate-expression "a = 1"'))
+        self.assertFalse(QueryCache.isCacheable('-data-evaluate-expression "i++"'))
+        self.assertFalse(QueryCache.isCacheable('-data-evaluate-expression "a <<= 1"'))
+        self.assertFalse(QueryCache.isCacheable('-data-evaluate-expression "a>>=1"'))
+        self.assertTrue(QueryCache.isCacheable('-data-evaluate-expression "a << 1 >= b >> 2"'))
+        self.assertFalse(QueryCache.isCacheable("-exec-next"))
+        self.assertFalse(QueryCache.isCacheable('-var-create - * "a"'))
+
+    def testGenerations(self):
+        a = self.fetch("-stack-info-depth")
+        self.assertIs(a, self.fetch("-stack-info-depth"))
+        # results are decoded before they are shared
+        self.assertNotIn("_pending", vars(a))
+
+        # neutral commands keep the generation, others start a new one
+        self.fetch('-var-update --all-values "*"')
+        self.assertIs(a, self.fetch("-stack-info-depth"))
+        self.fetch("-stack-select-frame 1")
+        self.assertIsNot(a, self.fetch("-stack-info-depth"))
+        self.assertEqual(self.cache.statistics(), (2, 2))
+
+    def testLateResults(self):
+        _, generation = self.cache.lookup("-thread-info")
+        self.cache.invalidate()
+        self.cache.store("-thread-info", generation, LazyGdbMiDecoder.parse(['^done'])[0])
+        self.assertIsNone(self.cache.lookup("-thread-info")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Commands for evaluating many values at once, run inside gdb
+
+This script is sourced into gdb (see gdbextensions.GdbExtensions) and must
+not be imported by ricodebug itself. It registers the MI commands
+    -ricodebug-eval-many EXP...
+    -ricodebug-dump EXP [DEPTH [MAX-CHILDREN]]
+which return the values of all expressions, or the tree of members and
+elements below an expression, with a single reply. gdb versions without
+gdb.MICommand (before 13) get CLI commands with the same names instead,
+which write their results as JSON into the file given as first argument.
+"""
+
+import itertools
+import json
+
+import gdb
+
+DEFAULT_DEPTH = 3
+DEFAULT_MAX_CHILDREN = 100
+
+
+def evalMany(exps):
+    values = []
+    for exp in exps:
+        try:
+            values.append({"exp": exp, "value": str(gdb.parse_and_eval(exp))})
+        except gdb.error as e:
+            values.append({"exp": exp, "error": str(e)})
+    return values
+
+
+def _children(value, maxChildren):
+    """The (name, value) pairs of the members or elements of value, or None
+    for scalars"""
+    printer = gdb.default_visualizer(value)
+    if printer is not None:
+        if not hasattr(printer, "children"):
+            return None
+        return [(str(name), child if isinstance(child, gdb.Value) else gdb.Value(child))
+                for name, child in itertools.islice(printer.children(), maxChildren)]
+
+    type_ = value.type.strip_typedefs()
+    if type_.code in (gdb.TYPE_CODE_STRUCT, gdb.TYPE_CODE_UNION):
+        return [(field.name or "<anonymous>", value[field]) for field in type_.fields()][:maxChildren]
+    if type_.code == gdb.TYPE_CODE_ARRAY:
+        low, high = type_.range()
+        return [("[%d]" % i, value[i]) for i in range(low, min(high, low + maxChildren - 1) + 1)]
+    return None
+
+
+def dump(name, value, depth, maxChildren):
+    node = {"name": name, "type": str(value.type)}
+    try:
+        children = _children(value, maxChildren) if depth > 0 else None
+        if children is None:
+            node["value"] = str(value)
+        else:
+            node["children"] = [dump(n, v, depth - 1, maxChildren) for n, v in children]
+    except gdb.error as e:
+        node["error"] = str(e)
+    return node
+
+
+def dumpExpression(argv):
+    if not argv:
+        raise gdb.GdbError("usage: ricodebug-dump EXP [DEPTH [MAX-CHILDREN]]")
+    depth = int(argv[1]) if len(argv) > 1 else DEFAULT_DEPTH
+    maxChildren = int(argv[2]) if len(argv) > 2 else DEFAULT_MAX_CHILDREN
+    return dump(argv[0], gdb.parse_and_eval(argv[0]), depth, maxChildren)
+
+
+if hasattr(gdb, "MICommand"):
+    class EvalMany(gdb.MICommand):
+        def invoke(self, argv):
+            return {"values": evalMany(argv)}
+
+    class Dump(gdb.MICommand):
+        def invoke(self, argv):
+            try:
+                return {"tree": dumpExpression(argv)}
+            except gdb.error as e:
+                raise gdb.GdbError(str(e))
+
+    EvalMany("-ricodebug-eval-many")
+    Dump("-ricodebug-dump")
+else:
+    class JsonCommand(gdb.Command):
+        """Write the result of fn(argv) as JSON into the file given as
+        first argument"""
+        def __init__(self, name, fn):
+            gdb.Command.__init__(self, name, gdb.COMMAND_DATA)
+            self.name = name
+            self.fn = fn
+
+        def invoke(self, arg, from_tty):
+            argv = gdb.string_to_argv(arg)
+            if not argv:
+                raise gdb.GdbError("usage: %s FILE ARGS..." % self.name)
+            with open(argv[0], "w") as f:
+                json.dump(self.fn(argv[1:]), f)
+
+    JsonCommand("ricodebug-eval-many", lambda argv: {"values": evalMany(argv)})
+    JsonCommand("ricodebug-dump", lambda argv: {"tree": dumpExpression(argv)})
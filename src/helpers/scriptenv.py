@@ -57,5 +57,5 @@ class ScriptEnv:
     @trace
     def print_(self, *args):
         """show variables in the main window"""
-        for var in args:
-            self.note("%s = %s" % (var, self.sp.evaluateExpression(var)))
+        for var, value in zip(args, self.sp.evaluateMany(args)):
+            self.note("%s = %s" % (var, value))
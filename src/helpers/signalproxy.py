@@ -44,12 +44,18 @@ class SignalProxy(QObject):
     inferiorHasExited = pyqtSignal('PyQt_PyObject')
     inferiorReceivedSignal = pyqtSignal('PyQt_PyObject')
     inferiorStoppedNormally = pyqtSignal('PyQt_PyObject')
+    stopSnapshotReady = pyqtSignal('PyQt_PyObject')
     inferiorIsRunning = pyqtSignal('PyQt_PyObject')
     executableOpened = pyqtSignal('PyQt_PyObject')
-    threadCreated = pyqtSignal('PyQt_PyObject')
-    threadExited = pyqtSignal('PyQt_PyObject')
+    # the following carry lists of consecutive records of the same class
+    threadsCreated = pyqtSignal('PyQt_PyObject')
+    threadsExited = pyqtSignal('PyQt_PyObject')
+    # thread ids (or ["all"]) and whether they are running now
+    threadsStateChanged = pyqtSignal('PyQt_PyObject', bool)
+    # the id of the thread the user selected
+    threadSelected = pyqtSignal('PyQt_PyObject')
     AddWatch = pyqtSignal('PyQt_PyObject')
-    breakpointModified = pyqtSignal('PyQt_PyObject')
+    breakpointsModified = pyqtSignal('PyQt_PyObject')
     recordStateChanged = pyqtSignal(bool)
 
     def __init__(self, distributedObjects):
@@ -106,6 +112,9 @@ class SignalProxy(QObject):
     def gdbEvaluateExpression(self, exp):
         return self.distributedObjects.debugController.evaluateExpression(exp)
 
+    def gdbEvaluateMany(self, exps):
+        return self.distributedObjects.debugController.evaluateMany(exps)
+
     def gdbGetStackDepth(self):
         return self.distributedObjects.debugController.getStackDepth()
 
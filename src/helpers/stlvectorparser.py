@@ -46,11 +46,5 @@ class StlVectorParser(QObject):
         if size is None:
             return None
 
-        content = []
-
-        for i in range(0, size):
-            res = self.signalProxy.gdbEvaluateExpression("(" + vector + ").begin()._M_current+" + str(i))
-            if res is not None:
-                content.append(res)
-
-        return content
+        elements = ["(" + vector + ").begin()._M_current+" + str(i) for i in range(0, size)]
+        return [res for res in self.signalProxy.gdbEvaluateMany(elements) if res is not None]
@@ -0,0 +1,81 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+"""Benchmark for the queries after a stop with a slow connection to gdb
+
+Connects to a fake gdb (see fakegdb) as if it were a remote target, adds an
+artificial latency to every round trip and measures the time from
+receiving *stopped until the results of the stop queries of the
+StopCoordinator are available: with one round trip per query, with all of
+them pipelined in one batch, and with the batch sent by the reader as soon
+as the stop arrives. Run it from the src directory:
+    python -m helpers.stopquerybenchmark [latency in ms] [stops]
+"""
+
+import sys
+import time
+
+from controllers.stopcoordinator import StopCoordinator
+from .gdbconnector import GdbConnector
+from .gdboutput import GdbOutput
+
+
+def waitForStop(connector):
+    while True:
+        for rec in connector.reader.takeAsyncRecords():
+            if rec.type_ == GdbOutput.EXEC_ASYN and rec.class_ == GdbOutput.STOPPED:
+                return rec
+        time.sleep(0.0005)
+
+
+def measure(name, connector, query, stops):
+    total = 0
+    for _ in range(stops):
+        connector.next_()
+        rec = waitForStop(connector)
+        query(rec)
+        total += time.time() - rec.timestamp
+    print("%-24s %8.1f ms" % (name, total / stops * 1000))
+    return total
+
+
+def main(latency=20, stops=10):
+    cmds = StopCoordinator.QUERIES
+    connector = GdbConnector()
+    connector.start([sys.executable, "-m", "helpers.fakegdb"])
+    connector.connectRemote("localhost:1234")
+    connector.latency = latency / 1000.0
+    try:
+        sequential = measure("one round trip per query", connector,
+                             lambda rec: [connector.execute(cmd) for cmd in cmds], stops)
+        batch = measure("pipelined", connector, lambda rec: connector.executeBatch(cmds), stops)
+        connector.setStopQueries(lambda rec: cmds)
+        prefetched = measure("prefetched on *stopped", connector,
+                             lambda rec: connector.takeStopQueries(rec, cmds), stops)
+        print("speedup: %.1fx pipelined, %.1fx prefetched" % (sequential / batch, sequential / prefetched))
+    finally:
+        connector.kill()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -26,6 +26,7 @@ import logging
 from PyQt4.QtCore import QAbstractTableModel, Qt, QModelIndex
 
 from helpers.excep import GdbError
+from helpers.gdboutput import GdbOutput
 from helpers.icons import Icons
 from helpers.tracer import trace
 
@@ -90,7 +91,7 @@ class Breakpoint(AbstractBreakpoint):
         self.disp = rec.disp
         self.enabled = {"y": True, "n": False}[rec.enabled]
         self.number = int(rec.number)
-        self.originalLocation = rec.__dict__['original-location']
+        self.originalLocation = getattr(rec, 'original-location')
         self.times = int(rec.times)
         self.type = rec.type
         if hasattr(rec, "cond"):
@@ -101,7 +102,7 @@ class Breakpoint(AbstractBreakpoint):
         if rec.addr == "<MULTIPLE>":
             """ start special handling"""
             rec2 = self.gdbConnector.getMultipleBreakpoints(rec.number)
-            self.parseOriginalLocation(rec2.__dict__['original-location'])
+            self.parseOriginalLocation(getattr(rec2, 'original-location'))
             self.func = "unknown"
         else:
             self.file = getattr(rec, "file", "<unknown>")
@@ -139,8 +140,9 @@ class BreakpointModel(QAbstractTableModel):
         self.connector = do.gdb_connector
         do.signalProxy.cleanupModels.connect(self.clearBreakpoints)
         do.signalProxy.registerWithSessionManager.emit(self, "Breakpoints")
-        do.signalProxy.breakpointModified.connect(self.__updateBreakpointFromGdbRecord)
+        do.signalProxy.breakpointsModified.connect(self.__updateBreakpointsFromGdbRecords)
         do.signalProxy.runClicked.connect(self.__resetHitCounters)
+        do.debugController.watchBreakpoints(self)
 
         do.signalProxy.addProxy(["insertBreakpoint", "enableBreakpoint", "disableBreakpoint", "changeCondition", "changeSkip"], self)
 
@@ -166,13 +168,68 @@ class BreakpointModel(QAbstractTableModel):
 
     def clearBreakpoints(self):
         """ deletes all breakpoints in list """
-        # we need to store the numbers in a separate list since self.breakpoints
-        # will be modified in the loop
-        numbers = [bp.number for bp in self.breakpoints]
-        for number in numbers:
-            # delete breakpoints by number to avoid problems where the bp's file
-            # name is unknown
-            self.deleteBreakpointByNumber(number)
+        if not self.breakpoints:
+            return
+        # delete breakpoints by number to avoid problems where the bp's file
+        # name is unknown; all of them with a single command
+        self.connector.deleteBreakpoints([bp.number for bp in self.breakpoints])
+        # the views remove their markers when the rows are about to go
+        self.beginRemoveRows(QModelIndex(), 0, len(self.breakpoints) - 1)
+        self.breakpoints = []
+        self.endRemoveRows()
+
+    @staticmethod
+    def __location(bp):
+        """ file:line of bp, or None if it has no line number (eg. some
+        <MULTIPLE> breakpoints, whose line is parsed from a string)
+        """
+        try:
+            line = int(bp.line)
+        except (TypeError, ValueError):
+            return None
+        return "%s:%d" % (bp.fullname, line) if line > 0 else None
+
+    def breakpointSpecs(self):
+        """ the plain breakpoints in a form that restoreBreakpoints can
+        recreate them from, eg. after the executable has been reloaded;
+        breakpoints without a line number cannot be recreated and are skipped
+        @return list of (location, condition, skip, enabled, settings) tuples,
+                where settings holds the name, action and autoContinue that
+                only ricodebug knows about
+        """
+        specs = []
+        for bp in self.breakpoints:
+            location = self.__location(bp)
+            if type(bp) is Breakpoint and location is not None:
+                specs.append((location, bp.condition, bp.skip, bp.enabled,
+                              {"name": bp.name, "action": bp.action, "autoContinue": bp.autoContinue}))
+        return specs
+
+    def restoreBreakpoints(self, specs):
+        """ inserts the breakpoints returned by breakpointSpecs in one batch;
+        breakpoints that already exist at the same location are skipped
+        @return list of the locations that could not be resolved any more
+        """
+        existing = set(self.__location(bp) for bp in self.breakpoints)
+        specs = [spec for spec in specs if spec[0] not in existing]
+        failed = []
+        new = []
+        for spec, res in zip(specs, self.connector.insertBreakpoints([spec[:4] for spec in specs])):
+            if res.class_ == GdbOutput.ERROR:
+                failed.append(spec[0])
+            else:
+                bp = self._newBreakpoint(res.bkpt, self.connector)
+                for attr, value in spec[4].items():
+                    setattr(bp, attr, value)
+                new.append(bp)
+
+        if new:
+            self.beginInsertRows(QModelIndex(), len(self.breakpoints), len(self.breakpoints) + len(new) - 1)
+            self.breakpoints.extend(new)
+            self.endInsertRows()
+        if failed:
+            logging.warning("Could not restore the breakpoints at %s.", ", ".join(failed))
+        return failed
 
     @trace
     def insertBreakpoint(self, file_, line):
@@ -288,18 +345,25 @@ class BreakpointModel(QAbstractTableModel):
             bp.skip = int(skip)
             self.__emitDataChangedForRows(row)
 
-    def __updateBreakpointFromGdbRecord(self, rec):
-        for info in rec.results:
-            assert info.dest == "bkpt"
-            row, bp = self.findRowForNumber(int(info.src.number))
-            if row is not None:
-                bp.fromGdbRecord(info.src)
-                self.__emitDataChangedForRows(row)
+    def __updateBreakpointsFromGdbRecords(self, records):
+        rowForNumber = dict((bp.number, i) for i, bp in enumerate(self.breakpoints))
+        rows = []
+        for rec in records:
+            for info in rec.results:
+                assert info.dest == "bkpt"
+                row = rowForNumber.get(int(info.src.number))
+                if row is not None:
+                    self.breakpoints[row].fromGdbRecord(info.src)
+                    rows.append(row)
+        # a single notification for all rows that have changed
+        if rows:
+            self.__emitDataChangedForRows(min(rows), max(rows))
 
     def __resetHitCounters(self):
-        for row, bp in enumerate(self.breakpoints):
+        for bp in self.breakpoints:
             bp.times = 0
-            self.__emitDataChangedForRows(row)
+        if self.breakpoints:
+            self.__emitDataChangedForRows(0, len(self.breakpoints) - 1)
 
     def rowCount(self, parent):
         return len(self.breakpoints)
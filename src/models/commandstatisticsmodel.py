@@ -0,0 +1,82 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+""" @package commandstatisticsmodel
+A model showing the latency statistics of the MI commands sent to gdb.
+"""
+
+from PyQt4.QtCore import Qt, QAbstractTableModel
+
+from helpers.commandstatistics import CommandStatistics
+
+
+class CommandStatisticsModel(QAbstractTableModel):
+    def __init__(self, statistics, parent=None):
+        QAbstractTableModel.__init__(self, parent)
+        self.statistics = statistics
+        self.rows = []
+        self.sortColumn = 3
+        self.sortOrder = Qt.DescendingOrder
+
+    def rowCount(self, parent):
+        return len(self.rows)
+
+    def columnCount(self, parent):
+        return len(CommandStatistics.COLUMNS)
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+
+        value = self.rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            if isinstance(value, float):
+                return "%.3f" % value if index.column() == 3 else "%.1f" % value
+            return value
+        elif role == Qt.TextAlignmentRole and index.column() > 0:
+            return Qt.AlignRight | Qt.AlignVCenter
+
+        return None
+
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return CommandStatistics.COLUMNS[section]
+        return None
+
+    def sort(self, column, order):
+        self.sortColumn = column
+        self.sortOrder = order
+
+        self.layoutAboutToBeChanged.emit()
+        self.rows.sort(key=lambda r: r[column], reverse=(order == Qt.DescendingOrder))
+        self.layoutChanged.emit()
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def update(self):
+        """Show the current statistics"""
+        self.beginResetModel()
+        self.rows = self.statistics.rows()
+        self.endResetModel()
+        self.sort(self.sortColumn, self.sortOrder)
@@ -32,11 +32,19 @@ class LocalsModel(VariableModel):
         self._returnVar = None
 
         self.do = do
-        self.do.signalProxy.inferiorStoppedNormally.connect(self.getLocals)
-        self.do.stackController.stackFrameSelected.connect(self.getLocals)
+        self.do.signalProxy.inferiorStoppedNormally.connect(self.showReturnValue)
+        self.do.signalProxy.stopSnapshotReady.connect(self.applySnapshot)
+        self.do.stackController.stackFrameSelected.connect(self.update)
+        # the locals of the selected session come with the next snapshot
+        self.do.sessionPool.currentChanged.connect(self.clear)
 
-    def getLocals(self, rec):
-        # if we previously showed some return value, remove it; getLocals will
+    def showReturnValue(self, rec):
+        # the stops of the primary session are not shown while another
+        # session is selected
+        if self.do.sessionPool.current is not self.do.sessionPool.primary:
+            return
+
+        # if we previously showed some return value, remove it; this will
         # be called after the user steps/conts/... the program, most probably
         # making it out of date
         if self._returnVar:
@@ -50,7 +58,23 @@ class LocalsModel(VariableModel):
                 self._returnVar = self.addVar(r.src)
                 self._returnVar._v.exp = "Return value"
 
-        stackTop = self.do.gdb_connector.getStack()[0]
+    def applySnapshot(self, snapshot):
+        if snapshot.frames and snapshot.variables is not None:
+            self.__setLocals((snapshot.frames[0], snapshot.variables))
+
+    def update(self):
+        connector = self.do.sessionPool.current.connector
+        self.do.gdbExecutor.submit(lambda: self.__queryLocals(connector), self.__setLocals)
+
+    @staticmethod
+    def __queryLocals(connector):
+        # runs in the executor's thread; the model is updated in __setLocals.
+        # the stack top must be a gdbreplies.Frame like the snapshot's, else
+        # the comparison in __setLocals would clear the locals every time
+        return connector.getFrames()[0], connector.getLocals()
+
+    def __setLocals(self, reply):
+        stackTop, locals_ = reply
         if not self._stackTop or self._stackTop.func != stackTop.func or self._stackTop.level != stackTop.level:
             self.clear()
             self._stackTop = stackTop
@@ -58,7 +82,7 @@ class LocalsModel(VariableModel):
         # we're doing some sorting magic here: tuples will be sorted by the
         # second element if the first is equal; also, False < True, therefore
         # invert the boolean arg to have arguments first
-        locals_ = sorted(self.do.gdb_connector.getLocals(), key=lambda x: (not x.arg, x.name))
+        locals_ = sorted(locals_, key=lambda x: (not x.arg, x.name))
         current = [x for x in self._vars.items()]
 
         for l in locals_:
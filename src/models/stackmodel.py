@@ -55,16 +55,16 @@ class StackModel(QAbstractTableModel):
 
         if role == Qt.DisplayRole:
             if index.column() == 0:
-                if hasattr(l, "level"):
+                if l.level is not None:
                     ret = str(l.level)
             elif index.column() == 1:
-                if hasattr(l, "file"):
+                if l.file is not None:
                     ret = l.file
             elif index.column() == 2:
-                if hasattr(l, "func"):
+                if l.func is not None:
                     ret = l.func
             elif index.column() == 3:
-                if hasattr(l, "line"):
+                if l.line is not None:
                     ret = l.line
 
         return ret
@@ -122,11 +122,13 @@ class StackModel(QAbstractTableModel):
 
         self.controller.removeStackMarkers()
 
-    def update(self):
+    def applySnapshot(self, snapshot):
+        if snapshot.frames is not None:
+            self.__setStack(list(snapshot.frames))
+
+    def __setStack(self, stack):
         self.layoutAboutToBeChanged.emit()
-        self.stack = self.connector.getStack()
-        for s in self.stack:
-            s.level = int(s.level)
+        self.stack = stack
         self.layoutChanged.emit()
 
         self.sort(self.sortColumn, self.sortOrder)
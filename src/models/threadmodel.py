@@ -27,6 +27,8 @@ from operator import attrgetter
 from PyQt4.QtCore import QAbstractTableModel, Qt, QModelIndex
 from PyQt4.QtGui import QPixmap
 
+from helpers.gdbreplies import Frame
+
 
 class ThreadInfo:
     STOPPED, RUNNING = range(2)
@@ -42,18 +44,16 @@ class ThreadInfo:
         self.level = None
 
     def updateFromGdb(self, res):
+        """Update the thread from a gdbreplies.Thread"""
         self.core = res.core
         self.name = res.name
         self.state = {"stopped": self.STOPPED, "running": self.RUNNING}[res.state]
-        self.file = None
-        try:
-            self.file = res.frame.file
-            self.file = res.frame.fullname
-        except AttributeError:
-            pass
-        self.func = res.frame.func
-        self.line = getattr(res.frame, "line", 0)
-        self.level = res.frame.level
+        # running threads do not report a frame
+        frame = res.frame or Frame(None, None, None, None, None, None)
+        self.file = frame.fullname or frame.file
+        self.func = frame.func
+        self.line = frame.line or 0
+        self.level = frame.level
 
 
 class ThreadModel(QAbstractTableModel):
@@ -61,34 +61,54 @@ class ThreadModel(QAbstractTableModel):
         QAbstractTableModel.__init__(self)
         self.__do = distributedObjects
         self.__threads = []
-        self.__do.signalProxy.inferiorStoppedNormally.connect(self.update)
-        self.__do.signalProxy.threadCreated.connect(self.threadCreated)
-        self.__do.signalProxy.threadExited.connect(self.threadExited)
+        self.__do.signalProxy.stopSnapshotReady.connect(self.applySnapshot)
+        self.__do.signalProxy.threadsCreated.connect(self.threadsCreated)
+        self.__do.signalProxy.threadsExited.connect(self.threadsExited)
+        self.__do.signalProxy.threadsStateChanged.connect(self.threadsStateChanged)
+        self.__do.signalProxy.threadSelected.connect(self.threadSelected)
+        self.__do.sessionPool.currentChanged.connect(self.sessionSelected)
 
         self.__currentThread = None
+        # the threads of the primary session are tracked with gdb's
+        # notifications; those of other sessions are taken from each stop,
+        # as is the whole list after another session has been selected
+        self.__tracking = True
+        self.__rebuild = False
 
         self.threadRunningPixmap = QPixmap(":/icons/images/16x16/running.png")
         self.threadStoppedPixmap = QPixmap(":/icons/images/16x16/stopped.png")
         self.currentTheadPixmap = QPixmap(":/icons/images/arrow-right.png")
 
-    def __addThread(self, id_):
-        self.beginInsertRows(QModelIndex(), len(self.__threads), len(self.__threads))
-        t = ThreadInfo(id_)
-        self.__threads.append(t)
+    def __addThreads(self, ids):
+        first = len(self.__threads)
+        self.beginInsertRows(QModelIndex(), first, first + len(ids) - 1)
+        self.__threads.extend(ThreadInfo(id_) for id_ in ids)
         self.endInsertRows()
 
-    def __removeThread(self, id_):
-        for i, t in enumerate(self.__threads):
-            if t.id == id_:
-                break
-
-        self.beginRemoveRows(QModelIndex(), i, i)
-        del self.__threads[i]
-        self.endRemoveRows()
-
-    def update(self):
-        res = self.__do.gdb_connector.threadInfo()
-        for ti in res.threads:
+    def __removeThreads(self, ids):
+        rows = [i for i, t in enumerate(self.__threads) if t.id in ids]
+        if len(rows) == 1:
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[0])
+            del self.__threads[rows[0]]
+            self.endRemoveRows()
+        elif rows:
+            # removing scattered rows one by one is quadratic; rebuild instead
+            self.beginResetModel()
+            self.__threads = [t for t in self.__threads if t.id not in ids]
+            self.endResetModel()
+
+    def applySnapshot(self, snapshot):
+        if snapshot.threads is not None:
+            self.__setThreads((snapshot.currentThread, snapshot.threads))
+
+    def __setThreads(self, reply):
+        currentThread, threads = reply
+        if self.__rebuild or not self.__tracking:
+            self.__rebuild = False
+            self.beginResetModel()
+            self.__threads = [ThreadInfo(ti.id) for ti in threads]
+            self.endResetModel()
+        for ti in threads:
             for i, t in enumerate(self.__threads):
                 if ti.id == t.id:
                     # update the entry
@@ -100,7 +120,16 @@ class ThreadModel(QAbstractTableModel):
                     self.dataChanged.emit(firstIndex, secondIndex)
                     break
 
-        self.__currentThread = getattr(res, "current-thread-id")
+        self.__currentThread = currentThread
+
+    def threadSelected(self, id_):
+        self.__currentThread = id_
+        if self.__threads:
+            self.dataChanged.emit(self.index(0, 0, QModelIndex()), self.index(len(self.__threads) - 1, 0, QModelIndex()))
+
+    def sessionSelected(self, session):
+        self.__tracking = session is self.__do.sessionPool.primary
+        self.__rebuild = True
 
     def clear(self):
         self.__threads = []
@@ -179,15 +208,34 @@ class ThreadModel(QAbstractTableModel):
         self.__threads.sort(key=attrgetter(key), reverse=rev)
         self.layoutChanged.emit()
 
-    def threadCreated(self, rec):
-        for r in rec.results:
-            if r.dest == "id":
-                self.__addThread(r.src)
-
-    def threadExited(self, rec):
-        for r in rec.results:
-            if r.dest == "id":
-                self.__removeThread(r.src)
+    @staticmethod
+    def __threadIds(records):
+        return [r.src for rec in records for r in rec.results if r.dest == "id"]
+
+    def threadsCreated(self, records):
+        if not self.__tracking:
+            return
+        ids = self.__threadIds(records)
+        if ids:
+            self.__addThreads(ids)
+
+    def threadsExited(self, records):
+        if not self.__tracking:
+            return
+        self.__removeThreads(set(self.__threadIds(records)))
+
+    def threadsStateChanged(self, ids, running):
+        if not self.__tracking:
+            return
+        state = ThreadInfo.RUNNING if running else ThreadInfo.STOPPED
+        allThreads = "all" in ids
+        rows = []
+        for i, t in enumerate(self.__threads):
+            if allThreads or t.id in ids:
+                t.state = state
+                rows.append(i)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 3, QModelIndex()), self.index(max(rows), 3, QModelIndex()))
 
     def threadIdForRow(self, row):
         return self.__threads[row].id
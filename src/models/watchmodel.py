@@ -22,6 +22,7 @@
 #
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
+from helpers.excep import VariableNotFoundException
 from .variablemodel import VariableModel
 
 
@@ -29,3 +30,15 @@ class WatchModel(VariableModel):
     def __init__(self, do, parent=None):
         VariableModel.__init__(self, do, parent)
         do.signalProxy.AddWatch.connect(self.addVar)
+        do.sessionPool.currentChanged.connect(self.sessionSelected)
+
+    def sessionSelected(self, _):
+        """ watch the same expressions in the selected session; those that
+        cannot be evaluated there are dropped """
+        exps = [var.exp for var in self._vars.items()]
+        self.clear()
+        for exp in exps:
+            try:
+                self.addVar(exp)
+            except VariableNotFoundException:
+                pass
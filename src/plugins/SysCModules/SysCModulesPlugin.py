@@ -127,34 +127,34 @@ class SysCModulesPlugin():
         if elaboration_done == "true" and content is not None:
             self.loaded = True
             self.objects = []
-            for item in content:
-                name = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_module**)" + item + "))->m_name")
-                parent = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_module**)" + item + "))->m_parent")
-                if parent != "0x0":
-                    parent = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_module**)" + item + "))->m_parent->m_name")
-                else:
-                    parent = None
-
-                kind = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_module**)" + item + "))->kind()")
+            modules = ["(*((sc_core::sc_module**)" + item + "))" for item in content]
+            for module, (name, parent, kind) in zip(modules, self.evaluateObjects(modules)):
                 if name is not None:
                     self.objects.append((str(name), str(parent), str(kind)))
 
-                    children = self.signalproxy.getStlVectorContent("(*((sc_core::sc_module**)" + item + "))->m_child_objects")
+                    children = self.signalproxy.getStlVectorContent(module + "->m_child_objects")
                     if children is not None:
-                        for child in children:
-                            childKind = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_object**)" + child + "))->kind()")
-                            childName = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_object**)" + child + "))->m_name")
-                            childParent = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_object**)" + child + "))->m_parent")
-                            if childParent != "0x0":
-                                childParent = self.signalproxy.gdbEvaluateExpression("(*((sc_core::sc_object**)" + child + "))->m_parent->m_name")
-                            else:
-                                childParent = None
-
+                        children = ["(*((sc_core::sc_object**)" + child + "))" for child in children]
+                        for childName, childParent, childKind in self.evaluateObjects(children):
                             if childName is not None and str(self.parseName(childKind)) != "sc_module":
                                 self.objects.append((str(childName), str(childParent), str(childKind)))
 
         self.updateGui()
 
+    def evaluateObjects(self, objects):
+        """Get name, parent name (None for top level objects) and kind of
+        all sc_objects with a single batch of evaluations."""
+        exps = []
+        for o in objects:
+            exps += [o + "->m_name", o + "->m_parent", o + "->m_parent->m_name", o + "->kind()"]
+        values = self.signalproxy.gdbEvaluateMany(exps)
+
+        result = []
+        for i in range(0, len(values), 4):
+            name, parent, parentName, kind = values[i:i + 4]
+            result.append((name, parentName if parent != "0x0" else None, kind))
+        return result
+
     def updateGui(self):
         self.view.clear()
         self.treeItems = {}
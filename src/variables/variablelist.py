@@ -28,10 +28,13 @@ class VariableList:
         """ Constructor
         @param factory    factory for constructing the variables added to this list
         @param do         distributedobjects.DistributedObjects, the DistributedObjects-Instance """
-        self.varPool = do.variablePool
+        self.__do = do
         self.factory = factory
         self._vars = []
 
+    # new variables are created in the selected session
+    varPool = property(lambda self: self.__do.variablePool)
+
     def addVarByName(self, varName):
         var = self.varPool.getVar(self.factory, str(varName))
         self._vars.append(var)
@@ -41,60 +41,82 @@ class VariablePoolConfig(ConfigSet):
 
 
 class VariablePool(QObject):
-    """ Variablepool holding all variables created once from a view """
+    """ Variablepool holding all variables created once from a view
+    every session has its own pool, since gdb's variable objects only exist
+    in the gdb that created them; see DistributedObjects.variablePool
+    """
 
-    def __init__(self, distributedObjects):
+    def __init__(self, distributedObjects, connector=None, config=None):
         """ Constructor
         @param distributedObjects    distributedobjects.DistributedObjects, the DistributedObjects-Instance
+        @param connector             GdbConnector of the session, the primary one if None
+        @param config                VariablePoolConfig shared with the pool of the primary session
         """
         QObject.__init__(self)
 
         self.distributedObjects = distributedObjects
         self.debugcontroller = distributedObjects.debugController
-        self.connector = distributedObjects.gdb_connector
+        self.connector = connector or distributedObjects.gdb_connector
         self.variables = {}
 
         self.signalProxy = distributedObjects.signalProxy
         self.distributedObjects.signalProxy.tracepointOccurred.connect(self.justUpdateValues)
-        self.distributedObjects.signalProxy.inferiorStoppedNormally.connect(self.updateVars)
+        self.distributedObjects.signalProxy.stopSnapshotReady.connect(self.applySnapshot)
 
-        self.config = VariablePoolConfig()
-        self.distributedObjects.configStore.registerConfigSet(self.config)
+        if config is None:
+            config = VariablePoolConfig()
+            self.distributedObjects.configStore.registerConfigSet(config)
+        self.config = config
 
     def justUpdateValues(self):
         """ just update variables for tracepoints, dont signal changes to connected views
         this function is connected to the signal SignalProxy::tracepointOccured()
         """
+        # tracepoints are hit in the primary session
+        if self.connector is not self.distributedObjects.gdb_connector:
+            return
         self.__updateVars(True)
         # signal TracepointController about finished update
         self.distributedObjects.signalProxy.dataForTracepointsReady.emit()
 
+    def applySnapshot(self, snapshot):
+        """ update variables with the changelist of a stop
+        this function is connected to the signal SignalProxy::stopSnapshotReady(PyQt_PyObject)
+        """
+        # the snapshot is one of the selected session
+        if self.distributedObjects.variablePool is self:
+            self.__applyChanges(snapshot.changes)
+
     def updateVars(self):
-        """ update variables if inferiorStoppedNormally
-        this function is connected to the signal SignalProxy::inferiorStoppedNormally(PyQt_PyObject)
+        """ update variables, eg. after an assignment
+        the changes are queried in the background, see gdbexecutor
         """
-        self.__updateVars(False)
+        self.distributedObjects.gdbExecutor.submit(lambda: self.connector.getVarChanges("*"), self.__applyChanges)
 
     def __updateVars(self, isTracePoint=None):
         """ get updates for variables from gdb
         @param isTracePoint   bool, if method is called from Tracepoint<br>
                               changed signal is not emitted
         """
+        self.__applyChanges(self.connector.getVarChanges("*"), isTracePoint)
 
-        res = self.connector.var_update("*")
-        if not hasattr(res, "changelist"):
+    def __applyChanges(self, changes, isTracePoint=None):
+        """ apply the changelist of -var-update to the variables in the pool
+        @param changes        list of gdbreplies.VarChange, or None
+        @param isTracePoint   bool, see __updateVars
+        """
+        if changes is None:
             return
-        res = res.changelist
 
         self.signalProxy.aboutToUpdateVariables.emit()
 
         # update the variable
         # dont use setter method to apply changes because this will cause update to gdb
         # just update value in pool
-        for changed in res:
+        for changed in changes:
             var = self.variables[changed.name]
             var.inScope = (changed.in_scope == "true")
-            if hasattr(changed, "value"):
+            if changed.value is not None:
                 var._value = changed.value
             if not isTracePoint:
                 var.emitChanged()
@@ -138,20 +160,16 @@ class VariablePool(QObject):
         @param parentName   unique name for parent item of children (e.g mystruct.value)
         @param childformat  string, template for forming a child's expression
         """
-        gdbChildren = self.connector.var_list_children(name)
-        if hasattr(gdbChildren, "children"):
-            for child in gdbChildren.children:
-                assert (child.dest == "child")
-
-                if not hasattr(child.src, "type"):  # public, private, protected
-                    access = child.src.exp
-                    self.getChildren(factory, child.src.name, childList, access, parentName, "%(parent)s.%(child)s")
-                elif self.config.mergeBaseClassMembers.value and child.src.exp == child.src.type:  # base classes
-                    self.getChildren(factory, child.src.name, childList, access, parentName, "%(parent)s.%(child)s")
-                else:
-                    var = self.__createVariable(factory, child.src, parentName, None, access, childformat)
-                    self.variables[var._gdbName] = var
-                    childList.append(var)
+        for child in self.connector.getVarChildren(name):
+            if child.type is None:  # public, private, protected
+                access = child.exp
+                self.getChildren(factory, child.name, childList, access, parentName, "%(parent)s.%(child)s")
+            elif self.config.mergeBaseClassMembers.value and child.exp == child.type:  # base classes
+                self.getChildren(factory, child.name, childList, access, parentName, "%(parent)s.%(child)s")
+            else:
+                var = self.__createVariable(factory, child, parentName, None, access, childformat)
+                self.variables[var._gdbName] = var
+                childList.append(var)
 
     def assignValue(self, gdbName, value):
         """
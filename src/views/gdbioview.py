@@ -23,7 +23,7 @@
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
 from PyQt4 import QtCore, QtGui
-from PyQt4.QtCore import Qt
+from PyQt4.QtCore import Qt, QTimer
 from PyQt4.QtGui import QWidget, QTextCursor
 from .stylesheets import STYLESHEET
 from helpers.tools import unBackslashify
@@ -32,6 +32,13 @@ from helpers.icons import Icons
 
 
 class GdbIoView(QWidget):
+    # stream records are inserted at most this often (about 30 frames/s)
+    FLUSH_INTERVAL = 33
+    # the oldest lines are dropped once the view holds more than this
+    MAX_LINES = 20000
+    # show the progress label for outputs longer than this
+    PROGRESS_LINES = 1000
+
     def __init__(self, do, parent=None):
         QWidget.__init__(self, parent)
 
@@ -54,13 +61,26 @@ class GdbIoView(QWidget):
         self.gdbIoEdit = QtGui.QTextEdit(self)
         self.gdbIoEdit.setLayoutDirection(QtCore.Qt.LeftToRight)
         self.gdbIoEdit.setReadOnly(True)
+        self.gdbIoEdit.document().setMaximumBlockCount(self.MAX_LINES)
         self.gridLayout.addWidget(self.gdbIoEdit, 1, 0, 1, 2)
 
+        self.progressLabel = QtGui.QLabel(self)
+        self.progressLabel.hide()
+        self.gridLayout.addWidget(self.progressLabel, 3, 0, 1, 2)
+
+        # lines received since the output started streaming
+        self.__streamedLines = 0
+        self.__flushTimer = QTimer(self)
+        self.__flushTimer.setSingleShot(True)
+        self.__flushTimer.setInterval(self.FLUSH_INTERVAL)
+        self.__flushTimer.timeout.connect(self.flushConsoleRecords)
+
         self.debugController = do.debugController
         self.gdbInputEdit.lineEdit().returnPressed.connect(self.gdbSendButton.click)
         self.gdbSendButton.clicked.connect(self.executeCliCommand)
-        self.debugController.connector.reader.consoleRecordReceived.connect(
-                self.handleConsoleRecord, Qt.QueuedConnection)
+        self.reader = self.debugController.connector.reader
+        self.reader.consoleRecordsPending.connect(
+                self.scheduleFlush, Qt.QueuedConnection)
 
         self.parent().setWindowIcon(Icons.gdb)
 
@@ -77,10 +97,32 @@ class GdbIoView(QWidget):
         self.gdbIoEdit.insertHtml(s)
         self.gdbIoEdit.moveCursor(QTextCursor.End)
 
-    def handleConsoleRecord(self, rec):
-        if rec.type_ == GdbOutput.CONSOLE_STREAM:
+    def scheduleFlush(self):
+        if not self.__flushTimer.isActive():
+            self.__flushTimer.start()
+
+    def flushConsoleRecords(self):
+        """Insert all stream records received since the last flush at once"""
+        records = self.reader.takeConsoleRecords()
+        if not records:
+            # the output has ended
+            self.__streamedLines = 0
+            self.progressLabel.hide()
+            return
+
+        s = "".join(unBackslashify(rec.string) for rec in records
+                    if rec.type_ == GdbOutput.CONSOLE_STREAM or
+                       rec.type_ == GdbOutput.TARGET_STREAM)
+        if s:
             self.gdbIoEdit.moveCursor(QTextCursor.End)
-            s = unBackslashify(rec.string)
             self.gdbIoEdit.insertPlainText(s)
             self.gdbIoEdit.moveCursor(QTextCursor.End)
 
+        self.__streamedLines += len(records)
+        if self.__streamedLines > self.PROGRESS_LINES:
+            self.progressLabel.setText("Receiving gdb output: %d lines" % self.__streamedLines)
+            self.progressLabel.show()
+
+        # keep flushing until a frame passes without new records
+        self.__flushTimer.start()
+
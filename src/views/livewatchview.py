@@ -0,0 +1,205 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+import logging
+
+from PyQt4 import QtGui
+from PyQt4.QtCore import Qt, QTimer, QPointF, QRectF
+from PyQt4.QtGui import QWidget, QPainter, QPolygonF, QColor, QPen
+
+from helpers.configstore import ConfigSet, ConfigItem
+from helpers.icons import Icons
+from helpers.livesampler import LiveSampler, resolveLiveVariable
+
+
+class LiveWatchConfig(ConfigSet):
+    def __init__(self):
+        ConfigSet.__init__(self, "Live Watch", "Live Watch Settings", Icons.graph)
+        self.sampleRate = ConfigItem(self, "Samples per second", 1000)
+        self.history = ConfigItem(self, "Samples kept per variable", 10000)
+
+
+class LivePlot(QWidget):
+    """Strip chart with one band per variable: scalars are plotted over
+    time, arrays show their latest contents"""
+    COLORS = ["#1f77b4", "#d62728", "#2ca02c", "#9467bd", "#ff7f0e", "#8c564b"]
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.series = []
+        self.setMinimumHeight(60)
+
+    def setSeries(self, series):
+        """series is a list of (LiveVariable, samples)"""
+        self.series = series
+        self.update()
+
+    def paintEvent(self, _):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        if not self.series:
+            return
+        height = float(self.height()) / len(self.series)
+        for i, (var, samples) in enumerate(self.series):
+            rect = QRectF(0, i * height, self.width(), height)
+            painter.setPen(QColor("#cccccc"))
+            painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+            if samples:
+                self.__drawSeries(painter, rect.adjusted(4, 16, -4, -4), var, samples,
+                                  QColor(self.COLORS[i % len(self.COLORS)]))
+            painter.setPen(Qt.black)
+            painter.drawText(rect.adjusted(4, 2, -4, -2), Qt.AlignLeft | Qt.AlignTop,
+                             "%s = %s" % (var.exp, samples[-1][1] if samples else "?"))
+
+    def __drawSeries(self, painter, rect, var, samples, color):
+        if var.count == 1:
+            xs = [t for t, _ in samples]
+            ys = [float(v) for _, v in samples]
+        else:
+            ys = [float(v) for v in samples[-1][1]]
+            xs = list(range(len(ys)))
+        # more points than pixels only cost time
+        step = max(1, len(xs) // (2 * max(1, int(rect.width()))))
+        xs, ys = xs[::step], ys[::step]
+
+        x0, x1 = xs[0], xs[-1]
+        y0, y1 = min(ys), max(ys)
+        sx = rect.width() / (x1 - x0) if x1 > x0 else 0
+        sy = rect.height() / (y1 - y0) if y1 > y0 else 0
+        painter.setPen(QPen(color, 1))
+        painter.drawPolyline(QPolygonF([QPointF(rect.left() + (x - x0) * sx, rect.bottom() - (y - y0) * sy)
+                                        for x, y in zip(xs, ys)]))
+        painter.setPen(QColor("#777777"))
+        painter.drawText(rect, Qt.AlignRight | Qt.AlignTop, "%g" % y1)
+        painter.drawText(rect, Qt.AlignRight | Qt.AlignBottom, "%g" % y0)
+
+
+class LiveWatchView(QWidget):
+    # the plot is refreshed at most this often (ms)
+    REFRESH_INTERVAL = 33
+
+    def __init__(self, do, parent=None):
+        QWidget.__init__(self, parent)
+        self.__do = do
+        self.variables = []
+        self.sampler = None
+
+        self.__config = LiveWatchConfig()
+        do.configStore.registerConfigSet(self.__config)
+
+        self.gridLayout = QtGui.QGridLayout(self)
+        self.gridLayout.setMargin(0)
+        self.plot = LivePlot(self)
+        self.gridLayout.addWidget(self.plot, 0, 0, 1, 3)
+        self.expressionEdit = QtGui.QLineEdit(self)
+        self.expressionEdit.setPlaceholderText("Variable or array to sample")
+        self.gridLayout.addWidget(self.expressionEdit, 1, 0, 1, 1)
+        self.samplingButton = QtGui.QPushButton("Sample", self)
+        self.samplingButton.setCheckable(True)
+        self.gridLayout.addWidget(self.samplingButton, 1, 1, 1, 1)
+        self.clearButton = QtGui.QPushButton("Clear", self)
+        self.gridLayout.addWidget(self.clearButton, 1, 2, 1, 1)
+
+        self.expressionEdit.returnPressed.connect(self.addVariable)
+        self.samplingButton.toggled.connect(self.__samplingToggled)
+        self.clearButton.clicked.connect(self.clear)
+        do.signalProxy.inferiorHasExited.connect(lambda _: self.stopSampling())
+
+        self.__refreshTimer = QTimer(self)
+        self.__refreshTimer.setInterval(self.REFRESH_INTERVAL)
+        self.__refreshTimer.timeout.connect(self.refresh)
+
+    def addVariable(self):
+        """Resolve the expression through gdb; this requires the inferior
+        to be stopped (unless in non-stop mode)"""
+        exp = str(self.expressionEdit.text()).strip()
+        if not exp:
+            return
+        self.expressionEdit.setText("")
+        history = int(self.__config.history.value)
+        self.__do.gdbExecutor.submit(lambda: resolveLiveVariable(self.__do.gdb_connector, exp, history),
+                                     self.__variableResolved,
+                                     lambda e: logging.error("%s", e))
+
+    def __variableResolved(self, variable):
+        self.variables.append(variable)
+        if self.sampler is not None:
+            # restart with the new set of variables
+            self.startSampling()
+        self.refresh()
+
+    def clear(self):
+        self.stopSampling()
+        self.variables = []
+        self.refresh()
+
+    def __samplingToggled(self, checked):
+        if checked:
+            self.startSampling()
+        else:
+            self.stopSampling()
+
+    def startSampling(self):
+        if not self.variables:
+            self.samplingButton.setChecked(False)
+            return
+        pid = self.__do.debugController.inferiorPid
+        if pid is not None:
+            self.__startSampler(pid)
+        else:
+            # gdb has not reported the pid; it only answers this query
+            # while the inferior is stopped
+            self.__do.gdbExecutor.submit(self.__do.gdb_connector.getInferiorPid, self.__startSampler)
+
+    def __startSampler(self, pid):
+        self.__stopSampler()
+        if pid is None:
+            logging.error("Live sampling requires a running inferior.")
+            self.samplingButton.setChecked(False)
+            return
+        self.sampler = LiveSampler(pid, list(self.variables), int(self.__config.sampleRate.value))
+        self.sampler.samplingFailed.connect(self.__samplingFailed, Qt.QueuedConnection)
+        self.sampler.start()
+        self.__refreshTimer.start()
+
+    def __stopSampler(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def stopSampling(self):
+        self.__stopSampler()
+        self.__refreshTimer.stop()
+        self.samplingButton.setChecked(False)
+        self.refresh()
+
+    def __samplingFailed(self, msg):
+        logging.warning("Live sampling stopped: %s", msg)
+        self.stopSampling()
+
+    def refresh(self):
+        sampler = self.sampler
+        if sampler is not None:
+            self.plot.setSeries([(v, sampler.samples(v)) for v in sampler.variables])
+        else:
+            self.plot.setSeries([(v, list(v.samples)) for v in self.variables])
@@ -23,12 +23,17 @@
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
 import logging
+from PyQt4.QtCore import pyqtSignal
 from PyQt4.QtGui import QWidget
 from models.logmodel import LogModel, FilteredLogModel
 from views.ui_logviewtab import Ui_LogViewTab
 
 
 class LogViewHandler(logging.Handler, QWidget):
+    # records may be logged from any thread, but the view may only be
+    # touched in the GUI thread
+    recordLogged = pyqtSignal('PyQt_PyObject')
+
     def __init__(self, parent):
         logging.Handler.__init__(self)
         QWidget.__init__(self, parent)
@@ -44,8 +49,12 @@ class LogViewHandler(logging.Handler, QWidget):
 
         self.parent().addClearAction()
         self.parent().clearRequested.connect(self.model.clear)
+        self.recordLogged.connect(self.insertRecord)
 
     def emit(self, record):
+        self.recordLogged.emit(record)
+
+    def insertRecord(self, record):
         self.model.insertMessage(record)
         self.updateView()
 
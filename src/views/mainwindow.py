@@ -68,6 +68,7 @@ class MainWindow(QMainWindow):
         self.debugController.executableOpened.connect(self.recentFileHandler.addToRecentFiles)
         self.debugController.executableOpened.connect(self.showExecutableName)
         self.debugController.executableOpened.connect(self.disableButtons)
+        self.debugController.symbolsLoaded.connect(self.showSymbolLoadTime)
         # signal proxy
         self.signalproxy.inferiorIsRunning.connect(self.targetStartedRunning)
         self.signalproxy.inferiorStoppedNormally.connect(self.targetStopped)
@@ -239,6 +240,9 @@ class MainWindow(QMainWindow):
         self.ui.actionSaveSession.setEnabled(True)  # enable saving session
         self.setWindowFilePath(filename)
 
+    def showSymbolLoadTime(self, elapsed, how):
+        self.ui.statusbar.showMessage("Symbols loaded in %.1f s (%s)" % (elapsed, how), 10000)
+
     def targetStartedRunning(self):
         self.ui.statusLabel.setText("Running")
         self.ui.statusIcon.setPixmap(QPixmap(":/icons/images/22x22/running.png"))
@@ -266,6 +270,8 @@ class MainWindow(QMainWindow):
             self.dockToolBarManager.saveState(self.settings)
             QMainWindow.closeEvent(self, event)
             self.pluginloader.savePluginInfo()
+            self.do.gdbExecutor.stop()
+            self.do.sessionPool.shutdown()
 
     def readSettings(self):
         geometry = self.settings.value("geometry")
@@ -22,9 +22,12 @@
 #
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
-from PyQt4.QtGui import QWidget, QAction
+from PyQt4.QtCore import QTimer
+from PyQt4.QtGui import QWidget, QAction, QFileDialog
 from helpers.gdboutput import GdbOutput
 from helpers.icons import Icons
+from helpers.commandstatistics import CommandStatistics
+from models.commandstatisticsmodel import CommandStatisticsModel
 from views.ui_mitraceview import Ui_MiTraceView
 
 
@@ -40,7 +43,7 @@ class MiTraceView(QWidget):
         self.ui.commandEdit.lineEdit().returnPressed.connect(self.executeMiCommand)
 
         self.__do.gdb_connector.commandExecuted.connect(self.appendCommand)
-        self.__do.gdb_connector.reader.asyncRecordReceived.connect(self.appendAsync)
+        self.__do.debugController.asyncRecordsReceived.connect(self.appendAsync)
 
         self.__timeAction = QAction(Icons.time, "Show Elapsed Time", self)
         self.__timeAction.setCheckable(True)
@@ -50,14 +53,50 @@ class MiTraceView(QWidget):
         parent.addClearAction()
         parent.clearRequested.connect(self.ui.traceView.clear)
 
+        self.statistics = CommandStatistics()
+        self.__statisticsModel = CommandStatisticsModel(self.statistics, self)
+        self.ui.statisticsView.setModel(self.__statisticsModel)
+        self.ui.resetStatisticsButton.clicked.connect(self.resetStatistics)
+        self.ui.exportStatisticsButton.clicked.connect(self.exportStatistics)
+
+        # the table is only refreshed while it is visible
+        self.__statisticsTimer = QTimer(self)
+        self.__statisticsTimer.setInterval(1000)
+        self.__statisticsTimer.timeout.connect(self.updateStatistics)
+        self.ui.tabWidget.currentChanged.connect(self.__tabChanged)
+
+    def __tabChanged(self, index):
+        if self.ui.tabWidget.widget(index) is self.ui.statisticsTab:
+            self.updateStatistics()
+            self.__statisticsTimer.start()
+        else:
+            self.__statisticsTimer.stop()
+
+    def updateStatistics(self):
+        self.statistics.setTimeouts(self.__do.gdb_connector.timeouts)
+        self.__statisticsModel.update()
+
+    def resetStatistics(self):
+        self.statistics.clear()
+        self.__do.gdb_connector.timeouts.clear()
+        self.updateStatistics()
+
+    def exportStatistics(self):
+        filename = str(QFileDialog.getSaveFileName(self, "Export Statistics", "", "CSV (*.csv)"))
+        if filename:
+            self.updateStatistics()
+            with open(filename, "w", newline="") as f:
+                self.statistics.writeCsv(f)
+
     def appendCommand(self, cmd, rec, time):
+        self.statistics.record(cmd, time)
         timestr = "[<i>%.3f</i>] " % time if self.__timeAction.isChecked() else ""
         self.ui.traceView.append("%s<b>%s</b>" % (timestr, cmd))
         color = 'color="#ff3333"' if rec.class_ == GdbOutput.ERROR else ""
         self.ui.traceView.append("<font %s>%s</font>" % (color, rec.raw))
 
-    def appendAsync(self, rec):
-        self.ui.traceView.append('<font color="#777777">%s</font>' % rec.raw)
+    def appendAsync(self, records):
+        self.ui.traceView.append("<br>".join('<font color="#777777">%s</font>' % rec.raw for rec in records))
 
     def executeMiCommand(self):
         cmd = str(self.ui.commandEdit.lineEdit().text())
@@ -23,6 +23,7 @@
 # For further information see <http://syscdbg.hagenberg.servus.at/>.
 
 import logging
+from PyQt4.QtCore import QObject, pyqtSignal
 from PyQt4.QtGui import QApplication, QStyle, QColor, QFrame, QVBoxLayout, QToolButton
 
 from views.ui_notificationframe import Ui_NotificationFrame
@@ -84,12 +85,21 @@ class NotificationFrame(QFrame):
         self.setStyleSheet(stylesheet % (lighter(bgcolor), bgcolor, darker(bgcolor), "black", fgcolor))
 
 
-class NotificationFrameHandler(logging.Handler):
+class NotificationFrameHandler(logging.Handler, QObject):
+    # records may be logged from any thread, but the frames may only be
+    # created in the GUI thread
+    recordLogged = pyqtSignal('PyQt_PyObject')
+
     def __init__(self, notificationArea):
         logging.Handler.__init__(self)
+        QObject.__init__(self)
         self._notificationArea = notificationArea
+        self.recordLogged.connect(self.showRecord)
 
     def emit(self, record):
+        self.recordLogged.emit(record)
+
+    def showRecord(self, record):
         severity = None
 
         if record.levelno >= logging.ERROR:
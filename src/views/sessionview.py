@@ -0,0 +1,123 @@
+# ricodebug - A GDB frontend which focuses on visually supported
+# debugging using data structure graphs and SystemC features.
+#
+# Copyright (C) 2011  The ricodebug project team at the
+# Upper Austrian University Of Applied Sciences Hagenberg,
+# Department Embedded Systems Design
+#
+# This file is part of ricodebug.
+#
+# ricodebug is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For further information see <http://syscdbg.hagenberg.servus.at/>.
+from PyQt4 import QtGui
+from PyQt4.QtGui import QWidget, QTableWidgetItem, QAbstractItemView, QHeaderView, QInputDialog
+
+from helpers.gdbsessionpool import GdbSession
+
+
+class SessionView(QWidget):
+    STATES = {GdbSession.STOPPED: "Stopped", GdbSession.RUNNING: "Running", GdbSession.EXITED: "Exited"}
+
+    def __init__(self, do, parent=None):
+        QWidget.__init__(self, parent)
+        self.__do = do
+        self.pool = do.sessionPool
+        # the result of the last broadcast per session
+        self.__results = {}
+
+        self.gridLayout = QtGui.QGridLayout(self)
+        self.gridLayout.setMargin(0)
+
+        self.sessionTable = QtGui.QTableWidget(0, 4, self)
+        self.sessionTable.setHorizontalHeaderLabels(["Session", "PID", "State", "Result"])
+        self.sessionTable.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.sessionTable.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.sessionTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.sessionTable.verticalHeader().setVisible(False)
+        self.sessionTable.horizontalHeader().setResizeMode(QHeaderView.ResizeToContents)
+        self.sessionTable.horizontalHeader().setStretchLastSection(True)
+        self.gridLayout.addWidget(self.sessionTable, 0, 0, 1, 4)
+
+        self.expressionEdit = QtGui.QLineEdit(self)
+        self.expressionEdit.setPlaceholderText("Evaluate in all sessions")
+        self.gridLayout.addWidget(self.expressionEdit, 1, 0, 1, 1)
+        self.attachButton = QtGui.QPushButton("Attach...", self)
+        self.gridLayout.addWidget(self.attachButton, 1, 1, 1, 1)
+        self.interruptButton = QtGui.QPushButton("Interrupt All", self)
+        self.gridLayout.addWidget(self.interruptButton, 1, 2, 1, 1)
+        self.continueButton = QtGui.QPushButton("Continue All", self)
+        self.gridLayout.addWidget(self.continueButton, 1, 3, 1, 1)
+
+        self.expressionEdit.returnPressed.connect(self.evaluateAll)
+        self.attachButton.clicked.connect(self.attach)
+        self.interruptButton.clicked.connect(lambda: self.__broadcast(self.pool.interruptAll))
+        self.continueButton.clicked.connect(lambda: self.__broadcast(self.pool.continueAll))
+        # the other views show the selected session
+        self.sessionTable.itemSelectionChanged.connect(self.__selectionChanged)
+
+        self.pool.sessionsChanged.connect(self.updateSessions)
+        self.pool.currentChanged.connect(self.updateSessions)
+        # the state of the primary session is tracked by the debug controller
+        do.signalProxy.inferiorIsRunning.connect(lambda _: self.__setPrimaryState(GdbSession.RUNNING))
+        do.signalProxy.inferiorStoppedNormally.connect(lambda _: self.__setPrimaryState(GdbSession.STOPPED))
+        do.signalProxy.inferiorReceivedSignal.connect(lambda _: self.__setPrimaryState(GdbSession.STOPPED))
+        do.signalProxy.inferiorHasExited.connect(lambda _: self.__setPrimaryState(GdbSession.EXITED))
+
+        self.updateSessions()
+
+    def __setPrimaryState(self, state):
+        self.pool.sessions[0].state = state
+        self.updateSessions()
+
+    def updateSessions(self):
+        sessions = self.pool.sessions
+        self.sessionTable.setRowCount(len(sessions))
+        for row, session in enumerate(sessions):
+            result = self.__results.get(session, "")
+            for column, text in enumerate([session.name, session.pid or "", self.STATES[session.state], result]):
+                self.sessionTable.setItem(row, column, QTableWidgetItem(str(text)))
+            if session is self.pool.current:
+                self.sessionTable.selectRow(row)
+
+    def __selectionChanged(self):
+        rows = self.sessionTable.selectionModel().selectedRows()
+        if rows and rows[0].row() < len(self.pool.sessions):
+            self.pool.select(self.pool.sessions[rows[0].row()])
+
+    def __broadcast(self, fn):
+        # the sessions are queried in parallel, but not in the gui thread
+        self.__do.gdbExecutor.submit(fn, self.showResults)
+
+    def showResults(self, results):
+        self.__results = dict((session, result) for session, result in results)
+        self.updateSessions()
+
+    def evaluateAll(self):
+        exp = str(self.expressionEdit.text())
+        if exp:
+            self.__broadcast(lambda: self.pool.evaluateAll(exp))
+
+    def attach(self):
+        pid, ok = QInputDialog.getInteger(self, "Attach", "Process ID:", 0, 1)
+        if ok:
+            session = self.pool.addSession("pid %d" % pid, self.__do.debugController.gdbCommand())
+            self.__do.gdbExecutor.submit(lambda: self.pool.attach(session, pid),
+                                         lambda attached: self.__attached(session, attached))
+
+    def __attached(self, session, attached):
+        if attached:
+            self.updateSessions()
+        else:
+            self.pool.removeSession(session)
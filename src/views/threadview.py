@@ -26,7 +26,7 @@ from PyQt4.QtGui import QTableView, QHeaderView, QAbstractItemView
 
 
 class ThreadView(QTableView):
-    def __init__(self, _, parent=None):
+    def __init__(self, do, parent=None):
         QTableView.__init__(self, parent)
 
         self.setTabKeyNavigation(False)
@@ -40,3 +40,5 @@ class ThreadView(QTableView):
         self.verticalHeader().setDefaultSectionSize(20)
         self.horizontalHeader().setResizeMode(QHeaderView.ResizeToContents)
         self.horizontalHeader().setStretchLastSection(True)
+
+        self.activated.connect(lambda index: do.signalProxy.selectThread(self.model().threadIdForRow(index.row())))